@@ -1,11 +1,13 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, status as http_status
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.utils.config import get_settings
 from src.storage.db.database import init_db
-from src.api.routes import projects, documents, answers, evaluation, status
+from src.utils.retry import retry_stats
 
 # Configure logging
 logging.basicConfig(
@@ -16,17 +18,70 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Frozen once at import; CORSMiddleware checks origins by membership
+_CORS_ORIGINS = frozenset(settings.cors_origins)
+
+
+# Paths served before deferred startup has finished (probes, docs); every
+# other route answers 503 until then, since its tables may not exist yet
+_UNGATED_PATHS = frozenset({"/", "/health", "/health/live", "/health/ready", "/docs", "/openapi.json"})
+
+
+class ReadinessGateMiddleware:
+    """Pure ASGI middleware returning 503 on API routes until app.state.ready is set."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"] not in _UNGATED_PATHS
+            and not getattr(scope["app"].state, "ready", False)
+        ):
+            response = ORJSONResponse(
+                status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Service is starting"},
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+async def _deferred_init(app: FastAPI):
+    """Run heavy startup work after the server is already accepting connections."""
+    try:
+        await asyncio.to_thread(init_db)
+        logger.info("Database initialized")
+        app.state.ready = True
+    except Exception as e:
+        logger.error(f"Database initialization failed: {e}")
+
+
+def _register_routes(app: FastAPI):
+    """Import and mount the API routers (kept off the module import path)."""
+    from src.api.routes import projects, documents, answers, evaluation, status
+
+    app.include_router(projects.router)
+    app.include_router(documents.router)
+    app.include_router(answers.router)
+    app.include_router(evaluation.router)
+    app.include_router(status.router)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("Starting Questionnaire Agent API...")
-    init_db()
-    logger.info("Database initialized")
+    app.state.ready = False
+    _register_routes(app)
+    init_task = asyncio.create_task(_deferred_init(app))
     yield
     # Shutdown
     logger.info("Shutting down Questionnaire Agent API...")
+    init_task.cancel()
 
 
 # Create FastAPI application
@@ -34,25 +89,23 @@ app = FastAPI(
     title="Questionnaire Agent API",
     description="API for automated questionnaire answering with document indexing and AI-powered generation",
     version="1.0.0",
+    openapi_url="/openapi.json" if settings.openapi_enabled else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Configure CORS
+# Hold API routes at 503 until the schema is in place
+app.add_middleware(ReadinessGateMiddleware)
+
+# Configure CORS (pure ASGI, outermost middleware)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins,
+    allow_origins=_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(projects.router)
-app.include_router(documents.router)
-app.include_router(answers.router)
-app.include_router(evaluation.router)
-app.include_router(status.router)
-
 
 @app.get("/")
 def root():
@@ -67,20 +120,51 @@ def root():
 
 @app.get("/health")
 def health_check():
-    """Health check endpoint."""
+    """Health check endpoint, with this process's Gemini retry counters."""
     return {
         "status": "ok",
         "service": "Questionnaire Agent API",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "retries": retry_stats()
     }
 
 
+@app.get("/health/live")
+def liveness_check():
+    """Liveness probe; answers as soon as the socket is bound."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+def readiness_check():
+    """Readiness probe; 503 until deferred startup work has finished."""
+    if not getattr(app.state, "ready", False):
+        return ORJSONResponse(
+            status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting"}
+        )
+    return {"status": "ready"}
+
+
 if __name__ == "__main__":
+    import sys
     import uvicorn
+    
+    # uvloop is not available on Windows; fall back to uvicorn's auto-detection there
+    loop = "auto" if sys.platform == "win32" else "uvloop"
+    # Reload mode is single-process; otherwise api_workers (1 by default)
+    workers = None if settings.api_reload else settings.api_workers
+    # Sync the schema once before workers fork, so they don't race on DDL
+    # (their own deferred init then finds nothing to do)
+    init_db()
+    
     uvicorn.run(
         "app:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.api_reload,
+        workers=workers,
+        loop=loop,
+        http="httptools",
         log_level=settings.log_level.lower()
     )
@@ -1,23 +1,26 @@
 import sys
-import importlib
+from importlib.metadata import distribution, PackageNotFoundError
 
-required_packages = [
-    "PyPDF2",
-    "docx",
-    "openpyxl",
-    "pptx",
-    "faiss",
-    "langchain_text_splitters",
-    "google.generativeai"
-]
+# Import name -> distribution name. Presence is checked from package metadata
+# only, so heavy modules (faiss, google.generativeai) are never imported.
+required_packages = {
+    "fitz": "PyMuPDF",
+    "PyPDF2": "PyPDF2",
+    "docx": "python-docx",
+    "openpyxl": "openpyxl",
+    "pptx": "python-pptx",
+    "faiss": "faiss-cpu",
+    "langchain_text_splitters": "langchain-text-splitters",
+    "google.generativeai": "google-generativeai",
+}
 
 missing = []
 
-for package in required_packages:
+for package, dist_name in required_packages.items():
     try:
-        importlib.import_module(package)
+        distribution(dist_name)
         print(f"[OK] {package}")
-    except ImportError:
+    except PackageNotFoundError:
         print(f"[MISSING] {package}")
         missing.append(package)
 
@@ -10,8 +10,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.storage.db.database import init_db, engine
-from src.storage.db.models import Base
+from src.storage.db.database import init_db
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -20,21 +19,17 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Initialize database tables."""
-    logger.info("Creating database tables...")
-    
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        logger.info("✓ Database tables created successfully!")
+        changes = init_db()
+        for table in changes["tables"]:
+            logger.info(f"  + table {table}")
+        for index in changes["indexes"]:
+            logger.info(f"  + index {index}")
         
-        # List all tables
-        from sqlalchemy import inspect
-        inspector = inspect(engine)
-        tables = inspector.get_table_names()
-        
-        logger.info(f"✓ Created {len(tables)} tables:")
-        for table in tables:
-            logger.info(f"  - {table}")
+        if any(changes.values()):
+            logger.info("✓ Database schema updated successfully!")
+        else:
+            logger.info("✓ Database already initialized, nothing to do")
             
     except Exception as e:
         logger.error(f"✗ Error creating database: {e}")
@@ -1,5 +1,14 @@
 """API routes package initialization."""
 
-from src.api.routes import projects, documents, answers, evaluation, status
+import importlib
 
 __all__ = ["projects", "documents", "answers", "evaluation", "status"]
+
+
+def __getattr__(name):
+    """Import route modules on first access (PEP 562)."""
+    if name in __all__:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,15 @@
+import threading
+from cachetools import LRUCache
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
-from uuid import UUID
-
-from src.storage.db.database import get_db
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Callable, List
+from uuid import UUID, uuid4
+
+from src.storage.db.database import get_db, get_async_db, SessionLocal
 from src.models.answer import (
     Answer,
     AnswerCreate,
@@ -13,23 +19,43 @@ from src.models.answer import (
     AnswerFlagMissing,
 )
 from src.storage.db.models import AnswerModel
+from src.services.answer_service import AnswerService
 from src.services.review_service import ReviewService
 
 router = APIRouter(tags=["answers"])
 
+_answer_adapter = TypeAdapter(Answer)
+
+_ANSWER_NOT_FOUND = "Answer {} not found"
+
+# Answer reads keyed by answer id, each stored with the row's updated_at and
+# served only while that still matches the database (one column select), so
+# writes from other workers or services are never masked. Entries are also
+# dropped when an answer is mutated through this router. The lock covers the
+# threadpool-run refine handler, which invalidates from outside the event loop.
+_answer_cache: LRUCache = LRUCache(maxsize=10_000)
+_cache_lock = threading.Lock()
+
+
+def _invalidate_answer(*answer_ids):
+    """Drop cached reads for the given answers (UUIDs or their string form)."""
+    with _cache_lock:
+        for answer_id in answer_ids:
+            answer_id = answer_id if isinstance(answer_id, UUID) else UUID(str(answer_id))
+            _answer_cache.pop(answer_id, None)
+
 
 def run_generate_single_answer(question_id: str):
-    """Worker function for single answer generation."""
-    from src.storage.db.database import SessionLocal
-    db = SessionLocal()
-    try:
-        service = AnswerService(db)
-        service.generate_answer(question_id)
-    finally:
-        db.close()
+    """
+    Worker function for single answer generation.
+    Kept synchronous so the blocking agent run stays in the threadpool;
+    the session is checked out from the shared engine pool.
+    """
+    with SessionLocal() as db:
+        AnswerService(db).generate_answer(question_id)
 
 @router.post("/generate-single-answer")
-def generate_single_answer(
+async def generate_single_answer(
     question_id: UUID,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -45,7 +71,7 @@ def generate_single_answer(
 
 
 @router.post("/generate-all-answers")
-def generate_all_answers(
+async def generate_all_answers(
     project_id: UUID,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -60,78 +86,115 @@ def generate_all_answers(
     }
 
 
-@router.get("/get-answer", response_model=Answer)
-def get_answer(
+async def _get_answer_or_404(db: AsyncSession, answer_id: UUID) -> AnswerModel:
+    """Load an answer (with citations) by primary key or raise a 404."""
+    answer = await db.get(AnswerModel, str(answer_id), options=[selectinload(AnswerModel.citations)])
+    if not answer:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_ANSWER_NOT_FOUND.format(answer_id)
+        )
+    return answer
+
+
+def _answer_response(answer: Answer) -> ORJSONResponse:
+    """
+    Serialize an Answer once, bypassing response_model re-validation.
+    Answers built with from_orm_fast keep DB column types, hence warnings=False.
+    """
+    return ORJSONResponse(_answer_adapter.dump_python(answer, warnings=False))
+
+
+async def get_review_service(db: AsyncSession = Depends(get_async_db)) -> ReviewService:
+    """
+    Dependency providing a ReviewService bound to the request's session.
+    The service works on the sync facade of the AsyncSession, so its calls
+    must go through db.run_sync (see _run_review).
+    """
+    return ReviewService(db.sync_session)
+
+
+async def _run_review(
+    db: AsyncSession,
     answer_id: UUID,
-    db: Session = Depends(get_db)
-) -> Answer:
+    action: Callable[[], AnswerModel]
+) -> ORJSONResponse:
+    """Run a ReviewService action on the sync side of the session, mapping misses to 404."""
+    try:
+        answer = await db.run_sync(lambda _: Answer.from_orm_fast(action()))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_answer(answer_id, answer.id)
+    return _answer_response(answer)
+
+
+@router.get("/get-answer", response_class=ORJSONResponse, responses={200: {"model": Answer}})
+async def get_answer(
+    answer_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+) -> ORJSONResponse:
     """Get answer details."""
-    answer = db.query(AnswerModel).filter(AnswerModel.id == str(answer_id)).first()
-    if not answer:
+    updated_at = await db.scalar(select(AnswerModel.updated_at).where(AnswerModel.id == str(answer_id)))
+    if updated_at is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Answer {answer_id} not found"
+            detail=_ANSWER_NOT_FOUND.format(answer_id)
         )
+    with _cache_lock:
+        cached = _answer_cache.get(answer_id)
+    if cached is not None and cached[0] == updated_at:
+        return _answer_response(cached[1])
     
-    return Answer.model_validate(answer)
+    db_answer = await _get_answer_or_404(db, answer_id)
+    answer = Answer.from_orm_fast(db_answer)
+    with _cache_lock:
+        _answer_cache[answer_id] = (db_answer.updated_at, answer)
+    return _answer_response(answer)
 
 
-@router.post("/update-answer", response_model=Answer)
-def update_answer(
+@router.post("/update-answer", response_class=ORJSONResponse, responses={200: {"model": Answer}})
+async def update_answer(
     answer_id: UUID,
     answer_update: AnswerUpdate,
-    db: Session = Depends(get_db)
-) -> Answer:
+    db: AsyncSession = Depends(get_async_db),
+    service: ReviewService = Depends(get_review_service)
+) -> ORJSONResponse:
     """Update/override an answer manually."""
-    service = ReviewService(db)
-    try:
-        if answer_update.text:
-            return service.manual_update(str(answer_id), answer_update.text)
-        return service.manual_update(str(answer_id), "") # Or handle empty
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    text = answer_update.text or ""
+    return await _run_review(db, answer_id, lambda: service.manual_update(str(answer_id), text))
 
 
-@router.post("/confirm-answer", response_model=Answer)
-def confirm_answer(
+@router.post("/confirm-answer", response_class=ORJSONResponse, responses={200: {"model": Answer}})
+async def confirm_answer(
     answer_id: UUID,
     confirm_data: AnswerConfirm,
-    db: Session = Depends(get_db)
-) -> Answer:
+    db: AsyncSession = Depends(get_async_db),
+    service: ReviewService = Depends(get_review_service)
+) -> ORJSONResponse:
     """Confirm an AI-generated answer."""
-    service = ReviewService(db)
-    try:
-        return service.confirm_answer(str(answer_id), confirm_data.comment)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _run_review(db, answer_id, lambda: service.confirm_answer(str(answer_id), confirm_data.comment))
 
 
-@router.post("/reject-answer", response_model=Answer)
-def reject_answer(
+@router.post("/reject-answer", response_class=ORJSONResponse, responses={200: {"model": Answer}})
+async def reject_answer(
     answer_id: UUID,
     reject_data: AnswerReject,
-    db: Session = Depends(get_db)
-) -> Answer:
+    db: AsyncSession = Depends(get_async_db),
+    service: ReviewService = Depends(get_review_service)
+) -> ORJSONResponse:
     """Reject an AI-generated answer."""
-    service = ReviewService(db)
-    try:
-        return service.reject_answer(str(answer_id), reject_data.reason)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _run_review(db, answer_id, lambda: service.reject_answer(str(answer_id), reject_data.reason))
 
 
-@router.post("/flag-answer-missing", response_model=Answer)
-def flag_missing_data(
+@router.post("/flag-answer-missing", response_class=ORJSONResponse, responses={200: {"model": Answer}})
+async def flag_missing_data(
     answer_id: UUID,
     flag_data: AnswerFlagMissing,
-    db: Session = Depends(get_db)
-) -> Answer:
+    db: AsyncSession = Depends(get_async_db),
+    service: ReviewService = Depends(get_review_service)
+) -> ORJSONResponse:
     """Flag an answer as having missing data."""
-    service = ReviewService(db)
-    try:
-        return service.flag_missing_data(str(answer_id), flag_data.missing_info)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _run_review(db, answer_id, lambda: service.flag_missing_data(str(answer_id), flag_data.missing_info))
 
 
 @router.post("/{answer_id}/refine", response_model=Answer)
@@ -143,19 +206,21 @@ def refine_answer(
     """Refine answer using LangGraph HITL with feedback."""
     service = ReviewService(db)
     try:
-        return service.refine_answer(str(answer_id), feedback)
+        answer = service.refine_answer(str(answer_id), feedback)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_answer(answer_id)
+    return answer
 
 
 @router.get("/{answer_id}/history")
-def get_answer_history(
+async def get_answer_history(
     answer_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: ReviewService = Depends(get_review_service)
 ) -> dict:
-    """Get answer review history."""
-    service = ReviewService(db)
-    history = service.get_history(str(answer_id))
+    """Get answer review history (a single audit-column select, so not cached)."""
+    history = await db.run_sync(lambda _: service.get_history(str(answer_id)))
     return {
         "answer_id": str(answer_id),
         "history": history
@@ -163,10 +228,10 @@ def get_answer_history(
 
 
 @router.get("/{answer_id}/trace")
-def get_answer_trace(
+async def get_answer_trace(
     answer_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: ReviewService = Depends(get_review_service)
 ) -> dict:
     """Get LangGraph execution trace."""
-    service = ReviewService(db)
-    return service.get_trace(str(answer_id))
+    return await db.run_sync(lambda _: service.get_trace(str(answer_id)))
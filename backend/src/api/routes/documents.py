@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
+import asyncio
 import logging
 
-from src.storage.db.database import get_db
+from src.storage.db.database import get_async_db
 from src.services.document_service import DocumentService
-from src.models.document import Document
+from src.models.document import Document, DocumentPage, DocumentStatus
+from src.utils.etag import weak_etag, not_modified
+from src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
 from src.workers.tasks import index_document_async
 
 router = APIRouter(tags=["documents"])
 logger = logging.getLogger(__name__)
 
+async def get_document_service(db: AsyncSession = Depends(get_async_db)) -> DocumentService:
+    """
+    Dependency providing a DocumentService bound to the request's session.
+    The service works on the sync facade of the AsyncSession, so its calls
+    must go through db.run_sync.
+    """
+    return DocumentService(db.sync_session)
+
 
 @router.post("/upload-document", response_model=Document, status_code=status.HTTP_201_CREATED)
 async def upload_document(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
 ) -> Document:
     """
     Upload a document.
@@ -27,9 +40,11 @@ async def upload_document(
     The plan lists `POST /index-document-async` which implies it takes a file or ID.
     Let's stick to the plan: `upload-document` uploads, `index-document-async` triggers.)
     """
-    service = DocumentService(db)
     try:
-        return service.upload_document(file)
+        # run_sync executes on the event loop, so the disk copy goes to a
+        # worker thread and only the insert runs through the session
+        file_path, file_size = await asyncio.to_thread(service.save_upload, file)
+        return await db.run_sync(lambda _: service.create_document(file.filename, file_path, file_size))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,25 +58,38 @@ async def upload_document(
         )
 
 
-@router.get("/documents", response_model=List[Document])
-def list_documents(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
-) -> List[Document]:
-    """List all documents."""
-    service = DocumentService(db)
-    return service.list_documents(skip, limit)
+@router.get("/documents", response_class=ORJSONResponse, responses={200: {"model": DocumentPage}})
+async def list_documents(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
+) -> ORJSONResponse:
+    """List documents newest first; pass `next_cursor` back as `cursor` for the next page."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    documents = await db.run_sync(lambda _: service.list_documents(limit, after))
+    next_cursor = None
+    if len(documents) == limit:
+        last = documents[-1]
+        next_cursor = encode_cursor(last.uploaded_at, last.id)
+    # Rows come straight from the DB, so build the page without validation
+    page = DocumentPage.model_construct(items=[Document.from_orm_fast(d) for d in documents], next_cursor=next_cursor)
+    # Serialize once with orjson, skipping null fields and response_model re-validation
+    return ORJSONResponse(page.model_dump(exclude_none=True, warnings=False))
 
 
 @router.get("/documents/{document_id}", response_model=Document)
-def get_document(
+async def get_document(
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
 ) -> Document:
     """Get document details."""
-    service = DocumentService(db)
-    document = service.get_document(str(document_id))
+    document = await db.run_sync(lambda _: service.get_document(str(document_id)))
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,39 +99,58 @@ def get_document(
 
 
 @router.delete("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_document(
+async def delete_document(
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
 ) -> None:
     """Delete a document."""
-    service = DocumentService(db)
-    document = service.get_document(str(document_id))
+    document = await db.run_sync(lambda _: service.get_document(str(document_id)))
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document {document_id} not found"
         )
-    service.delete_document(str(document_id))
+    await db.run_sync(lambda _: service.delete_document(str(document_id)))
 
 
 @router.post("/index-document-async", response_model=dict)
-def trigger_index_document(
+async def trigger_index_document(
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
 ) -> dict:
     """
     Trigger async document indexing for an existing document.
+    Requests for a document that is already being indexed are not re-queued
+    (unless its claim has expired, see DocumentService.claim_for_indexing).
     """
-    service = DocumentService(db)
-    document = service.get_document(str(document_id))
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document {document_id} not found"
-        )
+    claimed = await db.run_sync(lambda _: service.claim_for_indexing(str(document_id)))
+    if not claimed:
+        document = await db.run_sync(lambda _: service.get_document(str(document_id)))
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document {document_id} not found"
+            )
+        return {
+            "request_id": document.index_task_id,
+            "document_id": str(document_id),
+            "status": "already_queued",
+            "message": "Document is already being indexed"
+        }
     
     # Trigger Celery task
-    task = index_document_async.delay(str(document_id))
+    try:
+        task = index_document_async.delay(str(document_id))
+    except Exception as e:
+        # Release the claim so the document can be re-triggered
+        await db.run_sync(lambda _: service.update_status(
+            str(document_id), DocumentStatus.ERROR, f"Failed to queue indexing: {e}"
+        ))
+        raise
+    # Kept on the row, so any worker can report the run already in flight
+    await db.run_sync(lambda _: service.set_index_task(str(document_id), task.id))
     
     return {
         "request_id": task.id,
@@ -114,18 +161,29 @@ def trigger_index_document(
 
 
 @router.get("/get-document-status", response_model=dict)
-def get_document_status(
+async def get_document_status(
     document_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentService = Depends(get_document_service)
 ) -> dict:
-    """Get document status."""
-    service = DocumentService(db)
-    document = service.get_document(str(document_id))
+    """
+    Get document status.
+    Carries a weak ETag; polls sending a matching If-None-Match get 304.
+    """
+    document = await db.run_sync(lambda _: service.get_document_status(str(document_id)))
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document {document_id} not found"
         )
+    
+    etag = weak_etag(*document)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers["ETag"] = etag
         
     return {
         "document_id": str(document.id),
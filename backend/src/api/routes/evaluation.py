@@ -16,14 +16,14 @@ router = APIRouter(tags=["evaluation"])
 
 
 @router.post("/compare", response_model=Evaluation)
-def compare_answers(
+async def compare_answers(
     evaluation: EvaluationCreate,
     db: Session = Depends(get_db)
 ) -> Evaluation:
     """Compare AI answer with human ground truth."""
     service = EvaluationService(db)
     try:
-        return service.evaluate_answer(
+        return await service.aevaluate_answer(
             evaluation.ai_answer_id, 
             evaluation.human_answer_text
         )
@@ -36,16 +36,30 @@ def compare_answers(
 @router.get("/get-project-evaluation", response_model=EvaluationReport)
 def get_project_evaluation(
     project_id: UUID,
+    summary_only: bool = False,
     db: Session = Depends(get_db)
 ) -> EvaluationReport:
-    """Get evaluation report for a project."""
+    """Get evaluation report for a project (averages only with `summary_only`)."""
     service = EvaluationService(db)
     try:
-        return service.get_project_report(project_id)
+        return service.get_project_report(project_id, summary_only=summary_only)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
 
 
+@router.post("/rescore-project-evaluation")
+def rescore_project_evaluation(
+    project_id: UUID,
+    db: Session = Depends(get_db)
+) -> dict:
+    """Recompute the lexical metrics of a project's stored evaluations."""
+    service = EvaluationService(db)
+    try:
+        return {"project_id": str(project_id), "rescored": service.rescore_lexical(project_id)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to re-score evaluations: {str(e)}")
+
+
 @router.post("/ground-truth", response_model=GroundTruth)
 def set_ground_truth(
     ground_truth: GroundTruthCreate,
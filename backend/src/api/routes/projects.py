@@ -1,29 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 from pathlib import Path
-import shutil
+import asyncio
 import os
+import aiofiles
 
-from src.storage.db.database import get_db
+from src.storage.db.database import get_async_db
 from src.utils.config import get_settings
+from src.utils.etag import weak_etag, not_modified
+from src.utils.files import sendfile_upload
+from src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
 from src.workers.tasks import parse_questionnaire_async
 from src.models.project import (
     Project,
     ProjectCreate,
     ProjectUpdate,
     ProjectDetail,
+    ProjectPage,
 )
-from src.storage.db.models import ProjectModel
+from src.storage.db.models import ProjectModel, project_documents
 
 router = APIRouter(tags=["projects"])
 
+# Upload files are streamed to disk in 64 KB chunks
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Accepted questionnaire uploads
+QUESTIONNAIRE_EXTENSIONS = frozenset({".pdf", ".docx"})
+QUESTIONNAIRE_CONTENT_TYPES = frozenset({
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+})
 
 @router.post("/create-project", response_model=Project, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Project:
     """Create a new project."""
     # Stub implementation
@@ -33,37 +49,62 @@ def create_project(
         scope_type=project.scope_type,
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     return Project.model_validate(db_project)
 
 
-@router.get("/list-projects", response_model=List[Project])
-def list_projects(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
-) -> List[Project]:
-    """List all projects."""
-    # Stub implementation
-    projects = db.query(ProjectModel).offset(skip).limit(limit).all()
-    return [Project.model_validate(p) for p in projects]
+@router.get("/list-projects", response_class=ORJSONResponse, responses={200: {"model": ProjectPage}})
+async def list_projects(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> ORJSONResponse:
+    """List projects newest first; pass `next_cursor` back as `cursor` for the next page."""
+    stmt = select(ProjectModel)
+    if cursor:
+        try:
+            stmt = stmt.where(tuple_(ProjectModel.created_at, ProjectModel.id) < decode_cursor(cursor))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    result = await db.execute(
+        stmt.order_by(ProjectModel.created_at.desc(), ProjectModel.id.desc()).limit(limit)
+    )
+    projects = result.scalars().all()
+    
+    next_cursor = None
+    if len(projects) == limit:
+        last = projects[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    # Rows come straight from the DB, so build the page without validation
+    page = ProjectPage.model_construct(items=[Project.from_orm_fast(p) for p in projects], next_cursor=next_cursor)
+    # Serialize once with orjson, skipping null fields and response_model re-validation
+    return ORJSONResponse(page.model_dump(exclude_none=True, warnings=False))
 
 
 @router.get("/get-project-info", response_model=ProjectDetail)
-def get_project(
+async def get_project(
     project_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> ProjectDetail:
     """Get project details."""
     # Stub implementation
-    project = db.query(ProjectModel).filter(ProjectModel.id == str(project_id)).first()
-    if not project:
+    # Count linked documents in SQL instead of hydrating the relationship
+    result = await db.execute(
+        select(ProjectModel, func.count(project_documents.c.document_id))
+        .outerjoin(project_documents, project_documents.c.project_id == ProjectModel.id)
+        .where(ProjectModel.id == str(project_id))
+        .group_by(ProjectModel.id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found"
         )
+    project, document_count = row
     
     return ProjectDetail(
         id=UUID(project.id),
@@ -75,19 +116,19 @@ def get_project(
         updated_at=project.updated_at,
         sections=[],
         questions=[],
-        document_count=len(project.documents) if project.documents else 0
+        document_count=document_count
     )
 
 
 @router.put("/update-project", response_model=Project)
-def update_project(
+async def update_project(
     project_id: UUID,
     project_update: ProjectUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Project:
     """Update a project."""
     # Stub implementation
-    db_project = db.query(ProjectModel).filter(ProjectModel.id == str(project_id)).first()
+    db_project = await db.get(ProjectModel, str(project_id))
     if not db_project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -99,57 +140,62 @@ def update_project(
         if field != "document_ids":  # Handle document_ids separately
             setattr(db_project, field, value)
     
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     return Project.model_validate(db_project)
 
 
 @router.delete("/delete-project/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> None:
     """Delete a project."""
     # Stub implementation
-    db_project = db.query(ProjectModel).filter(ProjectModel.id == str(project_id)).first()
+    db_project = await db.get(ProjectModel, str(project_id))
     if not db_project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found"
         )
     
-    db.delete(db_project)
-    db.commit()
+    await db.delete(db_project)
+    await db.commit()
 
 
 @router.post("/{project_id}/questionnaire", status_code=status.HTTP_202_ACCEPTED)
 async def upload_questionnaire(
     project_id: UUID,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload a questionnaire file and trigger async parsing.
     """
     settings = get_settings()
     
+    # Validation (before any DB or disk I/O)
+    file_ext = Path(file.filename).suffix.lower()
+    if file_ext not in QUESTIONNAIRE_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only .pdf and .docx files are supported for questionnaires"
+        )
+    if file.content_type and file.content_type not in QUESTIONNAIRE_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported content type for questionnaire: {file.content_type}"
+        )
+    
     # Verify project exists
-    project = db.query(ProjectModel).filter(ProjectModel.id == str(project_id)).first()
+    project = await db.get(ProjectModel, str(project_id))
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found"
         )
         
-    # Validation
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in [".pdf", ".docx"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only .pdf and .docx files are supported for questionnaires"
-        )
-        
     # Save file
     upload_dir = Path(settings.upload_dir)
     upload_dir.mkdir(parents=True, exist_ok=True)
@@ -157,8 +203,12 @@ async def upload_questionnaire(
     file_path = upload_dir / f"questionnaire_{project_id}{file_ext}"
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Large uploads are already spooled to a temp file: copy in-kernel.
+        # Otherwise stream the in-memory spool out in chunks.
+        if not await asyncio.to_thread(sendfile_upload, file.file, file_path):
+            async with aiofiles.open(file_path, "wb") as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await buffer.write(chunk)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -177,21 +227,36 @@ async def upload_questionnaire(
 
 
 @router.get("/get-project-status")
-def get_project_status(
+async def get_project_status(
     project_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ) -> dict:
-    """Get project status."""
-    # Stub implementation
-    db_project = db.query(ProjectModel).filter(ProjectModel.id == str(project_id)).first()
-    if not db_project:
+    """
+    Get project status.
+    Carries a weak ETag; polls sending a matching If-None-Match get 304.
+    """
+    # Read on every poll, so status changes made anywhere (ALL_DOCS
+    # invalidation, questionnaire parsing workers) show up immediately;
+    # only the columns the status body needs
+    row = (await db.execute(
+        select(ProjectModel.id, ProjectModel.status, ProjectModel.updated_at)
+        .where(ProjectModel.id == str(project_id))
+    )).one_or_none()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found"
         )
     
+    etag = weak_etag(row.status, row.updated_at.isoformat())
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers["ETag"] = etag
     return {
-        "project_id": str(db_project.id),
-        "status": db_project.status,
-        "updated_at": db_project.updated_at.isoformat()
+        "project_id": str(row.id),
+        "status": row.status,
+        "updated_at": row.updated_at.isoformat()
     }
@@ -1,18 +1,33 @@
 from fastapi import APIRouter, HTTPException, status
 from uuid import UUID
+from celery import states
+from celery.result import AsyncResult
+
+from src.workers.celery_app import celery_app
 
 router = APIRouter(tags=["status"])
 
 
 @router.get("/get-request-status")
 def get_request_status(request_id: UUID) -> dict:
-    """Get async task status."""
-    # Stub implementation - will be fully implemented with Celery in Phase 2
+    """Get async task status from the Celery result backend."""
+    # Read state and payload once; each property access may query the backend
+    result = AsyncResult(str(request_id), app=celery_app)
+    state = result.state
+    payload = result.info
+    meta = payload if isinstance(payload, dict) else {}
+    if state == states.SUCCESS and meta.get("status") == "failed":
+        # Tasks catch their own errors and return a "failed" payload, which
+        # Celery records as a success
+        state = states.FAILURE
+        payload = meta.get("message")
+    
     return {
         "request_id": str(request_id),
-        "status": "pending",
-        "progress": 0,
-        "message": "Task status tracking not yet implemented"
+        "status": state.lower(),
+        "progress": 100 if state == states.SUCCESS else meta.get("progress", 0),
+        "result": payload if state == states.SUCCESS else None,
+        "message": str(payload) if state == states.FAILURE else meta.get("message")
     }
 
 
@@ -1,6 +1,6 @@
 """Citation indexing layer."""
 import logging
-from typing import List
+from typing import List, Optional
 
 from src.storage.faiss_store import FAISSStore
 from src.services.embedding_service import get_embedding_service
@@ -22,15 +22,22 @@ class CitationLayer:
         self.store = FAISSStore(index_name="citation_layer")
         self.embedding_service = get_embedding_service()
 
-    def add_chunks(self, texts: List[str], chunk_ids: List[str]):
+    def add_chunks(
+        self,
+        texts: List[str],
+        chunk_ids: List[str],
+        embeddings: Optional[List[List[float]]] = None
+    ):
         """
         Add chunks to the citation index.
+        Precomputed embeddings may be passed to skip the embedding call.
         """
         if not texts:
             return
 
         try:
-            embeddings = self.embedding_service.generate_embeddings_batch(texts)
+            if embeddings is None:
+                embeddings = self.embedding_service.generate_embeddings_batch(texts)
             self.store.add_vectors(embeddings, chunk_ids)
             logger.info(f"Added {len(texts)} chunks to citation layer")
         except Exception as e:
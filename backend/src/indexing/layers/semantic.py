@@ -26,19 +26,26 @@ class SemanticLayer:
         self.store = FAISSStore(index_name="semantic_layer")
         self.embedding_service = get_embedding_service()
 
-    def add_chunks(self, texts: List[str], chunk_ids: List[str]):
+    def add_chunks(
+        self,
+        texts: List[str],
+        chunk_ids: List[str],
+        embeddings: Optional[List[List[float]]] = None
+    ):
         """
         Generate embeddings and add chunks to the semantic index.
         
         Args:
             texts: List of chunk texts
             chunk_ids: List of unique chunk identifiers
+            embeddings: Precomputed embeddings for texts (generated if omitted)
         """
         if not texts:
             return
 
         try:
-            embeddings = self.embedding_service.generate_embeddings_batch(texts)
+            if embeddings is None:
+                embeddings = self.embedding_service.generate_embeddings_batch(texts)
             self.store.add_vectors(embeddings, chunk_ids)
             logger.info(f"Added {len(texts)} chunks to semantic layer")
         except Exception as e:
@@ -1,17 +1,28 @@
 """Index Manager for orchestrating multi-layer indexing."""
 import logging
-from typing import List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-from datetime import datetime
+import numpy as np
 
 from src.indexing.layers.semantic import SemanticLayer, SearchResult
 from src.indexing.layers.citation import CitationLayer
-from src.models.project import Project, ProjectStatus, ScopeType
+from src.models.project import ProjectStatus, ScopeType
 from src.models.document import Document
-from src.storage.db.database import get_db
+from src.storage.db.database import SessionLocal
+from src.storage.db.models import ProjectModel
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for writing to the index layers in parallel (one thread per layer)
+_layer_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="index-layer")
+
+# Buffered (flush=False) vectors are written once this many are pending
+FLUSH_BATCH_SIZE = 4096
+
 
 class IndexManager:
     """
@@ -22,8 +33,23 @@ class IndexManager:
     def __init__(self):
         self.semantic_layer = SemanticLayer()
         self.citation_layer = CitationLayer()
+        # Embeddings of complete documents waiting to be written, kept as
+        # contiguous float32 blocks
+        self._pending_embeddings: List[np.ndarray] = []
+        self._pending_ids: List[str] = []
+        # Documents still being streamed in through add_chunks, by document id;
+        # only written once complete, so a failed ingestion never reaches the
+        # indices (and concurrent ingestions don't flush each other's batches)
+        self._building: Dict[str, Tuple[List[np.ndarray], List[str]]] = {}
+        self._pending_lock = threading.Lock()
         
-    def add_document(self, document_id: str, chunks: List[str], chunk_ids: List[str]):
+    def add_document(
+        self,
+        document_id: str,
+        chunks: List[str],
+        chunk_ids: List[str],
+        flush: bool = True
+    ):
         """
         Add document chunks to all index layers.
         
@@ -31,21 +57,91 @@ class IndexManager:
             document_id: ID of the document
             chunks: List of chunk texts
             chunk_ids: List of chunk IDs
+            flush: Write to the indices now. Bulk loaders can pass False to
+                buffer several documents and write them in one batch (written
+                automatically once FLUSH_BATCH_SIZE vectors are pending, or
+                on an explicit flush()).
         """
         if not chunks:
             return
             
         logger.info(f"Adding document {document_id} to indices ({len(chunks)} chunks)")
+        embeddings = self._embed(chunks)
+        with self._pending_lock:
+            self._pending_embeddings.append(embeddings)
+            self._pending_ids.extend(chunk_ids)
+            pending = len(self._pending_ids)
+        if flush or pending >= FLUSH_BATCH_SIZE:
+            self.flush()
         
-        # Add to semantic layer
-        self.semantic_layer.add_chunks(chunks, chunk_ids)
+        # Invalidate ALL_DOCS projects
+        self._invalidate_all_docs_projects()
+
+    def add_chunks(self, document_id: str, chunks: List[str], chunk_ids: List[str]):
+        """
+        Embed a batch of a document's chunks and hold them until the document
+        is complete. Streaming ingestion calls this per batch, then
+        complete_document() at the end (or discard_document() on failure).
         
-        # Add to citation layer
-        # For now, we use the same chunks. In future, we might use smaller chunks.
-        self.citation_layer.add_chunks(chunks, chunk_ids)
+        Args:
+            document_id: ID of the document
+            chunks: List of chunk texts
+            chunk_ids: List of chunk IDs
+        """
+        if not chunks:
+            return
         
-        # Invalidate ALL_DOCS projects
+        embeddings = self._embed(chunks)
+        with self._pending_lock:
+            blocks, ids = self._building.setdefault(document_id, ([], []))
+            blocks.append(embeddings)
+            ids.extend(chunk_ids)
+
+    def complete_document(self, document_id: str):
+        """Write a document added through add_chunks and invalidate ALL_DOCS projects."""
+        with self._pending_lock:
+            blocks, ids = self._building.pop(document_id, ([], []))
+            self._pending_embeddings.extend(blocks)
+            self._pending_ids.extend(ids)
+        self.flush()
+        logger.info(f"Indexed document {document_id}")
         self._invalidate_all_docs_projects()
+
+    def discard_document(self, document_id: str):
+        """Drop the embeddings of a document whose ingestion failed before completing."""
+        with self._pending_lock:
+            blocks, ids = self._building.pop(document_id, ([], []))
+        if ids:
+            logger.info(f"Discarded {len(ids)} unindexed vectors of document {document_id}")
+
+    def _embed(self, chunks: List[str]) -> np.ndarray:
+        """Embed chunks as one contiguous float32 block for the index layers."""
+        # Both layers currently index the same chunks with the same model,
+        # so embed once and share the vectors.
+        return np.ascontiguousarray(
+            self.semantic_layer.embedding_service.generate_embeddings_batch(chunks),
+            dtype=np.float32
+        )
+
+    def flush(self):
+        """Write the buffered embeddings of complete documents to the index layers in one batch."""
+        with self._pending_lock:
+            if not self._pending_ids:
+                return
+            embeddings = np.vstack(self._pending_embeddings)
+            chunk_ids = self._pending_ids
+            self._pending_embeddings, self._pending_ids = [], []
+        
+        # Add to semantic and citation layers concurrently; each writes to and
+        # persists its own FAISS store, and FAISS releases the GIL while adding.
+        # For now, we use the same chunks. In future, we might use smaller chunks.
+        futures = [
+            _layer_executor.submit(self.semantic_layer.store.add_vectors, embeddings, chunk_ids),
+            _layer_executor.submit(self.citation_layer.store.add_vectors, embeddings, chunk_ids),
+        ]
+        for future in futures:
+            future.result()
+        logger.info(f"Flushed {len(chunk_ids)} vectors to semantic and citation layers")
         
     def search(self, query: str, k: int = 5) -> List[SearchResult]:
         """
@@ -66,21 +162,20 @@ class IndexManager:
         This forces them to re-evaluate answers against the new document.
         """
         try:
-            # Create a new session for this operation
-            db = next(get_db())
-            
-            projects = db.query(Project).filter(
-                Project.scope_type == ScopeType.ALL_DOCS,
-                Project.status != ProjectStatus.OUTDATED
-            ).all()
-            
-            count = 0
-            for project in projects:
-                project.status = ProjectStatus.OUTDATED
-                project.updated_at = datetime.utcnow()
-                count += 1
+            # Short-lived session; the connection returns to the pool on exit
+            with SessionLocal() as db:
+                # Single bulk UPDATE; no project rows are loaded into the session
+                result = db.execute(
+                    update(ProjectModel)
+                    .where(
+                        ProjectModel.scope_type == ScopeType.ALL_DOCS,
+                        ProjectModel.status != ProjectStatus.OUTDATED
+                    )
+                    .values(status=ProjectStatus.OUTDATED, updated_at=func.now())
+                )
+                count = result.rowcount
+                db.commit()
                 
-            db.commit()
             if count > 0:
                 logger.info(f"Invalidated {count} ALL_DOCS projects due to new document")
                 
@@ -93,3 +188,13 @@ class IndexManager:
         self.semantic_layer.clear()
         self.citation_layer.clear()
         logger.info("Cleared all indices")
+
+
+@lru_cache(maxsize=1)
+def get_index_manager() -> IndexManager:
+    """
+    Get the process-wide IndexManager.
+    Sharing it avoids re-reading both FAISS indices from disk for every
+    retrieval or ingestion run; the stores reload when the files change.
+    """
+    return IndexManager()
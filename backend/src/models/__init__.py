@@ -5,6 +5,7 @@ from src.models.project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectDetail,
+    ProjectPage,
     ProjectStatus,
     ScopeType,
     Section,
@@ -24,6 +25,7 @@ from src.models.answer import (
 )
 from src.models.document import (
     Document,
+    DocumentPage,
     DocumentCreate,
     DocumentUpdate,
     DocumentStatus,
@@ -45,6 +47,7 @@ __all__ = [
     "ProjectCreate",
     "ProjectUpdate",
     "ProjectDetail",
+    "ProjectPage",
     "ProjectStatus",
     "ScopeType",
     "Section",
@@ -62,6 +65,7 @@ __all__ = [
     "AnswerFlagMissing",
     # Document models
     "Document",
+    "DocumentPage",
     "DocumentCreate",
     "DocumentUpdate",
     "DocumentStatus",
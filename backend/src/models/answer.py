@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
+from src.models.base import OrmFastMixin
+
 
 class AnswerStatus(str, Enum):
     """Answer review status."""
@@ -22,14 +24,13 @@ class CitationBase(BaseModel):
     document_name: Optional[str] = None
 
 
-class Citation(CitationBase):
+class Citation(OrmFastMixin, CitationBase):
     """Complete citation schema."""
     id: UUID = Field(default_factory=uuid4)
     answer_id: UUID
     chunk_id: UUID
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AnswerBase(BaseModel):
@@ -54,7 +55,7 @@ class AnswerUpdate(BaseModel):
     is_manual: bool = False
 
 
-class Answer(AnswerBase):
+class Answer(OrmFastMixin, AnswerBase):
     """Complete answer schema."""
     id: UUID = Field(default_factory=uuid4)
     question_id: UUID
@@ -67,8 +68,14 @@ class Answer(AnswerBase):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     citations: List[Citation] = Field(default_factory=list)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, row) -> "Answer":
+        """Unvalidated construction from a trusted AnswerModel, including citations."""
+        answer = super().from_orm_fast(row)
+        answer.citations = [Citation.from_orm_fast(c) for c in row.citations]
+        return answer
 
 
 class AnswerConfirm(BaseModel):
@@ -0,0 +1,24 @@
+"""Shared helpers for API schemas."""
+from typing import Any
+
+_MISSING = object()
+
+
+class OrmFastMixin:
+    """
+    Adds `from_orm_fast` to a Pydantic model: build an instance from a trusted
+    ORM row with `model_construct`, skipping validation.
+
+    Only use this where the database is the source of truth, and serialize the
+    result with `warnings=False`: values keep their column types (e.g. string
+    ids in UUID fields), which serialize identically to JSON.
+    """
+
+    @classmethod
+    def from_orm_fast(cls, row: Any):
+        data = {}
+        for name in cls.model_fields:
+            value = getattr(row, name, _MISSING)
+            if value is not _MISSING:
+                data[name] = value
+        return cls.model_construct(**data)
@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
+from src.models.base import OrmFastMixin
+
 
 class DocumentStatus(str, Enum):
     """Document processing status."""
@@ -31,7 +33,7 @@ class DocumentUpdate(BaseModel):
     error_message: Optional[str] = None
 
 
-class Document(DocumentBase):
+class Document(OrmFastMixin, DocumentBase):
     """Complete document schema."""
     id: UUID = Field(default_factory=uuid4)
     file_path: str
@@ -42,8 +44,13 @@ class Document(DocumentBase):
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
     indexed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DocumentPage(BaseModel):
+    """Keyset-paginated page of documents."""
+    items: List[Document] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
 
 
 class ChunkBase(BaseModel):
@@ -61,8 +68,7 @@ class Chunk(ChunkBase):
     embedding_vector: Optional[List[float]] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class IndexStatus(BaseModel):
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SimilarityMetrics(BaseModel):
@@ -31,8 +31,7 @@ class Evaluation(EvaluationBase):
     metrics: SimilarityMetrics
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GroundTruthBase(BaseModel):
@@ -52,8 +51,7 @@ class GroundTruth(GroundTruthBase):
     id: UUID = Field(default_factory=uuid4)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EvaluationReport(BaseModel):
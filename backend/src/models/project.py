@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
+from src.models.base import OrmFastMixin
+
 
 class ProjectStatus(str, Enum):
     """Project lifecycle status."""
@@ -42,15 +44,20 @@ class ProjectUpdate(BaseModel):
     document_ids: Optional[List[UUID]] = None
 
 
-class Project(ProjectBase):
+class Project(OrmFastMixin, ProjectBase):
     """Complete project schema."""
     id: UUID = Field(default_factory=uuid4)
     status: ProjectStatus = ProjectStatus.DRAFT
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectPage(BaseModel):
+    """Keyset-paginated page of projects."""
+    items: List[Project] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
 
 
 class SectionBase(BaseModel):
@@ -71,8 +78,7 @@ class Section(SectionBase):
     project_id: UUID
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QuestionBase(BaseModel):
@@ -95,8 +101,7 @@ class Question(QuestionBase):
     section_id: Optional[UUID] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectDetail(Project):
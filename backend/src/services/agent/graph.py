@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from .state import AgentState
 from .nodes.retrieval import retrieve_node
@@ -8,39 +9,25 @@ from .nodes.hallucination import hallucination_node
 
 logger = logging.getLogger(__name__)
 
-def decide_to_generate(state: AgentState):
-    """
-    Determines whether to generate an answer, or re-retrieve.
-    """
-    logger.info("---ASSESSING NEXT STEP---")
-    filtered_documents = state["documents"]
-
-    if not filtered_documents:
-        # All documents have been filtered check_relevance
-        # We could add an "improve_query" step here.
-        # For now, if no docs, we just try to generate with what we have (which will handle failure)
-        logger.info("---DECISION: NO RELEVANT DOCUMENTS, ENDING---")
-        return "generate"
-    else:
-        # We have relevant documents, so generate answer
-        logger.info("---DECISION: GENERATE---")
-        return "generate"
+# Retry policy after the hallucination check, keyed on
+# (is_grounded, retries remaining). Ungrounded answers are regenerated until
+# retries run out, then returned as-is.
+_GENERATION_ROUTE = {
+    (True, True): "useful",
+    (True, False): "useful",
+    (False, True): "not grounded",
+    (False, False): "useful",  # Give up and return what we have
+}
 
 def grade_generation_v_documents_and_question(state: AgentState):
     """
     Determines whether the generation is grounded in the documents and answers question.
     """
     logger.info("---GRADING GENERATION---")
-    is_grounded = state.get("is_answerable", True)
-    
-    if is_grounded:
-        logger.info("---DECISION: GENERATION IS GROUNDED---")
-        return "useful"
-    else:
-        logger.info("---DECISION: GENERATION IS NOT GROUNDED---")
-        if state["retries"] < state["max_retries"]:
-            return "not grounded"
-        return "useful" # Give up and return what we have
+    is_grounded = state.is_grounded
+    route = _GENERATION_ROUTE[(is_grounded, state.retries < state.max_retries)]
+    logger.info(f"---DECISION: GENERATION IS {'GROUNDED' if is_grounded else 'NOT GROUNDED'} -> {route}---")
+    return route
 
 def create_rag_graph(checkpointer=None):
     """
@@ -57,15 +44,8 @@ def create_rag_graph(checkpointer=None):
     # Build graph
     workflow.set_entry_point("retrieve")
     workflow.add_edge("retrieve", "grade_documents")
-    
-    workflow.add_conditional_edges(
-        "grade_documents",
-        decide_to_generate,
-        {
-            "generate": "generate",
-        },
-    )
-    
+    # Always generate after grading; generate_node handles the no-documents case
+    workflow.add_edge("grade_documents", "generate")
     workflow.add_edge("generate", "hallucination_check")
     
     workflow.add_conditional_edges(
@@ -78,3 +58,12 @@ def create_rag_graph(checkpointer=None):
     )
 
     return workflow.compile(checkpointer=checkpointer)
+
+
+@lru_cache(maxsize=4)
+def get_rag_graph(checkpointer=None):
+    """
+    Compiled RAG graph, cached per checkpointer instance so the StateGraph is
+    only compiled once per process for a long-lived checkpointer.
+    """
+    return create_rag_graph(checkpointer=checkpointer)
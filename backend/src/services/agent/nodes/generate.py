@@ -1,9 +1,11 @@
 import logging
+from string import Template
 from typing import Dict, Any, List
-from pydantic import BaseModel, Field
-from src.services.llm_service import LLMService
+from pydantic import BaseModel, Field, TypeAdapter
+from src.services.llm_service import get_llm
+from src.utils.config import get_settings
 from ..state import AgentState
-from src.services.retrieval import RetrievedChunk
+from src.services.retrieval import RetrievedChunk, unique_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -14,51 +16,91 @@ class GeneratedResponse(BaseModel):
     confidence_score: float = Field(description="Confidence score between 0 and 1")
     cited_indices: List[int] = Field(description="List of 1-based indices of documents cited in the answer")
 
+# Validators built once at import and reused for every LLM response
+GENERATED_RESPONSE_ADAPTER = TypeAdapter(GeneratedResponse)
+
+# Prompt templates, parsed once at import
+_GENERATE_TPL = Template("""You are a due diligence assistant. Use the following context to answer the question.
+    
+    CRITICAL RULES:
+    1. Only use information from the context.
+    2. Cite the documents using [1], [2] style indices in the text.
+    3. If the answer is not in the context, say you don't know and set is_answerable to false.
+    4. Provide a confidence score based on how explicitly the context answers the question.
+    5. List which document indices you actually used in 'cited_indices'.
+    $feedback
+
+    Question: $question 
+    
+    Context: 
+    $context 
+    """)
+
+_FEEDBACK_TPL = Template(
+    "\n\nUSER FEEDBACK ON PREVIOUS ATTEMPT: $feedback\n"
+    "Please incorporate this feedback into your revised answer. Use the context to address the feedback."
+)
+
+# Rough characters-per-token ratio for English text with Gemini tokenizers
+CHARS_PER_TOKEN = 4
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for the context budget (no tokenizer call)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
 def generate_node(state: AgentState) -> Dict[str, Any]:
     """
     Generates an answer based on the retrieved documents with structured citations.
     """
     logger.info("---GENERATE NODE---")
-    question = state["question"]
-    documents = state["documents"]
+    question = state.question
+    # Overlapping retrievals can return the same chunk twice; keep one copy
+    # so it is neither paid for twice in the prompt nor cited under two indices
+    documents = unique_chunks(state.documents)
     
     if not documents:
         return {
             "generation": "I'm sorry, I couldn't find any relevant information to answer this question.",
             "is_answerable": False,
             "confidence_score": 0.0,
-            "steps": state["steps"] + ["generate"]
+            "steps": ["generate"]
         }
 
-    # Format context with indices
+    # Format context with indices, keeping documents (in rank order) until
+    # the token budget is spent so prompt size stays bounded
+    budget = get_settings().generation_context_token_budget
     context_list = []
+    used_tokens = 0
     for i, doc in enumerate(documents, 1):
-        context_list.append(f"[{i}] Source: {doc.filename}\nContent: {doc.text}")
+        entry = f"[{i}] Source: {doc.filename}\nContent: {doc.text}"
+        entry_tokens = _estimate_tokens(entry)
+        if context_list and used_tokens + entry_tokens > budget:
+            break
+        context_list.append(entry)
+        used_tokens += entry_tokens
     context = "\n\n".join(context_list)
+    
+    errors = state.errors
+    if len(context_list) < len(documents):
+        dropped = list(range(len(context_list) + 1, len(documents) + 1))
+        logger.info(f"Context budget of {budget} tokens reached, dropping documents {dropped}")
+        errors = errors + [f"Context budget exceeded; dropped documents {dropped}"]
+        documents = documents[:len(context_list)]
 
     # Handle feedback if present
-    feedback = state.get("feedback")
-    feedback_prompt = f"\n\nUSER FEEDBACK ON PREVIOUS ATTEMPT: {feedback}\nPlease incorporate this feedback into your revised answer. Use the context to address the feedback." if feedback else ""
-
-    prompt = f"""You are a due diligence assistant. Use the following context to answer the question.
-    
-    CRITICAL RULES:
-    1. Only use information from the context.
-    2. Cite the documents using [1], [2] style indices in the text.
-    3. If the answer is not in the context, say you don't know and set is_answerable to false.
-    4. Provide a confidence score based on how explicitly the context answers the question.
-    5. List which document indices you actually used in 'cited_indices'.
-    {feedback_prompt}
+    feedback = state.feedback
+    feedback_prompt = _FEEDBACK_TPL.substitute(feedback=feedback) if feedback else ""
 
-    Question: {question} 
-    
-    Context: 
-    {context} 
-    """
+    prompt = _GENERATE_TPL.substitute(feedback=feedback_prompt, question=question, context=context)
     
     try:
-        llm = LLMService()
-        response = llm.generate_structured(prompt, GeneratedResponse)
+        llm = get_llm()
+        response = llm.generate_structured(prompt, GENERATED_RESPONSE_ADAPTER)
+        
+        # Valid 1-based indices, deduplicated in citation order, so a document
+        # cited twice is only persisted as one citation
+        n = len(documents)
+        cited = dict.fromkeys(i for i in response.cited_indices if 1 <= i <= n)
         
         # Calculate a more dynamic confidence score if it's too generic
         # (Simplified: average of LLM score and retrieval relevance if we had distances)
@@ -68,8 +110,9 @@ def generate_node(state: AgentState) -> Dict[str, Any]:
             "generation": response.answer,
             "is_answerable": response.is_answerable,
             "confidence_score": response.confidence_score,
-            "documents": [documents[i-1] for i in response.cited_indices if 0 < i <= len(documents)],
-            "steps": state["steps"] + ["generate"]
+            "documents": [documents[i-1] for i in cited],
+            "errors": errors,
+            "steps": ["generate"]
         }
     except Exception as e:
         logger.error(f"Generation failed: {e}")
@@ -77,5 +120,5 @@ def generate_node(state: AgentState) -> Dict[str, Any]:
             "generation": "Error during answer generation.",
             "is_answerable": False,
             "confidence_score": 0.0,
-            "steps": state["steps"] + ["generate"]
+            "steps": ["generate"]
         }
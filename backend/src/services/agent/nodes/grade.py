@@ -1,7 +1,9 @@
 import logging
-from typing import Dict, Any, List
-from pydantic import BaseModel, Field
-from src.services.llm_service import LLMService
+from string import Template
+from typing import Dict, Any, List, Literal
+from pydantic import BaseModel, Field, TypeAdapter
+from src.services.llm_service import get_llm
+from src.utils.config import get_settings
 from ..state import AgentState
 
 logger = logging.getLogger(__name__)
@@ -10,36 +12,99 @@ class GradeResult(BaseModel):
     """Binary score for relevance check."""
     binary_score: str = Field(description="Relevance score 'yes' or 'no'")
 
+class BatchGradeResult(BaseModel):
+    """Relevance scores for a numbered list of documents, in order."""
+    scores: List[Literal["yes", "no"]] = Field(description="One 'yes' or 'no' per document, in document order")
+
+# Validators built once at import and reused for every LLM response
+GRADE_ADAPTER = TypeAdapter(GradeResult)
+BATCH_GRADE_ADAPTER = TypeAdapter(BatchGradeResult)
+
+# Prompt templates, parsed once at import
+_GRADE_TPL = Template("""You are a grader assessing relevance of a retrieved document to a user question.
+        If the document contains keyword(s) or semantic meaning related to the user question, grade it as relevant.
+        Give a binary score 'yes' or 'no' score to indicate whether the document is relevant to the question.
+
+        Retrieved document:
+        $document
+
+        User question: $question
+        """)
+
+_BATCH_GRADE_TPL = Template("""You are a grader assessing relevance of retrieved documents to a user question.
+        If a document contains keyword(s) or semantic meaning related to the user question, grade it as relevant.
+        For each document give a binary score 'yes' or 'no' to indicate whether it is relevant to the question.
+        Return exactly $count scores in 'scores', in the same order as the documents.
+
+        Retrieved documents:
+        $documents
+
+        User question: $question
+        """)
+
+def _grade_prompt(question: str, document_text: str) -> str:
+    """Prompt for grading a single document."""
+    return _GRADE_TPL.substitute(document=document_text, question=question)
+
+def _batch_grade_prompt(question: str, documents: List[Any]) -> str:
+    """Prompt for grading all documents in one call, numbered like generate_node's context."""
+    numbered = "\n\n".join(f"[{i}] {doc.text}" for i, doc in enumerate(documents, 1))
+    return _BATCH_GRADE_TPL.substitute(count=len(documents), documents=numbered, question=question)
+
 def grade_node(state: AgentState) -> Dict[str, Any]:
     """
     Determines whether the retrieved documents are relevant to the question.
+    Retrieval scores settle clear-cut cases; the rest are graded in a single
+    LLM call.
     """
     logger.info("---CHECK RELEVANCE NODE---")
-    question = state["question"]
-    documents = state["documents"]
-    
-    llm = LLMService()
-    
+    question = state.question
+    settings = get_settings()
+    documents = state.documents
+    if settings.grade_reject_min_distance is not None:
+        # Scores are distances: drop clearly unrelated chunks up front
+        documents = [d for d in documents if d.score < settings.grade_reject_min_distance]
+        if len(documents) < len(state.documents):
+            logger.info(f"---GRADE: DROPPED {len(state.documents) - len(documents)} DISTANT DOCUMENTS---")
+
+    if not documents:
+        return {
+            "documents": [],
+            "steps": ["grade_documents"]
+        }
+
+    if all(d.score <= settings.grade_skip_max_distance for d in documents):
+        logger.info("---GRADE: ALL DOCUMENTS CLOSE MATCHES, SKIPPING LLM GRADING---")
+        return {
+            "documents": documents,
+            "steps": ["grade_documents_skipped"]
+        }
+
+    llm = get_llm()
+
+    # Grades only depend on the prompt, so retries and re-runs reuse them
+    result = llm.generate_structured(_batch_grade_prompt(question, documents), BATCH_GRADE_ADAPTER, cache=True)
+    scores = result.scores
+    if len(scores) != len(documents):
+        # The model miscounted; fall back to grading each document on its own,
+        # with the calls issued concurrently
+        logger.warning(f"Batch grading returned {len(scores)} scores for {len(documents)} documents, grading individually")
+        results = llm.generate_structured_many(
+            [_grade_prompt(question, doc.text) for doc in documents],
+            GRADE_ADAPTER,
+            cache=True
+        )
+        scores = [r.binary_score.lower() for r in results]
+
     filtered_docs = []
-    for doc in documents:
-        prompt = f"""You are a grader assessing relevance of a retrieved document to a user question. 
-        If the document contains keyword(s) or semantic meaning related to the user question, grade it as relevant. 
-        Give a binary score 'yes' or 'no' score to indicate whether the document is relevant to the question.
-        
-        Retrieved document: 
-        {doc.text}
-        
-        User question: {question}
-        """
-        
-        result = llm.generate_structured(prompt, GradeResult)
-        if result.binary_score.lower() == "yes":
+    for doc, score in zip(documents, scores):
+        if score == "yes":
             logger.info("---GRADE: DOCUMENT RELEVANT---")
             filtered_docs.append(doc)
         else:
             logger.info("---GRADE: DOCUMENT NOT RELEVANT---")
-            
+
     return {
         "documents": filtered_docs,
-        "steps": state["steps"] + ["grade_documents"]
+        "steps": ["grade_documents"]
     }
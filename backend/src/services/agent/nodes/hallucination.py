@@ -1,7 +1,9 @@
 import logging
+from string import Template
 from typing import Dict, Any
-from pydantic import BaseModel, Field
-from src.services.llm_service import LLMService
+from pydantic import BaseModel, Field, TypeAdapter
+from src.services.llm_service import get_llm
+from src.services.retrieval import unique_chunks
 from ..state import AgentState
 
 logger = logging.getLogger(__name__)
@@ -10,37 +12,61 @@ class HallucinationResult(BaseModel):
     """Binary score for hallucination check."""
     binary_score: str = Field(description="Answer is grounded in the documents, 'yes' or 'no'")
 
+# Generations that make no factual claim (see generate_node's fallbacks)
+UNGROUNDED_PREFIXES = ("I'm sorry", "I don't know", "Error during")
+# Answers the generator itself rates below this are not worth an extra check
+MIN_CHECK_CONFIDENCE = 0.2
+
+# Validators built once at import and reused for every LLM response
+HALLUCINATION_ADAPTER = TypeAdapter(HallucinationResult)
+
+# Prompt template, parsed once at import
+_HALLUCINATION_TPL = Template("""You are a grader assessing whether an LLM generation is grounded in / supported by a set of retrieved documents. 
+    Give a binary score 'yes' or 'no'. 'Yes' means that the answer is grounded in / supported by the set of documents.
+    
+    Retrieved documents: 
+    $context
+    
+    LLM generation: $generation
+    """)
+
 def hallucination_node(state: AgentState) -> Dict[str, Any]:
     """
     Determines whether the generation is grounded in the retrieved documents.
+    Refusals, generation errors and very low-confidence answers make no claim
+    to verify, so they skip the LLM check.
     """
     logger.info("---CHECK HALLUCINATIONS NODE---")
-    generation = state["generation"]
-    documents = state["documents"]
+    generation = state.generation
+    documents = state.documents
     
     if not generation or not documents:
         return {
-            "steps": state["steps"] + ["check_hallucinations"],
-            "is_answerable": True # "I don't know" is grounded in no context
+            "steps": ["check_hallucinations"],
+            "is_answerable": True, # "I don't know" is grounded in no context
+            "is_grounded": True
         }
 
-    context = "\n\n".join([doc.text for doc in documents])
-    
-    llm = LLMService()
-    prompt = f"""You are a grader assessing whether an LLM generation is grounded in / supported by a set of retrieved documents. 
-    Give a binary score 'yes' or 'no'. 'Yes' means that the answer is grounded in / supported by the set of documents.
-    
-    Retrieved documents: 
-    {context}
+    confidence = state.confidence_score
+    if generation.startswith(UNGROUNDED_PREFIXES) or (confidence is not None and confidence < MIN_CHECK_CONFIDENCE):
+        # Keep generate_node's answerability; nothing to ground, so don't retry
+        logger.info("---SKIPPING HALLUCINATION CHECK: NO CLAIM TO VERIFY---")
+        return {
+            "steps": ["check_hallucinations"],
+            "is_grounded": True
+        }
+
+    context = "\n\n".join(doc.text for doc in unique_chunks(documents))
     
-    LLM generation: {generation}
-    """
+    llm = get_llm()
+    prompt = _HALLUCINATION_TPL.substitute(context=context, generation=generation)
     
-    result = llm.generate_structured(prompt, HallucinationResult)
+    result = llm.generate_structured(prompt, HALLUCINATION_ADAPTER, cache=True)
     is_answerable = result.binary_score.lower() == "yes"
     
     return {
-        "steps": state["steps"] + ["check_hallucinations"],
+        "steps": ["check_hallucinations"],
         "is_answerable": is_answerable,
-        "retries": state["retries"] + (0 if is_answerable else 1)
+        "is_grounded": is_answerable,
+        "retries": state.retries + (0 if is_answerable else 1)
     }
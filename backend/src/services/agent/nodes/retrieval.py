@@ -11,8 +11,8 @@ def retrieve_node(state: AgentState) -> Dict[str, Any]:
     Retrieves documents based on the question.
     """
     logger.info("---RETRIEVE NODE---")
-    question = state["question"]
-    document_ids = state.get("document_ids")
+    question = state.question
+    document_ids = state.document_ids
     
     # Get DB session
     db = next(get_db())
@@ -27,5 +27,5 @@ def retrieve_node(state: AgentState) -> Dict[str, Any]:
     
     return {
         "documents": documents,
-        "steps": state["steps"] + ["retrieve"]
+        "steps": ["retrieve"]
     }
@@ -1,20 +1,25 @@
-from typing import List, TypedDict, Optional, Dict, Any
+import operator
+from dataclasses import dataclass, field
+from typing import Annotated, List, Optional
 from src.services.retrieval import RetrievedChunk
 
-class AgentState(TypedDict):
+@dataclass(slots=True)
+class AgentState:
     """
     Represents the state of our LangGraph agent.
+    Nodes read attributes and return dicts of the fields they update.
     """
     question: str
-    project_id: str
-    document_ids: Optional[List[str]]  # Restricted scope if applicable
-    documents: List[RetrievedChunk]
-    generation: Optional[str]
-    is_answerable: bool
-    confidence_score: float
-    retries: int
-    max_retries: int
-    errors: List[str]
-    # Trace metadata
-    steps: List[str]
-    feedback: Optional[str]
+    project_id: str = ""
+    document_ids: Optional[List[str]] = None  # Restricted scope if applicable
+    documents: List[RetrievedChunk] = field(default_factory=list)
+    generation: Optional[str] = None
+    is_answerable: bool = True
+    is_grounded: bool = True  # Set by the hallucination check; drives the retry edge
+    confidence_score: Optional[float] = None  # None until generate_node has run
+    retries: int = 0
+    max_retries: int = 1
+    errors: List[str] = field(default_factory=list)
+    # Trace metadata; nodes return only their own step and LangGraph appends it
+    steps: Annotated[List[str], operator.add] = field(default_factory=list)
+    feedback: Optional[str] = None
@@ -1,16 +1,31 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from uuid import UUID, uuid4
+from dataclasses import asdict, is_dataclass
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from datetime import datetime
 
-from src.services.agent.graph import create_rag_graph
+from src.services.agent.graph import get_rag_graph
 from src.services.agent.state import AgentState
-from src.storage.db.models import AnswerModel, CitationModel, QuestionModel, ProjectModel
+from src.services.langgraph_persistence import LangGraphPersistence
+from src.storage.db.database import SessionLocal
+from src.storage.db.models import AnswerModel, CitationModel, QuestionModel, project_documents
 from src.models.answer import AnswerStatus
 
 logger = logging.getLogger(__name__)
 
+# Concurrent question workers in generate_all_for_project
+GENERATION_WORKERS = 8
+
+
+def _bbox(bounding_box: Any) -> Optional[Dict[str, Any]]:
+    """Bounding boxes may arrive as dataclasses; store them as plain dicts."""
+    if bounding_box and is_dataclass(bounding_box):
+        return asdict(bounding_box)
+    return bounding_box
+
+
 class AnswerService:
     """
     Main service for coordinating answer generation.
@@ -19,46 +34,47 @@ class AnswerService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.graph = create_rag_graph()
 
-    def generate_answer(self, question_id: str) -> AnswerModel:
+    def _project_document_ids(self, project_id: str) -> Optional[List[str]]:
+        """IDs of the documents linked to a project, or None if it has none (all docs in scope)."""
+        document_ids = self.db.execute(
+            select(project_documents.c.document_id).where(project_documents.c.project_id == project_id)
+        ).scalars().all()
+        return list(document_ids) or None
+
+    def generate_answer(self, question_id: str, document_ids: Optional[List[str]] = None) -> AnswerModel:
         """
         Generates an answer for a single question with persistence.
+        
+        Args:
+            question_id: Question to answer
+            document_ids: Document scope, if already known (e.g. prefetched for a
+                whole project); looked up from the question's project otherwise
         """
         logger.info(f"Generating answer for question: {question_id}")
         
         # 1. Fetch question and project context
-        question = self.db.query(QuestionModel).filter(QuestionModel.id == question_id).first()
+        question = self.db.get(QuestionModel, question_id)
         if not question:
             raise ValueError(f"Question {question_id} not found")
             
-        project = self.db.query(ProjectModel).filter(ProjectModel.id == question.project_id).first()
-        document_ids = [doc.id for doc in project.documents] if project and project.documents else None
+        if document_ids is None:
+            document_ids = self._project_document_ids(question.project_id)
 
         # 2. Prepare Agent State
-        initial_state: AgentState = {
-            "question": question.text,
-            "project_id": str(question.project_id),
-            "document_ids": document_ids,
-            "documents": [],
-            "generation": None,
-            "is_answerable": True,
-            "confidence_score": 0.0,
-            "retries": 0,
-            "max_retries": 1,
-            "errors": [],
-            "steps": [],
-            "feedback": None
-        }
+        initial_state = asdict(AgentState(
+            question=question.text,
+            project_id=str(question.project_id),
+            document_ids=document_ids,
+            max_retries=1
+        ))
 
         # 3. Run Agent with checkpointer
-        from src.services.langgraph_persistence import LangGraphPersistence
         thread_id = str(uuid4())
         config = {"configurable": {"thread_id": thread_id}}
         
-        with LangGraphPersistence.get_sqlite_checkpointer() as checkpointer:
-            graph = create_rag_graph(checkpointer=checkpointer)
-            final_state = graph.invoke(initial_state, config=config)
+        graph = get_rag_graph(LangGraphPersistence.get_shared_checkpointer())
+        final_state = graph.invoke(initial_state, config=config)
 
         # 4. Save to DB
         db_answer = AnswerModel(
@@ -69,29 +85,25 @@ class AnswerService:
             status=AnswerStatus.PENDING,
             created_by="AI",
             thread_id=thread_id,
-            processing_metadata={"steps": final_state.get("steps", [])},
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            processing_metadata={"steps": final_state.get("steps", [])}
         )
         self.db.add(db_answer)
         self.db.flush()
 
-        # 5. Save Citations
-        from dataclasses import asdict, is_dataclass
-        for doc in final_state.get("documents", []):
-            bbox = doc.bounding_box
-            if bbox and is_dataclass(bbox):
-                bbox = asdict(bbox)
-                
-            citation = CitationModel(
-                answer_id=db_answer.id,
-                chunk_id=doc.id,
-                chunk_text=doc.text,
-                page_number=doc.page_number,
-                bounding_box=bbox,
-                document_name=doc.filename
-            )
-            self.db.add(citation)
+        # 5. Save Citations (one executemany INSERT, no per-row ORM objects)
+        rows = [
+            {
+                "answer_id": db_answer.id,
+                "chunk_id": doc.id,
+                "chunk_text": doc.text,
+                "page_number": doc.page_number,
+                "bounding_box": _bbox(doc.bounding_box),
+                "document_name": doc.filename,
+            }
+            for doc in final_state.get("documents", [])
+        ]
+        if rows:
+            self.db.execute(insert(CitationModel), rows)
 
         self.db.commit()
         self.db.refresh(db_answer)
@@ -103,9 +115,22 @@ class AnswerService:
         Trigger async generation for all questions in a project.
         (This will be called by a Celery task).
         """
-        questions = self.db.query(QuestionModel).filter(QuestionModel.id == project_id).all()
-        for q in questions:
-            try:
-                self.generate_answer(q.id)
-            except Exception as e:
-                logger.error(f"Failed to generate answer for {q.id}: {e}")
+        question_ids = self.db.execute(
+            select(QuestionModel.id).where(QuestionModel.project_id == project_id)
+        ).scalars().all()
+        # The document scope is shared by every question, so resolve it once
+        document_ids = self._project_document_ids(project_id)
+        
+        # Questions are independent and bound on LLM round-trips, so run them
+        # concurrently; each worker gets its own session (sessions aren't thread-safe)
+        with ThreadPoolExecutor(max_workers=GENERATION_WORKERS, thread_name_prefix="answer-gen") as executor:
+            list(executor.map(lambda qid: self._safe_generate(qid, document_ids), question_ids))
+
+    @staticmethod
+    def _safe_generate(question_id: str, document_ids: Optional[List[str]] = None):
+        """Generate one answer in a dedicated session, logging instead of raising."""
+        try:
+            with SessionLocal() as db:
+                AnswerService(db).generate_answer(question_id, document_ids)
+        except Exception as e:
+            logger.error(f"Failed to generate answer for {question_id}: {e}")
@@ -1,29 +1,40 @@
 """Document Service for managing document lifecycle and database operations."""
 import logging
-import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
-from uuid import UUID
-from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
 from fastapi import UploadFile
 
+from sqlalchemy import or_, select, tuple_, update
 from sqlalchemy.orm import Session
 from src.models.document import Document, DocumentStatus, DocumentCreate
+from src.storage.db.models import DocumentModel
 
 from src.utils.config import get_settings
+from src.utils.dates import utcnow
+from src.utils.files import UploadTooLarge, save_upload_capped
 
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _upload_dir(path: str) -> Path:
+    """Resolve the upload directory, creating it once per process."""
+    upload_dir = Path(path)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    return upload_dir
+
+
 class DocumentService:
     """Service for document management operations."""
     
     def __init__(self, db: Session):
         self.db = db
         self.settings = get_settings()
-        self.upload_dir = Path(self.settings.upload_dir)
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.upload_dir = _upload_dir(self.settings.upload_dir)
 
     def upload_document(self, file: UploadFile) -> Document:
         """
@@ -35,6 +46,19 @@ class DocumentService:
         Returns:
             Created Document object
             
+        Raises:
+            ValueError: If file type invalid or size too large
+        """
+        return self.create_document(file.filename, *self.save_upload(file))
+
+    def save_upload(self, file: UploadFile) -> Tuple[Path, int]:
+        """
+        Validate an upload and copy it into the upload directory (file work
+        only, no database access, so async callers can run it in a thread).
+        
+        Returns:
+            (saved file path, size in bytes)
+            
         Raises:
             ValueError: If file type invalid or size too large
         """
@@ -43,45 +67,38 @@ class DocumentService:
         if ext not in self.settings.allowed_extensions:
             raise ValueError(f"Unsupported file type: {ext}")
             
-        # Create file path
-        # Use timestamp to avoid collisions
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_filename = f"{timestamp}_{file.filename}"
+        # Create file path: a random prefix keeps concurrent uploads of the
+        # same name apart, and only the base name is kept so a client-supplied
+        # path can't escape the upload directory
+        safe_filename = f"{uuid4().hex}_{Path(file.filename).name}"
         file_path = self.upload_dir / safe_filename
         
-        # Save file
+        # Save file, enforcing the size limit while copying so oversized
+        # uploads are rejected before (or as soon as) they hit the limit
         try:
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            file_size = save_upload_capped(file.file, file_path, self.settings.max_file_size)
+        except UploadTooLarge:
+            raise
         except Exception as e:
             logger.error(f"Failed to save file {file.filename}: {e}")
             raise IOError(f"Failed to save file: {e}")
-            
-        # Validate size
-        file_size = file_path.stat().st_size
-        if file_size > self.settings.max_file_size:
-            file_path.unlink()  # Delete file
-            raise ValueError(f"File too large: {file_size} bytes (max {self.settings.max_file_size})")
-            
-        # Create database record
+        return file_path, file_size
+
+    def create_document(self, filename: str, file_path: Path, file_size: int) -> Document:
+        """Create the database record of a file saved by save_upload."""
         doc_create = DocumentCreate(
-            filename=file.filename,
-            file_type=ext,
+            filename=filename,
+            file_type=file_path.suffix.lower(),
             file_size=file_size,
             file_path=str(file_path)
         )
         
-        # Map Pydantic to SQLAlchemy model (assuming mapped in db/models.py or using Pydantic model directly if using SQLModel)
-        # Verify src/storage/db/models.py DocumentModel
-        from src.storage.db.models import DocumentModel
-        
         db_doc = DocumentModel(
             filename=doc_create.filename,
             file_type=doc_create.file_type,
             file_path=doc_create.file_path,
             file_size=doc_create.file_size,
-            status=DocumentStatus.UPLOADED,
-            uploaded_at=datetime.utcnow()
+            status=DocumentStatus.UPLOADED
         )
         
         self.db.add(db_doc)
@@ -92,31 +109,107 @@ class DocumentService:
 
     def get_document(self, document_id: str) -> Optional[Document]:
         """Get document by ID."""
-        from src.storage.db.models import DocumentModel
         return self.db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
 
-    def list_documents(self, skip: int = 0, limit: int = 100) -> List[Document]:
-        """List all documents."""
-        from src.storage.db.models import DocumentModel
-        return self.db.query(DocumentModel).offset(skip).limit(limit).all()
+    def get_document_status(self, document_id: str):
+        """
+        Fetch only the status columns of a document.
+        
+        Returns:
+            Row of (id, status, chunk_count, indexed_at, error_message), or None
+        """
+        return self.db.execute(
+            select(
+                DocumentModel.id,
+                DocumentModel.status,
+                DocumentModel.chunk_count,
+                DocumentModel.indexed_at,
+                DocumentModel.error_message,
+            ).where(DocumentModel.id == document_id)
+        ).one_or_none()
+
+    def list_documents(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Document]:
+        """
+        List documents newest first using keyset pagination, walking the
+        (uploaded_at, id) index so every page costs the same regardless of depth.
+        
+        Args:
+            limit: Maximum number of documents to return
+            after: (uploaded_at, id) of the last document of the previous page
+            
+        Returns:
+            List of documents
+        """
+        query = self.db.query(DocumentModel)
+        if after:
+            query = query.filter(tuple_(DocumentModel.uploaded_at, DocumentModel.id) < after)
+        return (
+            query.order_by(DocumentModel.uploaded_at.desc(), DocumentModel.id.desc())
+            .limit(limit)
+            .all()
+        )
 
     def update_status(self, document_id: str, status: DocumentStatus, error_message: str = None):
         """Update document status."""
-        from src.storage.db.models import DocumentModel
         doc = self.get_document(document_id)
         if doc:
             doc.status = status
             if error_message:
                 doc.error_message = error_message
             if status == DocumentStatus.READY:
-                doc.indexed_at = datetime.utcnow()
+                doc.indexed_at = utcnow()
             self.db.commit()
             self.db.refresh(doc)
         return doc
         
+    def claim_for_indexing(self, document_id: str) -> bool:
+        """
+        Atomically move a document into INDEXING unless an indexing run holds
+        it. A claim expires after index_claim_ttl_seconds, so a document whose
+        worker died (or whose task was lost) can be queued again; finishing
+        the run (READY or ERROR) releases it.
+        
+        Returns:
+            True if this call claimed the document, False if it does not exist
+            or is already being indexed
+        """
+        now = utcnow()
+        expired = now - timedelta(seconds=self.settings.index_claim_ttl_seconds)
+        result = self.db.execute(
+            update(DocumentModel)
+            .where(
+                DocumentModel.id == document_id,
+                or_(
+                    DocumentModel.status != DocumentStatus.INDEXING,
+                    DocumentModel.index_claimed_at.is_(None),
+                    DocumentModel.index_claimed_at < expired
+                )
+            )
+            .values(
+                status=DocumentStatus.INDEXING,
+                error_message=None,
+                index_task_id=None,
+                index_claimed_at=now
+            )
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def set_index_task(self, document_id: str, task_id: str):
+        """Record the task id of the indexing run that claimed a document."""
+        self.db.execute(
+            update(DocumentModel)
+            .where(DocumentModel.id == document_id)
+            .values(index_task_id=task_id)
+        )
+        self.db.commit()
+        
     def delete_document(self, document_id: str):
         """Delete document and file."""
-        from src.storage.db.models import DocumentModel
         doc = self.get_document(document_id)
         if not doc:
             return
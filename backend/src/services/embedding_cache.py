@@ -0,0 +1,130 @@
+"""Persistent, content-addressed cache for text embeddings."""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement; look keys up in chunks below it
+_LOOKUP_CHUNK = 500
+
+# PRAGMA user_version of the cache file; 1 = int8 table, float32 table dropped
+_SCHEMA_VERSION = 1
+
+
+def quantize_i8(v) -> Tuple[np.ndarray, float]:
+    """
+    Symmetric int8 quantization with a per-vector scale: v ~= q * scale.
+    A 3072-dim embedding shrinks from 12 KB (float32) to 3 KB.
+    """
+    a = np.asarray(v, dtype=np.float32)
+    peak = float(np.abs(a).max()) if a.size else 0.0
+    scale = peak / 127.0 if peak else 1.0
+    return np.round(a / scale).astype(np.int8), scale
+
+
+def dequantize_i8(q: np.ndarray, scale: float) -> np.ndarray:
+    """Float32 approximation of a quantize_i8 vector."""
+    return q.astype(np.float32) * np.float32(scale)
+
+
+def dequantize_unit_i8(q: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Dequantize a quantized unit vector and restore the unit length lost to
+    rounding, so cached embeddings keep the dot-product == cosine contract
+    of fresh ones.
+    """
+    a = dequantize_i8(q, scale)
+    norm = np.linalg.norm(a)
+    return a / norm if norm else a
+
+
+class EmbeddingCacheService:
+    """
+    SQLite-backed embedding cache keyed on blake2b(model || text), so identical
+    texts are embedded once across requests and restarts.
+    Vectors are unit embeddings, stored int8-quantized (see quantize_i8) and
+    returned as re-normalized floats.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 0):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Entry lifetime; 0 keeps entries forever
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_i8 ("
+            "key BLOB PRIMARY KEY, q BLOB NOT NULL, scale REAL NOT NULL, created_at REAL NOT NULL)"
+        )
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version < _SCHEMA_VERSION:
+            # Superseded float32 layout; it's a cache, so drop it once
+            self._conn.execute("DROP TABLE IF EXISTS embeddings")
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> bytes:
+        """Content address for a (model, text) pair."""
+        return hashlib.blake2b(model_name.encode() + b"\0" + text.encode()).digest()
+
+    def _min_created_at(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def get(self, key: bytes) -> Optional[List[float]]:
+        """Cached vector for `key`, or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        """Cached vectors for whichever of `keys` are present."""
+        found: Dict[bytes, List[float]] = {}
+        unique = list(dict.fromkeys(keys))
+        min_created_at = self._min_created_at()
+        with self._lock:
+            for i in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, q, scale FROM embeddings_i8 WHERE key IN ({placeholders}) AND created_at >= ?",
+                    (*chunk, min_created_at)
+                ).fetchall()
+                for key, q, scale in rows:
+                    found[key] = dequantize_unit_i8(np.frombuffer(q, dtype=np.int8), scale).tolist()
+        return found
+
+    def put(self, key: bytes, vector: List[float]) -> None:
+        """Store one vector."""
+        self.put_many({key: vector})
+
+    def put_many(self, items: Dict[bytes, List[float]]) -> None:
+        """Store several vectors in one transaction (replacing expired entries)."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vec in items.items():
+            q, scale = quantize_i8(vec)
+            rows.append((key, q.tobytes(), scale, now))
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings_i8 (key, q, scale, created_at) VALUES (?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            # The cache is an optimization; never fail an embedding over it
+            logger.warning(f"Failed to write embedding cache: {e}")
+            with self._lock:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
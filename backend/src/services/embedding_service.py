@@ -1,11 +1,17 @@
 """Embedding service using Google Generative AI."""
+import asyncio
 import logging
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from functools import lru_cache
+import numpy as np
 import google.generativeai as genai
 from google.generativeai import embed_content
 
+from src.services.embedding_cache import EmbeddingCacheService
+from src.services.evaluation.similarity import to_unit_vector
 from src.utils.config import get_settings
+from src.utils.retry import gemini_retry
 
 logger = logging.getLogger(__name__)
 
@@ -24,61 +30,167 @@ class EmbeddingService:
         genai.configure(api_key=settings.google_api_key)
         self.settings = settings
         self.model_name = settings.embedding_model
+        self.cache: Optional[EmbeddingCacheService] = (
+            EmbeddingCacheService(settings.embedding_cache_path, settings.embedding_cache_ttl_seconds)
+            if settings.embedding_cache_enabled else None
+        )
         logger.info(f"Initialized EmbeddingService with model: {self.model_name}")
     
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text using SEMANTIC_SIMILARITY.
+        Like every embedding from this service, it is L2-normalized.
         """
         if not text or not text.strip():
             raise ValueError("Cannot generate embedding for empty text")
         
+        cached = self._cache_get(text)
+        if cached is not None:
+            return cached
         try:
-            # Using the exact model and task type from the provided documentation/suggestion
-            result = genai.embed_content(
-                model="models/gemini-embedding-001",
-                content=text,
-                task_type="SEMANTIC_SIMILARITY"
-            )
-            return result['embedding']
+            embedding = self._embed_one(text)
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise RuntimeError(f"Embedding generation failed: {e}")
+        self._cache_put({text: embedding})
+        return embedding
+
+    def generate_embedding_np(self, text: str) -> np.ndarray:
+        """
+        Embedding for `text` as an L2-normalized float32 array, ready for
+        dot-product cosine similarity.
+        """
+        return np.asarray(self.generate_embedding(text), dtype=np.float32)
+
+    @staticmethod
+    def _normalized(embedding: List[float]) -> List[float]:
+        """Unit-normalize a raw API embedding, once, before it is cached or indexed."""
+        return to_unit_vector(embedding).tolist()
+
+    @gemini_retry("embedding")
+    def _embed_one(self, text: str) -> List[float]:
+        """Single embedding API call (retried on rate limits)."""
+        # Using the exact model and task type from the provided documentation/suggestion
+        result = genai.embed_content(
+            model=self.model_name,
+            content=text,
+            task_type="SEMANTIC_SIMILARITY"
+        )
+        return self._normalized(result['embedding'])
+
+    def _cache_key(self, text: str) -> bytes:
+        """Cache address for `text` under this model."""
+        return EmbeddingCacheService.make_key(self.model_name, text)
+
+    def _cache_get(self, text: str) -> Optional[List[float]]:
+        """Cached embedding for `text`, if the cache is enabled and holds it."""
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(text))
+
+    def _cache_get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Cached embeddings for whichever non-blank `texts` the cache holds."""
+        if self.cache is None:
+            return {}
+        keyed = {
+            self._cache_key(t): t
+            for t in texts if t and t.strip()
+        }
+        found = self.cache.get_many(list(keyed))
+        return {keyed[key]: vector for key, vector in found.items()}
+
+    def _cache_put(self, embeddings: Dict[str, List[float]]) -> None:
+        """Store freshly computed embeddings, keyed by their text."""
+        if self.cache is None or not embeddings:
+            return
+        self.cache.put_many({
+            self._cache_key(text): embedding
+            for text, embedding in embeddings.items()
+        })
     
+    @gemini_retry("embedding")
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """
+        Embed one batch in a single API call (blank texts are sent as a space),
+        retried on rate limits.
+        """
+        valid_texts = [t if (t and t.strip()) else " " for t in batch]
+        result = genai.embed_content(
+            model=self.model_name,
+            content=valid_texts,
+            task_type="SEMANTIC_SIMILARITY"
+        )
+        embeddings = result['embedding']
+        if len(embeddings) != len(batch):
+            raise ValueError(f"Expected {len(batch)} embeddings, got {len(embeddings)}")
+        return [self._normalized(e) for e in embeddings]
+
+    def _embed_batch_singly(self, batch: List[str]) -> List[List[float]]:
+        """Fallback for a failed batch: embed its texts one at a time."""
+        return [
+            self.generate_embedding(text) if (text and text.strip())
+            else [0.0] * self.settings.embedding_dimension
+            for text in batch
+        ]
+
     def generate_embeddings_batch(
         self,
         texts: List[str],
-        batch_size: int = 100
+        batch_size: int = 100,
+        max_concurrency: int = 8
     ) -> List[List[float]]:
         """
-        Generate embeddings for multiple texts in batches.
+        Generate embeddings for multiple texts, with up to `max_concurrency`
+        batch requests in flight on worker threads. Results are returned in
+        input order. Texts already in the embedding cache are not sent to the API.
         """
         if not texts:
             raise ValueError("Cannot generate embeddings for empty list")
-        
-        embeddings: List[List[float]] = []
-        
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            try:
-                # Filter/Sanitize batch
-                valid_texts = [t if (t and t.strip()) else " " for t in batch]
-                
-                result = genai.embed_content(
-                    model="models/gemini-embedding-001",
-                    content=valid_texts,
-                    task_type="SEMANTIC_SIMILARITY"
-                )
-                embeddings.extend(result['embedding'])
-            except Exception as e:
-                logger.error(f"Batch embedding failed: {e}. Falling back to single.")
-                for text in batch:
-                    if text and text.strip():
-                        embeddings.append(self.generate_embedding(text))
-                    else:
-                        embeddings.append([0.0] * self.settings.embedding_dimension)
-        
-        return embeddings
+
+        hits = self._cache_get_many(texts)
+        results: List[Optional[List[float]]] = [hits.get(t) for t in texts]
+        pending = [i for i, t in enumerate(texts) if t not in hits]
+        if pending:
+            miss_texts = [texts[i] for i in pending]
+            embedded = self._embed_uncached(miss_texts, batch_size, max_concurrency)
+            for i, embedding in zip(pending, embedded):
+                results[i] = embedding
+            # Blank texts get placeholder vectors, which are not worth caching
+            self._cache_put({t: e for t, e in zip(miss_texts, embedded) if t and t.strip()})
+        return results
+
+    async def agenerate_embeddings_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 100,
+        max_concurrency: int = 8
+    ) -> List[List[float]]:
+        """Async variant of generate_embeddings_batch, run off the event loop."""
+        return await asyncio.to_thread(self.generate_embeddings_batch, texts, batch_size, max_concurrency)
+
+    def _embed_uncached(
+        self,
+        texts: List[str],
+        batch_size: int,
+        max_concurrency: int
+    ) -> List[List[float]]:
+        """Embed `texts` through the API in concurrent batches, in input order."""
+        starts = range(0, len(texts), batch_size)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        workers = min(max_concurrency, len(starts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+            futures = [pool.submit(self._embed_batch, texts[start:start + batch_size]) for start in starts]
+
+            for start, future in zip(starts, futures):
+                batch = texts[start:start + batch_size]
+                try:
+                    embeddings = future.result()
+                except Exception as e:
+                    logger.error(f"Batch embedding failed: {e}. Falling back to single.")
+                    embeddings = self._embed_batch_singly(batch)
+                results[start:start + len(batch)] = embeddings
+
+        return results
     
     def generate_query_embedding(self, query: str) -> List[float]:
         """
@@ -87,16 +199,16 @@ class EmbeddingService:
         if not query or not query.strip():
             raise ValueError("Cannot generate embedding for empty query")
         
+        cached = self._cache_get(query)
+        if cached is not None:
+            return cached
         try:
-            result = genai.embed_content(
-                model="models/gemini-embedding-001",
-                content=query,
-                task_type="SEMANTIC_SIMILARITY"
-            )
-            return result['embedding']
+            embedding = self._embed_one(query)
         except Exception as e:
             logger.error(f"Failed to generate query embedding: {e}")
             raise RuntimeError(f"Query embedding generation failed: {e}")
+        self._cache_put({query: embedding})
+        return embedding
 
 
 @lru_cache()
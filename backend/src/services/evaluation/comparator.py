@@ -1,14 +1,34 @@
+import asyncio
 import logging
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Union
 from uuid import UUID
 
+import numpy as np
+
 from src.models.evaluation import SimilarityMetrics, Evaluation
 from src.services.embedding_service import get_embedding_service
-from .similarity import calculate_cosine_similarity, calculate_keyword_overlap, calculate_bleu_score
+from .similarity import cosine_sim_np, tokenize_list, keyword_overlap_tokens, calculate_bleu_score_tokens
 from .judge import EvaluationJudge
 
 logger = logging.getLogger(__name__)
 
+
+def combine_scores(
+    semantic_similarity: float,
+    keyword_overlap: float,
+    bleu: float,
+    agentic_score: Optional[float]
+) -> float:
+    """Weighting: 40% Semantic, 20% Keyword, 10% BLEU, 30% Judge."""
+    return (
+        (semantic_similarity * 0.4) + 
+        (keyword_overlap * 0.2) + 
+        (bleu * 0.1) + 
+        ((agentic_score or 0.0) * 0.3)
+    )
+
+
 class AnswerComparator:
     """Service to compare AI answers with human ground truth."""
     
@@ -21,39 +41,129 @@ class AnswerComparator:
         question_text: str, 
         ai_answer_text: str, 
         human_answer_text: str,
-        ai_answer_id: UUID
+        ai_answer_id: UUID,
+        human_embedding: Optional[np.ndarray] = None,
+        human_tokens: Optional[List[str]] = None
     ) -> Evaluation:
         """
         Perform a full comparison between AI and human answers.
+        For non-async callers: the embeddings and the LLM judge run on worker
+        threads while the lexical metrics are computed, so this is safe to
+        call from a thread that is already running an event loop.
         """
         logger.info(f"Comparing AI answer {ai_answer_id} with human ground truth")
         
-        # 1. Semantic Similarity
-        try:
-            ai_embedding = self.embedding_service.generate_embedding(ai_answer_text)
-            human_embedding = self.embedding_service.generate_embedding(human_answer_text)
-            semantic_sim = calculate_cosine_similarity(ai_embedding, human_embedding)
-        except Exception as e:
-            logger.error(f"Failed to calculate semantic similarity: {e}")
-            semantic_sim = 0.0
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="compare") as pool:
+            embeddings_future = pool.submit(self._embed_pair, ai_answer_text, human_answer_text, human_embedding)
+            judge_future = pool.submit(
+                self.judge.evaluate_answer, question_text, ai_answer_text, human_answer_text
+            )
+            keyword_overlap, bleu = self._lexical_metrics(ai_answer_text, human_answer_text, human_tokens)
             
+            try:
+                embeddings = embeddings_future.result()
+            except Exception as e:
+                embeddings = e
+            judge_result = judge_future.result()
+        
+        return self._build_evaluation(
+            ai_answer_id, human_answer_text, embeddings, keyword_overlap, bleu, judge_result
+        )
+
+    def _embed_pair(
+        self,
+        ai_answer_text: str,
+        human_answer_text: str,
+        human_embedding: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unit-normalized embeddings of both answers from one batch request
+        (only the AI answer is sent if the human one is already known).
+        """
+        if not (ai_answer_text and ai_answer_text.strip() and human_answer_text and human_answer_text.strip()):
+            raise ValueError("Cannot generate embedding for empty text")
+        if human_embedding is not None:
+            (ai_embedding,) = self.embedding_service.generate_embeddings_batch([ai_answer_text])
+            return np.asarray(ai_embedding, dtype=np.float32), human_embedding
+        ai_embedding, human_embedding = self.embedding_service.generate_embeddings_batch(
+            [ai_answer_text, human_answer_text]
+        )
+        # The embedding service returns unit vectors already
+        return np.asarray(ai_embedding, dtype=np.float32), np.asarray(human_embedding, dtype=np.float32)
+
+    @staticmethod
+    def _lexical_metrics(
+        ai_answer_text: str,
+        human_answer_text: str,
+        human_tokens: Optional[List[str]] = None
+    ) -> Tuple[float, float]:
+        """Keyword overlap and BLEU, tokenizing each answer once."""
+        ai_tokens = tokenize_list(ai_answer_text)
+        if human_tokens is None:
+            human_tokens = tokenize_list(human_answer_text)
+        
         # 2. Keyword Overlap
-        keyword_overlap = calculate_keyword_overlap(ai_answer_text, human_answer_text)
+        keyword_overlap = keyword_overlap_tokens(ai_tokens, human_tokens)
         
         # 3. BLEU Score
-        bleu = calculate_bleu_score(human_answer_text, ai_answer_text)
+        bleu = calculate_bleu_score_tokens(human_tokens, ai_tokens)
+        return keyword_overlap, bleu
+
+    async def acompare_answers(
+        self, 
+        question_text: str, 
+        ai_answer_text: str, 
+        human_answer_text: str,
+        ai_answer_id: UUID,
+        human_embedding: Optional[np.ndarray] = None,
+        human_tokens: Optional[List[str]] = None
+    ) -> Evaluation:
+        """
+        Perform a full comparison between AI and human answers.
+        The two embeddings and the LLM judge are independent network calls,
+        so they run concurrently; the lexical metrics are computed meanwhile.
+        A precomputed (unit) human embedding and token list, e.g. cached on
+        the ground truth, are used instead of recomputing them.
+        """
+        logger.info(f"Comparing AI answer {ai_answer_id} with human ground truth")
+        
+        # Both answers are embedded in a single batched API request
+        embeddings_task = asyncio.create_task(
+            asyncio.to_thread(self._embed_pair, ai_answer_text, human_answer_text, human_embedding)
+        )
+        judge_task = asyncio.create_task(
+            asyncio.to_thread(self.judge.evaluate_answer, question_text, ai_answer_text, human_answer_text)
+        )
         
-        # 4. Agentic Evaluation (LLM Judge)
-        judge_result = self.judge.evaluate_answer(question_text, ai_answer_text, human_answer_text)
+        keyword_overlap, bleu = self._lexical_metrics(ai_answer_text, human_answer_text, human_tokens)
         
-        # 5. Combined Score
-        # Weighting: 40% Semantic, 20% Keyword, 10% BLEU, 30% Judge
-        combined = (
-            (semantic_sim * 0.4) + 
-            (keyword_overlap * 0.2) + 
-            (bleu * 0.1) + 
-            (judge_result.overall_score * 0.3)
+        embeddings, judge_result = await asyncio.gather(embeddings_task, judge_task, return_exceptions=True)
+        if isinstance(judge_result, Exception):
+            raise judge_result
+        
+        return self._build_evaluation(
+            ai_answer_id, human_answer_text, embeddings, keyword_overlap, bleu, judge_result
         )
+
+    @staticmethod
+    def _build_evaluation(
+        ai_answer_id: UUID,
+        human_answer_text: str,
+        embeddings: Union[Tuple[np.ndarray, np.ndarray], Exception],
+        keyword_overlap: float,
+        bleu: float,
+        judge_result: Any
+    ) -> Evaluation:
+        """Combine the individual metrics; a failed embedding scores 0 similarity."""
+        # 1. Semantic Similarity (clamped: float32 rounding can overshoot 1.0)
+        if isinstance(embeddings, Exception):
+            logger.error(f"Failed to calculate semantic similarity: {embeddings}")
+            semantic_sim = 0.0
+        else:
+            semantic_sim = min(1.0, max(0.0, cosine_sim_np(*embeddings)))
+        
+        # 5. Combined Score
+        combined = combine_scores(semantic_sim, keyword_overlap, bleu, judge_result.overall_score)
         
         metrics = SimilarityMetrics(
             semantic_similarity=semantic_sim,
@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
-from src.services.llm_service import LLMService
+from src.services.llm_service import get_llm
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,7 @@ class EvaluationJudge:
     """LLM-based judge for evaluating answer quality."""
     
     def __init__(self):
-        self.llm = LLMService()
+        self.llm = get_llm()
         
     def evaluate_answer(self, question: str, ai_answer: str, human_answer: str) -> JudgeResponse:
         """
@@ -40,7 +40,8 @@ class EvaluationJudge:
         """
 
         try:
-            return self.llm.generate_structured(prompt, JudgeResponse)
+            # Schema-constrained decoding: the response is JudgeResponse JSON as generated
+            return self.llm.generate_structured(prompt, JudgeResponse, constrained=True)
         except Exception as e:
             logger.error(f"Error in agentic evaluation: {e}")
             return JudgeResponse(
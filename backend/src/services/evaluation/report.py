@@ -1,32 +1,26 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from src.models.evaluation import Evaluation, EvaluationReport
 
-def generate_report(project_id: UUID, evaluations: List[Evaluation], total_questions: int) -> EvaluationReport:
+def generate_report(
+    project_id: UUID,
+    total_questions: int,
+    evaluated_questions: int,
+    average_semantic_similarity: Optional[float],
+    average_keyword_overlap: Optional[float],
+    average_combined_score: Optional[float],
+    evaluations: Optional[List[Evaluation]] = None
+) -> EvaluationReport:
     """
     Generate a summary report for a project's evaluations.
+    Averages are computed by the caller (in SQL); None means no evaluations.
     """
-    if not evaluations:
-        return EvaluationReport(
-            project_id=project_id,
-            total_questions=total_questions,
-            evaluated_questions=0,
-            average_semantic_similarity=0.0,
-            average_keyword_overlap=0.0,
-            average_combined_score=0.0,
-            evaluations=[]
-        )
-    
-    avg_semantic = sum(e.metrics.semantic_similarity for e in evaluations) / len(evaluations)
-    avg_keyword = sum(e.metrics.keyword_overlap for e in evaluations) / len(evaluations)
-    avg_combined = sum(e.metrics.combined_score for e in evaluations) / len(evaluations)
-    
     return EvaluationReport(
         project_id=project_id,
         total_questions=total_questions,
-        evaluated_questions=len(evaluations),
-        average_semantic_similarity=avg_semantic,
-        average_keyword_overlap=avg_keyword,
-        average_combined_score=avg_combined,
-        evaluations=evaluations
+        evaluated_questions=evaluated_questions,
+        average_semantic_similarity=average_semantic_similarity or 0.0,
+        average_keyword_overlap=average_keyword_overlap or 0.0,
+        average_combined_score=average_combined_score or 0.0,
+        evaluations=evaluations or []
     )
@@ -1,29 +1,49 @@
 import numpy as np
 import re
-from typing import List, Set
+from typing import List, Set, Tuple, Union
 
-def calculate_cosine_similarity(v1: List[float], v2: List[float]) -> float:
-    """Calculate cosine similarity between two vectors."""
-    if not v1 or not v2:
-        return 0.0
-    a = np.array(v1)
-    b = np.array(v2)
-    norm_a = np.linalg.norm(a)
-    norm_b = np.linalg.norm(b)
-    if norm_a == 0 or norm_b == 0:
+def to_unit_vector(v) -> np.ndarray:
+    """Convert an embedding to an L2-normalized float32 array (zero stays zero)."""
+    a = np.asarray(v, dtype=np.float32)
+    norm = np.linalg.norm(a)
+    return a / norm if norm else a
+
+def cosine_sim_np(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two L2-normalized vectors (see to_unit_vector)."""
+    return float(np.inner(a, b))
+
+def cosine_sim_matrix(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarities of L2-normalized row vectors, shape (len(A), len(B))."""
+    return A @ B.T
+
+def calculate_cosine_similarity(v1: Union[List[float], np.ndarray], v2: Union[List[float], np.ndarray]) -> float:
+    """
+    Calculate cosine similarity between two vectors.
+    Arrays are taken to be unit vectors (EmbeddingService.generate_embedding_np)
+    and reduce to a dot product; plain lists are normalized first.
+    """
+    if v1 is None or v2 is None or len(v1) == 0 or len(v2) == 0:
         return 0.0
-    return float(np.dot(a, b) / (norm_a * norm_b))
+    if isinstance(v1, np.ndarray) and isinstance(v2, np.ndarray):
+        return cosine_sim_np(v1, v2)
+    return cosine_sim_np(to_unit_vector(v1), to_unit_vector(v2))
+
+_TOK_RE = re.compile(r'\w+')
+
+def tokenize_list(text: str) -> List[str]:
+    """Lowercased word tokens, in order."""
+    if not text:
+        return []
+    return _TOK_RE.findall(text.lower())
 
 def tokenize(text: str) -> Set[str]:
     """Simple tokenizer that lowers and removes non-alphanumeric chars."""
-    if not text:
-        return set()
-    return set(re.findall(r'\w+', text.lower()))
+    return set(tokenize_list(text))
 
-def calculate_keyword_overlap(text1: str, text2: str) -> float:
-    """Calculate Jaccard similarity (keyword overlap) between two texts."""
-    set1 = tokenize(text1)
-    set2 = tokenize(text2)
+def keyword_overlap_tokens(tokens1: List[str], tokens2: List[str]) -> float:
+    """Jaccard similarity of two pre-tokenized texts."""
+    set1 = set(tokens1)
+    set2 = set(tokens2)
     
     if not set1 and not set2:
         return 1.0
@@ -36,31 +56,37 @@ def calculate_keyword_overlap(text1: str, text2: str) -> float:
     
     return len(intersection) / len(union)
 
-def calculate_bleu_score(reference: str, candidate: str) -> float:
+def calculate_keyword_overlap(text1: str, text2: str) -> float:
+    """Calculate Jaccard similarity (keyword overlap) between two texts."""
+    return keyword_overlap_tokens(tokenize_list(text1), tokenize_list(text2))
+
+def _bigrams(tokens: List[str]) -> Set[Tuple[str, str]]:
+    """Distinct adjacent token pairs, built by C-level zip."""
+    return set(zip(tokens, tokens[1:]))
+
+def calculate_bleu_score_tokens(ref_toks: List[str], cand_toks: List[str]) -> float:
     """
-    Very simple BLEU-like n-gram overlap.
+    Very simple BLEU-like n-gram overlap on pre-tokenized texts.
     Currently implements unigram and bigram overlap.
     """
-    def get_ngrams(text: str, n: int):
-        tokens = re.findall(r'\w+', text.lower())
-        if len(tokens) < n:
-            return set()
-        return set(tuple(tokens[i:i+n]) for i in range(len(tokens)-n+1))
-
-    ref_1grams = get_ngrams(reference, 1)
-    cand_1grams = get_ngrams(candidate, 1)
-    
+    cand_1grams = set(cand_toks)
     if not cand_1grams:
         return 0.0
     
-    p1 = len(cand_1grams.intersection(ref_1grams)) / len(cand_1grams)
-    
-    ref_2grams = get_ngrams(reference, 2)
-    cand_2grams = get_ngrams(candidate, 2)
+    p1 = len(cand_1grams.intersection(ref_toks)) / len(cand_1grams)
     
+    cand_2grams = _bigrams(cand_toks)
     if not cand_2grams:
         p2 = p1 # Fallback to unigram if too short
     else:
+        ref_2grams = _bigrams(ref_toks)
         p2 = len(cand_2grams.intersection(ref_2grams)) / len(cand_2grams)
         
     return (p1 + p2) / 2.0
+
+def calculate_bleu_score(reference: str, candidate: str) -> float:
+    """
+    Very simple BLEU-like n-gram overlap.
+    Currently implements unigram and bigram overlap.
+    """
+    return calculate_bleu_score_tokens(tokenize_list(reference), tokenize_list(candidate))
@@ -0,0 +1,90 @@
+"""
+Array-based keyword overlap and BLEU for bulk re-scoring of stored
+evaluations (EvaluationService.rescore_lexical).
+
+Tokens are hashed to sorted, de-duplicated int64 arrays once, after which
+set intersections are merge walks compiled with Numba. Numba is optional:
+without it the same functions fall back to NumPy's intersect1d. Results match
+keyword_overlap_tokens / calculate_bleu_score_tokens in similarity.py (up to
+hash collisions, which are negligible at 64 bits).
+
+Token ids use Python's per-process string hash, so they must not be persisted.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+
+
+def token_ids(tokens: Sequence[str]) -> np.ndarray:
+    """Sorted unique int64 ids for a token list (the unigram set)."""
+    return np.unique(np.fromiter((hash(t) for t in tokens), dtype=np.int64, count=len(tokens)))
+
+
+def bigram_ids(tokens: Sequence[str]) -> np.ndarray:
+    """Sorted unique int64 ids for adjacent token pairs (the bigram set)."""
+    pairs = list(zip(tokens, tokens[1:]))
+    return np.unique(np.fromiter((hash(p) for p in pairs), dtype=np.int64, count=len(pairs)))
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _intersect_count(a: np.ndarray, b: np.ndarray) -> int:
+        """Size of the intersection of two sorted unique arrays (merge walk)."""
+        i = j = count = 0
+        while i < a.size and j < b.size:
+            if a[i] == b[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+else:
+    def _intersect_count(a: np.ndarray, b: np.ndarray) -> int:
+        """Size of the intersection of two sorted unique arrays."""
+        return int(np.intersect1d(a, b, assume_unique=True).size)
+
+
+def jaccard_ids(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard similarity of two token-id sets (see keyword_overlap_tokens)."""
+    if a.size == 0 and b.size == 0:
+        return 1.0
+    if a.size == 0 or b.size == 0:
+        return 0.0
+    inter = _intersect_count(a, b)
+    return inter / (a.size + b.size - inter)
+
+
+def bleu_ids(ref_uni: np.ndarray, cand_uni: np.ndarray, ref_bi: np.ndarray, cand_bi: np.ndarray) -> float:
+    """Unigram/bigram overlap on token-id sets (see calculate_bleu_score_tokens)."""
+    if cand_uni.size == 0:
+        return 0.0
+    p1 = _intersect_count(cand_uni, ref_uni) / cand_uni.size
+    if cand_bi.size == 0:
+        p2 = p1 # Fallback to unigram if too short
+    else:
+        p2 = _intersect_count(cand_bi, ref_bi) / cand_bi.size
+    return (p1 + p2) / 2.0
+
+
+def lexical_scores_batch(pairs: Sequence[Tuple[List[str], List[str]]]) -> List[Tuple[float, float]]:
+    """
+    (keyword_overlap, bleu) for each (ai_tokens, human_tokens) pair, with the
+    human answer as the BLEU reference.
+    """
+    scores = []
+    for ai_tokens, human_tokens in pairs:
+        ai_uni, human_uni = token_ids(ai_tokens), token_ids(human_tokens)
+        scores.append((
+            jaccard_ids(ai_uni, human_uni),
+            bleu_ids(human_uni, ai_uni, bigram_ids(human_tokens), bigram_ids(ai_tokens)),
+        ))
+    return scores
@@ -1,15 +1,36 @@
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Tuple
 from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from src.storage.db.models import GroundTruthModel, EvaluationModel, AnswerModel, QuestionModel, ProjectModel
-from src.models.evaluation import Evaluation, EvaluationCreate, GroundTruth, GroundTruthCreate, EvaluationReport
-from src.services.evaluation.comparator import AnswerComparator
+from src.models.evaluation import Evaluation, EvaluationCreate, GroundTruth, GroundTruthCreate, EvaluationReport, SimilarityMetrics
+from src.services.evaluation.comparator import AnswerComparator, combine_scores
 from src.services.evaluation.report import generate_report
+from src.services.evaluation.similarity import tokenize_list
+from src.services.evaluation.similarity_fast import lexical_scores_batch
 
 logger = logging.getLogger(__name__)
 
+class _ComparisonInputs(NamedTuple):
+    """Everything an evaluation needs from the DB."""
+    question_text: str
+    ai_answer_text: str
+    human_answer_text: str
+    human_embedding: Optional[np.ndarray] = None
+    human_tokens: Optional[List[str]] = None
+
+
+def _text_hash(text: str) -> str:
+    """Fingerprint of a ground truth text, used to validate its cached features."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
 class EvaluationService:
     """Service for managing ground truths and evaluating AI answers."""
     
@@ -37,6 +58,8 @@ class EvaluationService:
                 source=gt.source
             )
             self.db.add(db_gt)
+        # Compute evaluation features now, so evaluations never pay for them
+        self._ground_truth_features(db_gt)
             
         try:
             self.db.commit()
@@ -50,9 +73,63 @@ class EvaluationService:
     def evaluate_answer(self, ai_answer_id: UUID, human_answer_text: Optional[str] = None) -> Evaluation:
         """Compare an AI answer against ground truth and store the evaluation."""
         logger.info(f"Evaluating AI answer {ai_answer_id}")
+        inputs = self._comparison_inputs(ai_answer_id, human_answer_text)
         
+        # 4. Perform comparison
+        evaluation_result = self.comparator.compare_answers(
+            question_text=inputs.question_text,
+            ai_answer_text=inputs.ai_answer_text,
+            human_answer_text=inputs.human_answer_text,
+            ai_answer_id=ai_answer_id,
+            human_embedding=inputs.human_embedding,
+            human_tokens=inputs.human_tokens
+        )
+        return self._store_evaluation(ai_answer_id, inputs.human_answer_text, evaluation_result)
+
+    async def aevaluate_answer(self, ai_answer_id: UUID, human_answer_text: Optional[str] = None) -> Evaluation:
+        """
+        Async variant of evaluate_answer for FastAPI endpoints: DB work runs in
+        a worker thread and the comparison's network calls run concurrently.
+        """
+        logger.info(f"Evaluating AI answer {ai_answer_id}")
+        inputs = await asyncio.to_thread(self._comparison_inputs, ai_answer_id, human_answer_text)
+        evaluation_result = await self.comparator.acompare_answers(
+            question_text=inputs.question_text,
+            ai_answer_text=inputs.ai_answer_text,
+            human_answer_text=inputs.human_answer_text,
+            ai_answer_id=ai_answer_id,
+            human_embedding=inputs.human_embedding,
+            human_tokens=inputs.human_tokens
+        )
+        return await asyncio.to_thread(
+            self._store_evaluation, ai_answer_id, inputs.human_answer_text, evaluation_result
+        )
+
+    def _ground_truth_features(self, gt: GroundTruthModel) -> Tuple[Optional[np.ndarray], List[str]]:
+        """
+        Tokens and unit embedding of a ground truth answer, cached on the row.
+        Stale features (answer_text changed) are recomputed; an embedding that
+        can't be computed right now is left NULL and retried on next use.
+        Changes are left for the caller to commit.
+        """
+        text_hash = _text_hash(gt.answer_text)
+        if gt.gt_text_hash != text_hash or gt.gt_tokens is None:
+            gt.gt_text_hash = text_hash
+            gt.gt_tokens = tokenize_list(gt.answer_text)
+            gt.gt_embedding = None
+        if gt.gt_embedding is None and gt.answer_text.strip():
+            try:
+                embedding = self.comparator.embedding_service.generate_embedding_np(gt.answer_text)
+                gt.gt_embedding = embedding.astype(np.float32).tobytes()
+            except Exception as e:
+                logger.warning(f"Could not embed ground truth for question {gt.question_id}: {e}")
+        embedding = np.frombuffer(gt.gt_embedding, dtype=np.float32) if gt.gt_embedding else None
+        return embedding, gt.gt_tokens
+
+    def _comparison_inputs(self, ai_answer_id: UUID, human_answer_text: Optional[str]) -> _ComparisonInputs:
+        """Load the question, AI answer and ground truth (with cached features) for an evaluation."""
         # 1. Get AI Answer
-        ai_answer = self.db.query(AnswerModel).filter(AnswerModel.id == str(ai_answer_id)).first()
+        ai_answer = self.db.get(AnswerModel, str(ai_answer_id))
         if not ai_answer:
             raise ValueError(f"AI Answer {ai_answer_id} not found")
             
@@ -63,21 +140,19 @@ class EvaluationService:
             
         # 3. Get Ground Truth text
         if human_answer_text:
-            ans_text = human_answer_text
-        else:
-            gt = self.db.query(GroundTruthModel).filter(GroundTruthModel.question_id == question.id).first()
-            if not gt:
-                raise ValueError(f"No ground truth found for question {question.id}")
-            ans_text = gt.answer_text
-            
-        # 4. Perform comparison
-        evaluation_result = self.comparator.compare_answers(
-            question_text=question.text,
-            ai_answer_text=ai_answer.text,
-            human_answer_text=ans_text,
-            ai_answer_id=ai_answer_id
-        )
+            return _ComparisonInputs(question.text, ai_answer.text, human_answer_text)
         
+        gt = self.db.query(GroundTruthModel).filter(GroundTruthModel.question_id == question.id).first()
+        if not gt:
+            raise ValueError(f"No ground truth found for question {question.id}")
+        embedding, tokens = self._ground_truth_features(gt)
+        if self.db.dirty:
+            # Features were (re)computed on first use; keep them for next time
+            self.db.commit()
+        return _ComparisonInputs(question.text, ai_answer.text, gt.answer_text, embedding, tokens)
+
+    def _store_evaluation(self, ai_answer_id: UUID, ans_text: str, evaluation_result: Evaluation) -> Evaluation:
+        """Persist a comparison result and return it with its DB id and timestamp."""
         # 5. Store in DB
         db_eval = EvaluationModel(
             ai_answer_id=str(ai_answer_id),
@@ -108,40 +183,119 @@ class EvaluationService:
             logger.error(f"Failed to save evaluation: {e}")
             raise
 
-    def get_project_report(self, project_id: UUID) -> EvaluationReport:
-        """Generate an evaluation report for all evaluated questions in a project."""
-        logger.info(f"Generating evaluation report for project {project_id}")
+    def rescore_lexical(self, project_id: UUID) -> int:
+        """
+        Recompute keyword overlap, BLEU and the combined score of every stored
+        evaluation in a project from the texts they were made with (e.g. after
+        a tokenizer change). Semantic and judge scores are kept, so no API
+        calls are made. Returns the number of evaluations updated.
+        """
+        logger.info(f"Re-scoring lexical metrics for project {project_id}")
+        rows = self.db.execute(
+            select(
+                EvaluationModel.id,
+                EvaluationModel.human_answer_text,
+                EvaluationModel.semantic_similarity,
+                EvaluationModel.agentic_score,
+                AnswerModel.text,
+            )
+            .join(AnswerModel, EvaluationModel.ai_answer_id == AnswerModel.id)
+            .join(QuestionModel, AnswerModel.question_id == QuestionModel.id)
+            .where(QuestionModel.project_id == str(project_id))
+        ).all()
+        if not rows:
+            return 0
         
-        # 1. Get all questions for project
-        questions = self.db.query(QuestionModel).filter(QuestionModel.project_id == str(project_id)).all()
+        scores = lexical_scores_batch([
+            (tokenize_list(row.text), tokenize_list(row.human_answer_text)) for row in rows
+        ])
+        # ORM bulk UPDATE by primary key: one executemany for all rows
+        self.db.execute(update(EvaluationModel), [
+            {
+                "id": row.id,
+                "keyword_overlap": keyword_overlap,
+                "bleu_score": bleu,
+                "combined_score": combine_scores(row.semantic_similarity, keyword_overlap, bleu, row.agentic_score),
+            }
+            for row, (keyword_overlap, bleu) in zip(rows, scores)
+        ])
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to re-score evaluations: {e}")
+            raise
+        return len(rows)
+
+    def get_project_report(self, project_id: UUID, summary_only: bool = False) -> EvaluationReport:
+        """
+        Generate an evaluation report for all evaluated questions in a project.
+        Averages and counts are aggregated in SQL; with summary_only the
+        per-evaluation list is skipped entirely.
+        """
+        logger.info(f"Generating evaluation report for project {project_id}")
+        project_key = str(project_id)
         
-        # 2. Get all evaluations for these questions
-        evaluations_db = self.db.query(EvaluationModel).join(
-            AnswerModel, EvaluationModel.ai_answer_id == AnswerModel.id
-        ).join(
-            QuestionModel, AnswerModel.question_id == QuestionModel.id
-        ).filter(
-            QuestionModel.project_id == str(project_id)
-        ).all()
+        # 1. Counts and averages in one round trip
+        total_questions = (
+            select(func.count(QuestionModel.id))
+            .where(QuestionModel.project_id == project_key)
+            .scalar_subquery()
+        )
+        summary = self.db.execute(
+            select(
+                func.avg(EvaluationModel.semantic_similarity),
+                func.avg(EvaluationModel.keyword_overlap),
+                func.avg(EvaluationModel.combined_score),
+                func.count(EvaluationModel.id),
+                total_questions,
+            )
+            .select_from(EvaluationModel)
+            .join(AnswerModel, EvaluationModel.ai_answer_id == AnswerModel.id)
+            .join(QuestionModel, AnswerModel.question_id == QuestionModel.id)
+            .where(QuestionModel.project_id == project_key)
+        ).one()
+        avg_semantic, avg_keyword, avg_combined, evaluated, total = summary
         
-        evals = []
-        for e in evaluations_db:
-            # Reconstruct Pydantic model
-            from src.models.evaluation import SimilarityMetrics
-            metrics = SimilarityMetrics(
-                semantic_similarity=e.semantic_similarity,
-                keyword_overlap=e.keyword_overlap,
-                bleu_score=e.bleu_score,
-                agentic_score=e.agentic_score,
-                combined_score=e.combined_score,
-                explanation=e.explanation
+        # 2. Per-evaluation rows, only the columns the report needs, streamed
+        evals = None
+        if not summary_only and evaluated:
+            rows = self.db.execute(
+                select(
+                    EvaluationModel.id,
+                    EvaluationModel.ai_answer_id,
+                    EvaluationModel.human_answer_text,
+                    EvaluationModel.semantic_similarity,
+                    EvaluationModel.keyword_overlap,
+                    EvaluationModel.bleu_score,
+                    EvaluationModel.agentic_score,
+                    EvaluationModel.combined_score,
+                    EvaluationModel.explanation,
+                    EvaluationModel.created_at,
+                )
+                .join(AnswerModel, EvaluationModel.ai_answer_id == AnswerModel.id)
+                .join(QuestionModel, AnswerModel.question_id == QuestionModel.id)
+                .where(QuestionModel.project_id == project_key)
+                .execution_options(yield_per=500)
             )
-            evals.append(Evaluation(
-                id=UUID(e.id),
-                ai_answer_id=UUID(e.ai_answer_id),
-                human_answer_text=e.human_answer_text,
-                metrics=metrics,
-                created_at=e.created_at
-            ))
+            # Rows come from our own table, so skip validation; ids are still
+            # converted so the report serializes with its declared UUID types
+            evals = [
+                Evaluation.model_construct(
+                    id=UUID(e.id),
+                    ai_answer_id=UUID(e.ai_answer_id),
+                    human_answer_text=e.human_answer_text,
+                    metrics=SimilarityMetrics.model_construct(
+                        semantic_similarity=e.semantic_similarity,
+                        keyword_overlap=e.keyword_overlap,
+                        bleu_score=e.bleu_score,
+                        agentic_score=e.agentic_score,
+                        combined_score=e.combined_score,
+                        explanation=e.explanation
+                    ),
+                    created_at=e.created_at
+                )
+                for e in rows
+            ]
         
-        return generate_report(project_id, evals, len(questions))
+        return generate_report(project_id, total, evaluated, avg_semantic, avg_keyword, avg_combined, evals)
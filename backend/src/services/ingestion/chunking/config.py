@@ -1,6 +1,7 @@
 """Chunking configuration models."""
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 
 class ChunkingConfig(BaseModel):
@@ -10,20 +11,26 @@ class ChunkingConfig(BaseModel):
     chunk_overlap: int = Field(default=200, ge=0, le=1000, description="Overlap between consecutive chunks")
     min_chunk_size: int = Field(default=100, ge=50, description="Minimum chunk size to keep")
     separator: str = Field(default="\n\n", description="Primary separator for splitting text")
+    use_langchain: bool = Field(default=False, description="Split with LangChain's RecursiveCharacterTextSplitter, the reference the built-in splitter matches")
     
-    class Config:
-        frozen = True  # Make immutable
+    model_config = ConfigDict(frozen=True)  # Make immutable
 
 
-class DocumentTypeConfig(BaseModel):
+# Per file type configurations, validated once at import; ChunkingConfig is
+# frozen, so the instances are shared by every pipeline and splitter
+_CONFIGS: Mapping[str, ChunkingConfig] = MappingProxyType({
+    "pdf": ChunkingConfig(chunk_size=1000, chunk_overlap=200),
+    "docx": ChunkingConfig(chunk_size=1200, chunk_overlap=200),
+    "xlsx": ChunkingConfig(chunk_size=800, chunk_overlap=100),
+    "pptx": ChunkingConfig(chunk_size=600, chunk_overlap=100),
+})
+
+
+class DocumentTypeConfig:
     """Document type-specific chunking configurations."""
     
-    pdf: ChunkingConfig = ChunkingConfig(chunk_size=1000, chunk_overlap=200)
-    docx: ChunkingConfig = ChunkingConfig(chunk_size=1200, chunk_overlap=200)
-    xlsx: ChunkingConfig = ChunkingConfig(chunk_size=800, chunk_overlap=100)
-    pptx: ChunkingConfig = ChunkingConfig(chunk_size=600, chunk_overlap=100)
-    
-    def get_config(self, file_extension: str) -> ChunkingConfig:
-        """Get configuration for specific file type."""
+    @staticmethod
+    def get_config(file_extension: str) -> ChunkingConfig:
+        """Get configuration for specific file type (PDF settings for unknown types)."""
         ext = file_extension.lower().lstrip('.')
-        return getattr(self, ext, self.pdf)
+        return _CONFIGS.get(ext, _CONFIGS["pdf"])
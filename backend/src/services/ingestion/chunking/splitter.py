@@ -1,13 +1,19 @@
 """Text splitter for semantic chunking with metadata preservation."""
 import logging
-from typing import List, Optional, Dict, Any
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from src.services.ingestion.parsers.base import PageResult
 from .config import ChunkingConfig
 
 logger = logging.getLogger(__name__)
 
+# Separators from most to least preferred; past the last one text is split
+# into characters. Each separator stays at the start of the piece after it.
+_SEPARATORS = ("\n\n", "\n", ". ", ", ", " ")
+
 
 @dataclass
 class ChunkMetadata:
@@ -29,8 +35,10 @@ class SemanticTextSplitter:
     """
     Semantic text splitter with configurable chunking strategy.
     
-    Uses recursive character splitting to maintain semantic coherence
-    while respecting chunk size limits.
+    Text is split recursively on paragraph, line, sentence, clause and word
+    boundaries and packed into overlapping chunks of at most chunk_size.
+    The built-in implementation works on string offsets; LangChain's
+    RecursiveCharacterTextSplitter (use_langchain) is the reference it matches.
     """
     
     def __init__(self, config: ChunkingConfig):
@@ -41,8 +49,11 @@ class SemanticTextSplitter:
             config: Chunking configuration
         """
         self.config = config
+        self.splitter = None
+        if not config.use_langchain:
+            return
         
-        # Initialize LangChain text splitter with recursive strategy
+        # LangChain text splitter with recursive strategy (reference implementation)
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=config.chunk_size,
             chunk_overlap=config.chunk_overlap,
@@ -56,6 +67,87 @@ class SemanticTextSplitter:
                 ""       # Character
             ]
         )
+
+    def _pieces(self, text: str, start: int, end: int, level: int) -> Iterator[Tuple[int, int]]:
+        """
+        Non-empty (start, end) ranges of text[start:end] split before each
+        occurrence of the level's separator (single characters past the last).
+        """
+        if level == len(_SEPARATORS):
+            for i in range(start, end):
+                yield i, i + 1
+            return
+        separator = _SEPARATORS[level]
+        piece_start = start
+        i = text.find(separator, start, end)
+        while i >= 0:
+            if i > piece_start:
+                yield piece_start, i
+            piece_start = i
+            i = text.find(separator, i + len(separator), end)
+        if end > piece_start:
+            yield piece_start, end
+
+    def _merge(self, text: str, pieces: List[Tuple[int, int]], chunks: List[str]):
+        """
+        Pack consecutive pieces into chunks of at most chunk_size; each chunk
+        after the first starts with the trailing pieces of the previous one
+        that fit within chunk_overlap.
+        """
+        size, overlap = self.config.chunk_size, self.config.chunk_overlap
+        window: Deque[Tuple[int, int]] = deque()
+        total = 0
+        for start, end in pieces:
+            length = end - start
+            if window and total + length > size:
+                self._emit(text, window[0][0], window[-1][1], chunks)
+                while total > overlap or (total + length > size and total > 0):
+                    first_start, first_end = window.popleft()
+                    total -= first_end - first_start
+            window.append((start, end))
+            total += length
+        if window:
+            self._emit(text, window[0][0], window[-1][1], chunks)
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, chunks: List[str]):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+    def _split_range(self, text: str, start: int, end: int, level: int, chunks: List[str]):
+        """
+        Split text[start:end] on the most preferred separator it contains,
+        merging pieces below chunk_size and recursing into larger ones with
+        the next separators.
+        """
+        while level < len(_SEPARATORS) and text.find(_SEPARATORS[level], start, end) < 0:
+            level += 1
+        
+        pending: List[Tuple[int, int]] = []
+        for piece_start, piece_end in self._pieces(text, start, end, level):
+            if piece_end - piece_start < self.config.chunk_size:
+                pending.append((piece_start, piece_end))
+                continue
+            if pending:
+                self._merge(text, pending, chunks)
+                pending = []
+            if level == len(_SEPARATORS):
+                chunks.append(text[piece_start:piece_end])
+            else:
+                self._split_range(text, piece_start, piece_end, level + 1, chunks)
+        if pending:
+            self._merge(text, pending, chunks)
+
+    def _split_fast(self, text: str) -> List[str]:
+        """
+        Recursive separator splitting on (start, end) offsets: produces the
+        same chunks as the LangChain splitter configured in __init__, without
+        building intermediate split and join strings.
+        """
+        chunks: List[str] = []
+        self._split_range(text, 0, len(text), 0, chunks)
+        return chunks
     
     def split_text(
         self,
@@ -79,14 +171,17 @@ class SemanticTextSplitter:
         if not text or not text.strip():
             return []
         
-        # Split text using LangChain splitter
-        text_chunks = self.splitter.split_text(text)
+        if self.splitter is not None:
+            text_chunks = self.splitter.split_text(text)
+        else:
+            text_chunks = self._split_fast(text)
         
         # Create TextChunk objects with metadata
         chunks: List[TextChunk] = []
         for idx, chunk_text in enumerate(text_chunks):
+            chunk_text = chunk_text.strip()
             # Skip chunks that are too small
-            if len(chunk_text.strip()) < self.config.min_chunk_size:
+            if len(chunk_text) < self.config.min_chunk_size:
                 logger.debug(f"Skipping chunk {idx} (too small: {len(chunk_text)} chars)")
                 continue
             
@@ -97,10 +192,41 @@ class SemanticTextSplitter:
                 source_document=source_document
             )
             
-            chunks.append(TextChunk(text=chunk_text.strip(), metadata=metadata))
+            chunks.append(TextChunk(text=chunk_text, metadata=metadata))
         
         return chunks
     
+    def split_page(
+        self,
+        page: PageResult,
+        first_chunk_index: int = 0,
+        source_document: Optional[str] = None
+    ) -> List[TextChunk]:
+        """
+        Split a single streamed page, numbering its chunks from
+        `first_chunk_index` so indices stay global across a document.
+        
+        Args:
+            page: Page text, number and bounding box
+            first_chunk_index: Index of the page's first chunk in the document
+            source_document: Optional source document identifier
+            
+        Returns:
+            List of TextChunk objects with page metadata
+        """
+        if not page.text or not page.text.strip():
+            return []
+        
+        page_chunks = self.split_text(
+            text=page.text,
+            page_number=page.page_number,
+            bounding_box=page.bounding_box,
+            source_document=source_document
+        )
+        for offset, chunk in enumerate(page_chunks):
+            chunk.metadata.chunk_index = first_chunk_index + offset
+        return page_chunks
+    
     def split_by_pages(
         self,
         page_texts: List[str],
@@ -119,29 +245,17 @@ class SemanticTextSplitter:
             List of TextChunk objects with page metadata
         """
         all_chunks: List[TextChunk] = []
-        global_chunk_index = 0
         
         for page_num, page_text in enumerate(page_texts, start=1):
-            if not page_text or not page_text.strip():
-                continue
-            
             # Get bounding box for this page if available
             bbox = None
             if bounding_boxes and len(bounding_boxes) >= page_num:
                 bbox = bounding_boxes[page_num - 1]
             
-            # Split page text
-            page_chunks = self.split_text(
-                text=page_text,
-                page_number=page_num,
-                bounding_box=bbox,
+            all_chunks.extend(self.split_page(
+                PageResult(page_number=page_num, text=page_text, bounding_box=bbox),
+                first_chunk_index=len(all_chunks),
                 source_document=source_document
-            )
-            
-            # Update global chunk indices
-            for chunk in page_chunks:
-                chunk.metadata.chunk_index = global_chunk_index
-                global_chunk_index += 1
-                all_chunks.append(chunk)
+            ))
         
         return all_chunks
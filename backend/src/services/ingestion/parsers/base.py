@@ -1,9 +1,13 @@
 """Base parser interface for document parsing."""
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from pathlib import Path
 
+# Any whitespace run (same characters as str.split()), compiled once
+_WS_RE = re.compile(r"\s+")
+
 
 @dataclass
 class BoundingBox:
@@ -25,16 +29,28 @@ class ParsedContent:
     bounding_boxes: Optional[List[BoundingBox]] = None
 
 
+@dataclass
+class PageResult:
+    """Text of a single page, as yielded by BaseParser.parse_streaming."""
+    page_number: int
+    text: str
+    bounding_box: Optional[BoundingBox] = None
+
+
 class BaseParser(ABC):
     """Abstract base class for document parsers."""
     
+    # Lowercase file extensions (with the dot) this parser handles
+    EXTENSIONS: frozenset = frozenset()
+    
     @abstractmethod
-    def parse(self, file_path: Path) -> ParsedContent:
+    def parse(self, file_path: Path, file_size: Optional[int] = None) -> ParsedContent:
         """
         Parse a document and extract structured content.
         
         Args:
             file_path: Path to the document file
+            file_size: Size in bytes, if already known (saves a stat call)
             
         Returns:
             ParsedContent with extracted text and metadata
@@ -45,7 +61,25 @@ class BaseParser(ABC):
         """
         pass
     
-    @abstractmethod
+    def parse_streaming(self, file_path: Path, file_size: Optional[int] = None) -> Iterator[PageResult]:
+        """
+        Yield the document's pages in order, so chunking can start before the
+        whole document is parsed. Parsers that can extract page by page
+        override this; by default the document is parsed in full first.
+        
+        Raises:
+            ValueError: If file format is invalid or unsupported
+            IOError: If file cannot be read
+        """
+        parsed = self.parse(file_path, file_size)
+        boxes = parsed.bounding_boxes or []
+        for index, text in enumerate(parsed.page_texts):
+            yield PageResult(
+                page_number=index + 1,
+                text=text,
+                bounding_box=boxes[index] if index < len(boxes) else None
+            )
+    
     def supports(self, file_extension: str) -> bool:
         """
         Check if this parser supports the given file extension.
@@ -56,7 +90,7 @@ class BaseParser(ABC):
         Returns:
             True if supported, False otherwise
         """
-        pass
+        return file_extension.lower() in self.EXTENSIONS
     
     def clean_text(self, text: str) -> str:
         """
@@ -71,25 +105,24 @@ class BaseParser(ABC):
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        text = " ".join(text.split())
-        
-        # Remove null bytes
-        text = text.replace("\x00", "")
-        
-        # Normalize line breaks
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
-        
-        return text.strip()
+        # Remove null bytes, then collapse every whitespace run (line breaks
+        # included) to a single space in one regex pass
+        return _WS_RE.sub(" ", text.replace("\x00", "")).strip()
     
-    def extract_metadata(self, **kwargs) -> Dict[str, Any]:
+    def extract_metadata(self, file_path: Path, file_size: Optional[int] = None, **kwargs) -> Dict[str, Any]:
         """
         Extract common metadata fields.
         
+        Args:
+            file_path: Path to the document file
+            file_size: Size in bytes; the file is only stat'ed if not given
+            
         Returns:
             Dictionary of metadata
         """
         return {
             "parser": self.__class__.__name__,
-            **kwargs
+            **kwargs,
+            "file_size": file_size if file_size is not None else file_path.stat().st_size,
+            "file_name": file_path.name,
         }
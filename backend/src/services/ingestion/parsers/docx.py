@@ -1,7 +1,7 @@
 """DOCX document parser using python-docx."""
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from docx import Document
 
 from .base import BaseParser, ParsedContent
@@ -12,16 +12,15 @@ logger = logging.getLogger(__name__)
 class DOCXParser(BaseParser):
     """Parser for Microsoft Word documents."""
     
-    def supports(self, file_extension: str) -> bool:
-        """Check if file extension is .docx"""
-        return file_extension.lower() == ".docx"
+    EXTENSIONS = frozenset({".docx"})
     
-    def parse(self, file_path: Path) -> ParsedContent:
+    def parse(self, file_path: Path, file_size: Optional[int] = None) -> ParsedContent:
         """
         Parse DOCX document and extract text with structure.
         
         Args:
             file_path: Path to DOCX file
+            file_size: Size in bytes, if already known (saves a stat call)
             
         Returns:
             ParsedContent with extracted text and metadata
@@ -34,19 +33,16 @@ class DOCXParser(BaseParser):
             doc = Document(file_path)
             
             # Extract text from paragraphs
-            paragraphs: List[str] = []
-            for para in doc.paragraphs:
-                text = para.text.strip()
-                if text:
-                    paragraphs.append(text)
+            paragraphs: List[str] = [text for para in doc.paragraphs if (text := para.text.strip())]
             
-            # Extract text from tables
+            # Extract text from tables (each cell stripped once; rows whose
+            # cells are all empty are skipped without being joined)
             table_texts: List[str] = []
             for table in doc.tables:
                 for row in table.rows:
-                    row_text = " | ".join(cell.text.strip() for cell in row.cells)
-                    if row_text.strip():
-                        table_texts.append(row_text)
+                    cells = [cell.text.strip() for cell in row.cells]
+                    if any(cells):
+                        table_texts.append(" | ".join(cells))
             
             # Combine paragraphs and tables
             all_texts = paragraphs + table_texts
@@ -63,8 +59,8 @@ class DOCXParser(BaseParser):
                 page_count=page_count,
                 paragraph_count=len(paragraphs),
                 table_count=len(doc.tables),
-                file_size=file_path.stat().st_size,
-                file_name=file_path.name
+                file_path=file_path,
+                file_size=file_size
             )
             
             # Add core properties if available
@@ -1,111 +1,209 @@
-"""PDF document parser using PyPDF2."""
+"""PDF document parser using PyMuPDF (MuPDF C engine)."""
 import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
-import PyPDF2
-from PyPDF2 import PdfReader
+from typing import Callable, Iterator, List, Optional
+import fitz
 
-from .base import BaseParser, ParsedContent, BoundingBox
+from src.utils.config import get_settings
+from .base import BaseParser, ParsedContent, BoundingBox, PageResult
 
 logger = logging.getLogger(__name__)
 
+# PDF metadata key -> ParsedContent metadata key
+_PDF_METADATA_KEYS = {
+    "title": "title",
+    "author": "author",
+    "creator": "creator",
+    "creationDate": "creation_date",
+}
+
+
+def _page_range(doc, start: int, end: int, clean_text: Callable[[str], str]) -> List[PageResult]:
+    """Extract pages [start, end) (0-based) of an open document; failed pages have no box."""
+    results: List[PageResult] = []
+    for index in range(start, end):
+        page_num = index + 1
+        try:
+            page = doc.load_page(index)
+            # Page-level box (MuPDF coordinates: origin top-left)
+            r = page.rect
+            bbox = BoundingBox(x0=r.x0, y0=r.y0, x1=r.x1, y1=r.y1, page=page_num)
+            results.append(PageResult(page_num, clean_text(page.get_text("text")), bbox))
+        except Exception as e:
+            logger.warning(f"Error extracting text from page {page_num}: {e}")
+            results.append(PageResult(page_num, ""))
+    return results
+
+
+def _extract_pages(path: str, start: int, end: int) -> List[PageResult]:
+    """Process pool task: open the PDF in the worker (documents don't pickle)."""
+    with fitz.open(path) as doc:
+        return _page_range(doc, start, end, PDFParser().clean_text)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool shared by all documents, created on first use.
+    Workers are started by a forkserver (spawn where that's unavailable)
+    rather than forked, so they never inherit locks held by other threads.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+
+def _discard_pool():
+    """Drop a broken pool; the next document starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+@contextmanager
+def _open_pdf(file_path: Path):
+    """
+    Open a PDF for reading, mapping failures (including those raised while
+    the document is in use) onto the parser's ValueError / IOError contract.
+    """
+    doc = None
+    try:
+        doc = fitz.open(str(file_path))
+
+        # Check if PDF is encrypted
+        if doc.is_encrypted:
+            raise ValueError(f"PDF file is encrypted: {file_path}")
+
+        yield doc
+
+    except fitz.FileDataError as e:
+        raise ValueError(f"Invalid or corrupted PDF file: {e}")
+    except ValueError:
+        raise
+    except FileNotFoundError:
+        raise IOError(f"File not found: {file_path}")
+    except Exception as e:
+        logger.error(f"Error parsing PDF {file_path}: {e}")
+        raise IOError(f"Failed to parse PDF: {e}")
+    finally:
+        if doc is not None:
+            doc.close()
+
 
 class PDFParser(BaseParser):
     """Parser for PDF documents."""
-    
-    def supports(self, file_extension: str) -> bool:
-        """Check if file extension is .pdf"""
-        return file_extension.lower() == ".pdf"
-    
-    def parse(self, file_path: Path) -> ParsedContent:
+
+    EXTENSIONS = frozenset({".pdf"})
+
+    def _extract_parallel(self, file_path: Path, page_count: int) -> Optional[List[PageResult]]:
+        """
+        Extract all pages across the shared process pool, one contiguous page
+        range per worker. Returns None when the document is too small to be
+        worth it, when running inside a daemonic process (Celery prefork
+        workers can't have children) or off the main thread (e.g. a threads
+        pool worker), or if the pool fails.
+        """
+        settings = get_settings()
+        pool_size = settings.pdf_parse_workers or os.cpu_count() or 1
+        workers = min(pool_size, page_count)
+        if page_count < settings.pdf_parallel_min_pages or workers < 2:
+            return None
+        if multiprocessing.current_process().daemon:
+            return None
+        if threading.current_thread() is not threading.main_thread():
+            return None
+
+        pages_per_worker = math.ceil(page_count / workers)
+        try:
+            pool = _get_pool(pool_size)
+            futures = [
+                pool.submit(_extract_pages, str(file_path), start, min(start + pages_per_worker, page_count))
+                for start in range(0, page_count, pages_per_worker)
+            ]
+            # Ranges were submitted in page order, so results already are
+            return [page for future in futures for page in future.result()]
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction failed, extracting sequentially: {e}")
+            _discard_pool()
+            return None
+
+    def _iter_pages(self, doc, file_path: Path) -> Iterator[PageResult]:
+        """Pages of an open document in order: from the pool, or one at a time."""
+        pages = self._extract_parallel(file_path, doc.page_count)
+        if pages is not None:
+            yield from pages
+            return
+        for index in range(doc.page_count):
+            yield from _page_range(doc, index, index + 1, self.clean_text)
+
+    def parse_streaming(self, file_path: Path, file_size: Optional[int] = None) -> Iterator[PageResult]:
+        """
+        Yield pages as they are extracted (see BaseParser.parse_streaming).
+
+        Raises:
+            ValueError: If PDF is invalid or encrypted
+            IOError: If file cannot be read
+        """
+        with _open_pdf(file_path) as doc:
+            yield from self._iter_pages(doc, file_path)
+
+    def parse(self, file_path: Path, file_size: Optional[int] = None) -> ParsedContent:
         """
         Parse PDF document and extract text with metadata.
-        
+
         Args:
             file_path: Path to PDF file
-            
+            file_size: Size in bytes, if already known (saves a stat call)
+
         Returns:
             ParsedContent with extracted text and metadata
-            
+
         Raises:
             ValueError: If PDF is invalid or encrypted
             IOError: If file cannot be read
         """
-        try:
-            with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
-                
-                # Check if PDF is encrypted
-                if reader.is_encrypted:
-                    raise ValueError(f"PDF file is encrypted: {file_path}")
-                
-                page_count = len(reader.pages)
-                page_texts: List[str] = []
-                bounding_boxes: List[BoundingBox] = []
-                
-                # Extract text from each page
-                for page_num, page in enumerate(reader.pages, start=1):
-                    try:
-                        page_text = page.extract_text()
-                        cleaned_text = self.clean_text(page_text)
-                        page_texts.append(cleaned_text)
-                        
-                        # Try to extract bounding boxes if available
-                        # Note: PyPDF2 has limited bbox support, this is a basic implementation
-                        try:
-                            if hasattr(page, 'mediabox'):
-                                mediabox = page.mediabox
-                                bbox = BoundingBox(
-                                    x0=float(mediabox.lower_left[0]),
-                                    y0=float(mediabox.lower_left[1]),
-                                    x1=float(mediabox.upper_right[0]),
-                                    y1=float(mediabox.upper_right[1]),
-                                    page=page_num
-                                )
-                                bounding_boxes.append(bbox)
-                        except Exception as e:
-                            logger.debug(f"Could not extract bbox for page {page_num}: {e}")
-                            
-                    except Exception as e:
-                        logger.warning(f"Error extracting text from page {page_num}: {e}")
-                        page_texts.append("")
-                
-                # Combine all page texts
-                full_text = "\n\n".join(page_texts)
-                
-                # Extract metadata
-                metadata = self.extract_metadata(
-                    page_count=page_count,
-                    file_size=file_path.stat().st_size,
-                    file_name=file_path.name
-                )
-                
-                # Add PDF-specific metadata if available
-                if reader.metadata:
-                    try:
-                        if reader.metadata.title:
-                            metadata['title'] = reader.metadata.title
-                        if reader.metadata.author:
-                            metadata['author'] = reader.metadata.author
-                        if reader.metadata.creator:
-                            metadata['creator'] = reader.metadata.creator
-                        if reader.metadata.creation_date:
-                            metadata['creation_date'] = str(reader.metadata.creation_date)
-                    except Exception as e:
-                        logger.debug(f"Could not extract PDF metadata: {e}")
-                
-                return ParsedContent(
-                    text=full_text,
-                    page_count=page_count,
-                    metadata=metadata,
-                    page_texts=page_texts,
-                    bounding_boxes=bounding_boxes if bounding_boxes else None
-                )
-                
-        except PyPDF2.errors.PdfReadError as e:
-            raise ValueError(f"Invalid or corrupted PDF file: {e}")
-        except FileNotFoundError:
-            raise IOError(f"File not found: {file_path}")
-        except Exception as e:
-            logger.error(f"Error parsing PDF {file_path}: {e}")
-            raise IOError(f"Failed to parse PDF: {e}")
+        with _open_pdf(file_path) as doc:
+            page_count = doc.page_count
+
+            # Extract text from each page
+            pages = list(self._iter_pages(doc, file_path))
+            page_texts: List[str] = [page.text for page in pages]
+            bounding_boxes: List[BoundingBox] = [page.bounding_box for page in pages if page.bounding_box]
+
+            # Combine all page texts
+            full_text = "\n\n".join(page_texts)
+
+            # Extract metadata
+            metadata = self.extract_metadata(
+                page_count=page_count,
+                file_path=file_path,
+                file_size=file_size
+            )
+
+            # Add PDF-specific metadata if available
+            pdf_metadata = doc.metadata or {}
+            for source_key, key in _PDF_METADATA_KEYS.items():
+                if pdf_metadata.get(source_key):
+                    metadata[key] = pdf_metadata[source_key]
+
+            return ParsedContent(
+                text=full_text,
+                page_count=page_count,
+                metadata=metadata,
+                page_texts=page_texts,
+                bounding_boxes=bounding_boxes if bounding_boxes else None
+            )
@@ -1,7 +1,7 @@
 """PPTX document parser using python-pptx."""
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from pptx import Presentation
 
 from .base import BaseParser, ParsedContent
@@ -12,16 +12,15 @@ logger = logging.getLogger(__name__)
 class PPTXParser(BaseParser):
     """Parser for Microsoft PowerPoint presentations."""
     
-    def supports(self, file_extension: str) -> bool:
-        """Check if file extension is .pptx"""
-        return file_extension.lower() == ".pptx"
+    EXTENSIONS = frozenset({".pptx"})
     
-    def parse(self, file_path: Path) -> ParsedContent:
+    def parse(self, file_path: Path, file_size: Optional[int] = None) -> ParsedContent:
         """
         Parse PPTX document and extract text from slides.
         
         Args:
             file_path: Path to PPTX file
+            file_size: Size in bytes, if already known (saves a stat call)
             
         Returns:
             ParsedContent with extracted text and metadata
@@ -50,9 +49,9 @@ class PPTXParser(BaseParser):
                     if shape.has_table:
                         table = shape.table
                         for row in table.rows:
-                            row_text = " | ".join(cell.text.strip() for cell in row.cells)
-                            if row_text.strip():
-                                slide_content.append(row_text)
+                            cells = [cell.text.strip() for cell in row.cells]
+                            if any(cells):
+                                slide_content.append(" | ".join(cells))
                 
                 # Extract notes if available
                 if slide.has_notes_slide:
@@ -81,8 +80,8 @@ class PPTXParser(BaseParser):
             metadata = self.extract_metadata(
                 page_count=page_count,
                 slide_count=len(prs.slides),
-                file_size=file_path.stat().st_size,
-                file_name=file_path.name
+                file_path=file_path,
+                file_size=file_size
             )
             
             # Add presentation properties if available
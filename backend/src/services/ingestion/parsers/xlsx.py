@@ -1,7 +1,8 @@
 """XLSX document parser using openpyxl."""
+import io
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from openpyxl import load_workbook
 
 from .base import BaseParser, ParsedContent
@@ -12,16 +13,15 @@ logger = logging.getLogger(__name__)
 class XLSXParser(BaseParser):
     """Parser for Microsoft Excel spreadsheets."""
     
-    def supports(self, file_extension: str) -> bool:
-        """Check if file extension is .xlsx"""
-        return file_extension.lower() == ".xlsx"
+    EXTENSIONS = frozenset({".xlsx"})
     
-    def parse(self, file_path: Path) -> ParsedContent:
+    def parse(self, file_path: Path, file_size: Optional[int] = None) -> ParsedContent:
         """
         Parse XLSX document and extract data from all sheets.
         
         Args:
             file_path: Path to XLSX file
+            file_size: Size in bytes, if already known (saves a stat call)
             
         Returns:
             ParsedContent with extracted text and metadata
@@ -41,22 +41,35 @@ class XLSXParser(BaseParser):
                 sheet = workbook[sheet_name]
                 
                 # Add sheet header
-                sheet_content = [f"=== Sheet: {sheet_name} ==="]
+                buf = io.StringIO()
+                buf.write(f"=== Sheet: {sheet_name} ===")
+                sheet_rows = 0
                 
-                # Extract data from rows
+                # Extract data from rows, written straight into the sheet buffer
                 for row in sheet.iter_rows(values_only=True):
-                    # Filter out None values and convert to strings
-                    row_values = [str(cell) if cell is not None else "" for cell in row]
+                    row_start = buf.tell()
+                    buf.write("\n")
+                    row_has_text = False
+                    for i, cell in enumerate(row):
+                        if i:
+                            buf.write(" | ")
+                        # None cells are written as empty strings
+                        if cell is not None:
+                            value = str(cell)
+                            buf.write(value)
+                            row_has_text = row_has_text or (bool(value) and not value.isspace())
                     
-                    # Skip completely empty rows
-                    if any(val.strip() for val in row_values):
-                        row_text = " | ".join(row_values)
-                        sheet_content.append(row_text)
-                        total_rows += 1
+                    # Skip completely empty rows (rewind over what was written)
+                    if row_has_text:
+                        sheet_rows += 1
+                    else:
+                        buf.seek(row_start)
+                        buf.truncate()
                 
                 # Add sheet content if not empty
-                if len(sheet_content) > 1:
-                    sheet_texts.append("\n".join(sheet_content))
+                if sheet_rows:
+                    sheet_texts.append(buf.getvalue())
+                    total_rows += sheet_rows
             
             # Combine all sheets
             full_text = "\n\n".join(sheet_texts)
@@ -71,8 +84,8 @@ class XLSXParser(BaseParser):
                 page_count=page_count,
                 sheet_count=len(workbook.sheetnames),
                 total_rows=total_rows,
-                file_size=file_path.stat().st_size,
-                file_name=file_path.name
+                file_path=file_path,
+                file_size=file_size
             )
             
             # Add workbook properties if available
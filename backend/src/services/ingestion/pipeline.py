@@ -1,7 +1,13 @@
 """Ingestion Pipeline Service."""
 import logging
+import queue
+import threading
 import traceback
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import uuid4
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
 from src.models.document import DocumentStatus
@@ -10,13 +16,18 @@ from src.services.ingestion.parsers.pdf import PDFParser
 from src.services.ingestion.parsers.docx import DOCXParser
 from src.services.ingestion.parsers.xlsx import XLSXParser
 from src.services.ingestion.parsers.pptx import PPTXParser
-from src.services.ingestion.chunking.splitter import SemanticTextSplitter
+from src.services.ingestion.chunking.splitter import SemanticTextSplitter, TextChunk
 from src.services.ingestion.chunking.config import DocumentTypeConfig
-from src.indexing.manager import IndexManager
+from src.indexing.manager import get_index_manager
 from src.storage.db.models import ChunkModel, DocumentModel
 
 logger = logging.getLogger(__name__)
 
+# Chunks stored and embedded per round trip while streaming (one embedding
+# API batch), and chunks buffered between the parser thread and the embedder
+STREAM_BATCH_SIZE = 100
+STREAM_QUEUE_SIZE = 256
+
 
 class IngestionPipeline:
     """
@@ -27,24 +38,143 @@ class IngestionPipeline:
     def __init__(self, db: Session):
         self.db = db
         self.document_service = DocumentService(db)
-        self.index_manager = IndexManager()
+        self.index_manager = get_index_manager()
         self.chunk_config = DocumentTypeConfig()
         
-        # Initialize parsers
+        # Initialize parsers, indexed by the extensions they handle
         self.parsers = [
             PDFParser(),
             DOCXParser(),
             XLSXParser(),
             PPTXParser()
         ]
+        self._parser_by_ext = {ext: parser for parser in self.parsers for ext in parser.EXTENSIONS}
 
     def _get_parser(self, file_path: Path):
         """Find appropriate parser for file."""
         ext = file_path.suffix
-        for parser in self.parsers:
-            if parser.supports(ext):
-                return parser
-        raise ValueError(f"No parser found for extension: {ext}")
+        try:
+            return self._parser_by_ext[ext.lower()]
+        except KeyError:
+            raise ValueError(f"No parser found for extension: {ext}")
+
+    def _produce_chunks(
+        self,
+        parser,
+        splitter: SemanticTextSplitter,
+        file_path: Path,
+        file_size: Optional[int],
+        source_document: str,
+        out: queue.Queue,
+        stop: threading.Event,
+        state: dict
+    ):
+        """
+        Producer thread: stream pages from the parser, split them and queue
+        the chunks; ends with a None sentinel. The page count (or the error
+        that ended parsing) is left in `state`. Stops early once `stop` is set.
+        """
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        chunk_index = 0
+        try:
+            for page in parser.parse_streaming(file_path, file_size):
+                state["page_count"] = page.page_number
+                for chunk in splitter.split_page(page, chunk_index, source_document):
+                    if not put(chunk):
+                        return
+                    chunk_index += 1
+        except Exception as e:
+            state["error"] = e
+        finally:
+            put(None)
+
+    def _store_chunks(self, document_id: str, chunks: List[TextChunk]):
+        """Persist a batch of chunks in one INSERT and hand them to the index manager."""
+        rows = []
+        for chunk in chunks:
+            bbox = chunk.metadata.bounding_box
+            # Convert BoundingBox dataclass to dict for JSON serialization
+            if bbox and is_dataclass(bbox):
+                bbox = asdict(bbox)
+            rows.append({
+                # Generated here so the ids are known without reading rows back
+                "id": str(uuid4()),
+                "document_id": document_id,
+                "text": chunk.text,
+                "chunk_index": chunk.metadata.chunk_index,
+                "page_number": chunk.metadata.page_number,
+                "bounding_box": bbox,
+            })
+        # Bulk executemany insert: no ORM objects, no flush per row
+        self.db.execute(insert(ChunkModel), rows)
+        self.db.commit()
+        
+        self.index_manager.add_chunks(
+            document_id,
+            [chunk.text for chunk in chunks],
+            [row["id"] for row in rows]
+        )
+
+    def _ingest_streaming(
+        self,
+        document_id: str,
+        parser,
+        splitter: SemanticTextSplitter,
+        file_path: Path,
+        file_size: Optional[int],
+        source_document: str
+    ) -> Tuple[int, int]:
+        """
+        Parse and chunk on a producer thread while this thread stores and
+        embeds chunks in batches of STREAM_BATCH_SIZE, so wall-clock time is
+        roughly max(parse, embed) rather than their sum. The bounded queue
+        applies backpressure when embedding falls behind. DB work stays on
+        this thread, which owns the session.
+        
+        Returns:
+            (page count, chunk count)
+        """
+        chunk_queue: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        state = {"page_count": 0, "error": None}
+        producer = threading.Thread(
+            target=self._produce_chunks,
+            args=(parser, splitter, file_path, file_size, source_document, chunk_queue, stop, state),
+            name=f"ingest-{document_id}",
+            daemon=True
+        )
+        producer.start()
+        
+        chunk_count = 0
+        batch: List[TextChunk] = []
+        try:
+            while True:
+                chunk = chunk_queue.get()
+                if chunk is None:
+                    break
+                batch.append(chunk)
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    self._store_chunks(document_id, batch)
+                    chunk_count += len(batch)
+                    batch = []
+            if state["error"] is not None:
+                raise state["error"]
+            if batch:
+                self._store_chunks(document_id, batch)
+                chunk_count += len(batch)
+        finally:
+            stop.set()
+            producer.join()
+        
+        return state["page_count"], chunk_count
 
     def run(self, document_id: str):
         """
@@ -63,62 +193,29 @@ class IngestionPipeline:
             self.document_service.update_status(document_id, DocumentStatus.INDEXING)
             logger.info(f"Starting ingestion for document {doc.filename}")
             
-            # 2. Parse Document
+            # 2-5. Parse, chunk, store and index, streamed: pages are parsed
+            # and chunked on a producer thread while this thread embeds
             file_path = Path(doc.file_path)
             parser = self._get_parser(file_path)
-            parsed_content = parser.parse(file_path)
-            
-            # Update doc metadata
-            doc.page_count = parsed_content.page_count
-            self.db.commit()
-            
-            # 3. Create Chunks
             splitter = SemanticTextSplitter(
                 self.chunk_config.get_config(doc.file_type)
             )
-            
-            chunks = splitter.split_by_pages(
-                parsed_content.page_texts,
-                parsed_content.bounding_boxes,
-                source_document=doc.filename
+            # The size recorded at upload is passed on, so parsers needn't stat the file
+            page_count, chunk_count = self._ingest_streaming(
+                document_id, parser, splitter, file_path, doc.file_size, doc.filename
             )
             
-            if not chunks:
+            # Update doc metadata
+            doc.page_count = page_count
+            doc.chunk_count = chunk_count
+            self.db.commit()
+            
+            if not chunk_count:
                 logger.warning(f"No text extracted from {doc.filename}")
                 self.document_service.update_status(document_id, DocumentStatus.ERROR, "No text extracted")
                 return
-
-            # 4. Save Chunks to DB
-            chunk_ids = []
-            chunk_texts = []
             
-            from dataclasses import asdict, is_dataclass
-            
-            for chunk in chunks:
-                bbox = chunk.metadata.bounding_box
-                # Convert BoundingBox dataclass to dict for JSON serialization
-                if bbox and is_dataclass(bbox):
-                    bbox = asdict(bbox)
-                    
-                db_chunk = ChunkModel(
-                    document_id=document_id,
-                    text=chunk.text,
-                    chunk_index=chunk.metadata.chunk_index,
-                    page_number=chunk.metadata.page_number,
-                    bounding_box=bbox
-                )
-                self.db.add(db_chunk)
-                # Flush to get ID
-                self.db.flush()
-                
-                chunk_ids.append(db_chunk.id)
-                chunk_texts.append(chunk.text)
-                
-            doc.chunk_count = len(chunks)
-            self.db.commit()
-            
-            # 5. Index Chunks (Embeddings + FAISS)
-            self.index_manager.add_document(document_id, chunk_texts, chunk_ids)
+            self.index_manager.complete_document(document_id)
             
             # 6. Update Status to READY
             self.document_service.update_status(document_id, DocumentStatus.READY)
@@ -128,5 +225,13 @@ class IngestionPipeline:
             logger.error(f"Ingestion failed for {document_id}: {e}")
             traceback.print_exc()
             self.db.rollback()  # Ensure transaction is rolled back before status update
+            # Batches stored before the failure were committed; drop them and
+            # their unwritten vectors so the document stays out of retrieval
+            self.index_manager.discard_document(document_id)
+            self.db.execute(delete(ChunkModel).where(ChunkModel.document_id == document_id))
+            self.db.execute(
+                update(DocumentModel).where(DocumentModel.id == document_id).values(chunk_count=0)
+            )
+            self.db.commit()
             self.document_service.update_status(document_id, DocumentStatus.ERROR, str(e))
             raise
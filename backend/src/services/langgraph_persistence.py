@@ -1,4 +1,5 @@
 import sqlite3
+from functools import lru_cache
 from langgraph.checkpoint.sqlite import SqliteSaver
 from contextlib import contextmanager
 import os
@@ -6,6 +7,20 @@ import os
 # Path to the LangGraph checkpoint database
 CHECKPOINT_DB_PATH = os.path.join(os.getcwd(), "langgraph_checkpoints.db")
 
+
+def _connect() -> sqlite3.Connection:
+    """
+    Open the checkpoint database in WAL mode, so checkpoint reads don't block
+    on writers, with synchronous=NORMAL (no fsync per commit under WAL).
+    """
+    conn = sqlite3.connect(CHECKPOINT_DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
 class LangGraphPersistence:
     """
     Manages LangGraph checkpointers for state persistence.
@@ -18,7 +33,7 @@ class LangGraphPersistence:
         Provides a SqliteSaver checkpointer.
         Using a context manager to ensure the connection is closed.
         """
-        conn = sqlite3.connect(CHECKPOINT_DB_PATH, check_same_thread=False)
+        conn = _connect()
         try:
             yield SqliteSaver(conn)
         finally:
@@ -30,5 +45,17 @@ class LangGraphPersistence:
         Simple getter for the checkpointer.
         Note: The connection should ideally be managed per-request or per-thread.
         """
-        conn = sqlite3.connect(CHECKPOINT_DB_PATH, check_same_thread=False)
+        conn = _connect()
+        return SqliteSaver(conn)
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_shared_checkpointer():
+        """
+        Process-wide checkpointer on a single long-lived connection.
+        SqliteSaver serializes access with its own lock, so it can be shared
+        across threads; sharing it lets the compiled graph be cached too.
+        This is the checkpointer the answer and review services run on.
+        """
+        conn = _connect()
         return SqliteSaver(conn)
@@ -1,13 +1,36 @@
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Type, TypeVar
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Type, TypeVar, Union
 import google.generativeai as genai
-from pydantic import BaseModel
+from cachetools import TTLCache
+from pydantic import BaseModel, TypeAdapter
 from src.utils.config import get_settings
+from src.utils.retry import gemini_retry
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# A response model class, or a prebuilt TypeAdapter for one
+ResponseSchema = Union[Type[T], TypeAdapter]
+
+
+def _parse_structured(text: str, response_model: ResponseSchema) -> T:
+    """Validate a JSON response straight from text (no intermediate dict)."""
+    if isinstance(response_model, TypeAdapter):
+        return response_model.validate_json(text)
+    return response_model.model_validate_json(text)
+
+
+# Parsed structured responses, keyed on (prompt digest, model, schema).
+# Only used for deterministic (temperature 0) calls that opt in with cache=True.
+_response_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_response_cache_lock = threading.Lock()
+
+
 class LLMService:
     """
     Service for interacting with Google Gemini models.
@@ -22,6 +45,9 @@ class LLMService:
         # Using gemini-2.5-flash for speed and efficiency in RAG agent
         self.model_name = "gemini-2.5-flash" 
         self.model = genai.GenerativeModel(self.model_name)
+        # GenerationConfigs by (temperature, JSON mode, schema); callers use a
+        # handful of combinations, so each is built once and reused
+        self._configs: Dict[tuple, Any] = {}
         logger.info(f"Initialized LLMService with model: {self.model_name}")
 
     def generate_text(self, prompt: str, temperature: float = 0.0) -> str:
@@ -29,36 +55,130 @@ class LLMService:
         Generate plain text response.
         """
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature
-                )
-            )
+            response = self._generate_content(prompt, self._generation_config(temperature))
             return response.text
         except Exception as e:
             logger.error(f"LLM text generation failed: {e}")
             raise
 
-    def generate_structured(self, prompt: str, response_model: Type[T], temperature: float = 0.0) -> T:
+    @gemini_retry("llm")
+    def _generate_content(self, prompt: str, generation_config):
+        """Single Gemini call, retried on rate limits (see gemini_retry)."""
+        return self.model.generate_content(prompt, generation_config=generation_config)
+
+    def _generation_config(self, temperature: float, json_mode: bool = False, schema: Optional[type] = None):
+        """GenerationConfig for these options, built on first use and then reused."""
+        key = (temperature, json_mode, schema)
+        config = self._configs.get(key)
+        if config is None:
+            options: Dict[str, Any] = {"temperature": temperature}
+            if json_mode:
+                options["response_mime_type"] = "application/json"
+            if schema is not None:
+                options["response_schema"] = schema
+            config = self._configs[key] = genai.types.GenerationConfig(**options)
+        return config
+
+    def _structured_config(self, temperature: float, response_model: ResponseSchema, constrained: bool):
+        """
+        Generation config for JSON-mode (structured) output. With `constrained`,
+        the model class is also passed as response_schema, so Gemini decodes
+        against the schema and the first response always parses.
+        """
+        schema = response_model if constrained and isinstance(response_model, type) else None
+        return self._generation_config(temperature, json_mode=True, schema=schema)
+
+    def _cache_key(self, prompt: str, response_model: ResponseSchema, temperature: float, cache: bool):
+        """Response cache key, or None if this call must not be cached."""
+        if not cache or temperature != 0.0:
+            return None
+        digest = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        # Schemas are module-level classes/adapters, so identity is a stable key
+        return (digest, self.model_name, response_model)
+
+    def _cached(self, key):
+        if key is None:
+            return None
+        with _response_cache_lock:
+            return _response_cache.get(key)
+
+    def _store(self, key, result: T) -> T:
+        if key is not None:
+            with _response_cache_lock:
+                _response_cache[key] = result
+        return result
+
+    def generate_structured(
+        self,
+        prompt: str,
+        response_model: ResponseSchema,
+        temperature: float = 0.0,
+        cache: bool = False,
+        constrained: bool = False
+    ) -> T:
         """
         Generate structured data using Pydantic models.
+        With cache=True, identical deterministic calls are served from memory;
+        constrained=True enables schema-constrained decoding for model classes
+        whose fields Gemini's response_schema supports.
         """
+        key = self._cache_key(prompt, response_model, temperature, cache)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         try:
             # Gemini support for constrained output (JSON mode)
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
-                    response_mime_type="application/json",
-                    # Some versions/models support response_schema directly
-                )
-            )
-            # Basic JSON parsing if it returns text
-            import json
-            data = json.loads(response.text)
-            return response_model.model_validate(data)
+            response = self._generate_content(prompt, self._structured_config(temperature, response_model, constrained))
+            return self._store(key, _parse_structured(response.text, response_model))
         except Exception as e:
             logger.error(f"LLM structured generation failed: {e}")
             # Fallback or re-raise
             raise
+
+    def generate_text_many(
+        self,
+        prompts: List[str],
+        temperature: float = 0.0,
+        max_concurrency: int = 8
+    ) -> List[str]:
+        """
+        Generate plain text for several prompts concurrently, with up to
+        `max_concurrency` calls in flight on worker threads (see
+        generate_structured_many). Results are in prompt order.
+        """
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts)), thread_name_prefix="llm") as pool:
+            return list(pool.map(lambda prompt: self.generate_text(prompt, temperature), prompts))
+
+    def generate_structured_many(
+        self,
+        prompts: List[str],
+        response_model: ResponseSchema,
+        temperature: float = 0.0,
+        max_concurrency: int = 8,
+        cache: bool = False
+    ) -> List[T]:
+        """
+        Run several structured generations concurrently, with up to
+        `max_concurrency` calls in flight. Results are in prompt order.
+        Each call is a sync generate_structured on a worker thread (the SDK
+        releases the GIL while waiting), so this works from any caller,
+        including code already running inside an event loop.
+        """
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts)), thread_name_prefix="llm") as pool:
+            return list(pool.map(
+                lambda prompt: self.generate_structured(prompt, response_model, temperature, cache),
+                prompts
+            ))
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> LLMService:
+    """
+    Get the process-wide LLM service, so the Gemini client (and its
+    connection pool) is configured once and reused across graph nodes.
+    """
+    return LLMService()
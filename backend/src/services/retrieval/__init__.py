@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class RetrievedChunk(BaseModel):
     id: str
@@ -9,3 +9,9 @@ class RetrievedChunk(BaseModel):
     filename: str
     page_number: Optional[int] = None
     bounding_box: Optional[Dict[str, Any]] = None
+
+
+def unique_chunks(chunks: List[RetrievedChunk]) -> List[RetrievedChunk]:
+    """Drop repeated chunks (same id), keeping the first, best-ranked occurrence."""
+    seen = set()
+    return [c for c in chunks if not (c.id in seen or seen.add(c.id))]
@@ -1,7 +1,7 @@
 import logging
 from typing import List
 from sqlalchemy.orm import Session
-from src.indexing.manager import IndexManager
+from src.indexing.manager import get_index_manager
 from src.storage.db.models import ChunkModel, DocumentModel
 from . import RetrievedChunk
 
@@ -14,7 +14,7 @@ class SemanticRetrievalService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.index_manager = IndexManager()
+        self.index_manager = get_index_manager()
 
     def retrieve(self, query: str, k: int = 5) -> List[RetrievedChunk]:
         """
@@ -1,11 +1,11 @@
 import logging
 from typing import List, Optional, Dict, Any
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 from src.storage.db.models import AnswerModel, CitationModel, QuestionModel
 from src.models.answer import AnswerStatus
-from src.services.agent.graph import create_rag_graph
+from src.services.agent.graph import get_rag_graph
 from src.services.langgraph_persistence import LangGraphPersistence
 
 logger = logging.getLogger(__name__)
@@ -18,38 +18,46 @@ class ReviewService:
     def __init__(self, db: Session):
         self.db = db
 
-    def confirm_answer(self, answer_id: str, comment: Optional[str] = None) -> AnswerModel:
-        """Approve an AI-generated answer."""
-        answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
+    def _get_answer(self, answer_id: str) -> AnswerModel:
+        """Load an answer by primary key or raise ValueError."""
+        answer = self.db.get(AnswerModel, answer_id)
         if not answer:
             raise ValueError(f"Answer {answer_id} not found")
-        
-        answer.status = AnswerStatus.CONFIRMED
-        if comment:
-            answer.review_comment = comment
-        answer.updated_at = datetime.utcnow()
-        
-        self.db.commit()
         return answer
 
-    def reject_answer(self, answer_id: str, reason: str) -> AnswerModel:
-        """Reject an AI-generated answer with a reason."""
-        answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
+    def _apply_status(self, answer_id: str, status: AnswerStatus, comment: Optional[str] = None) -> AnswerModel:
+        """
+        Set the review status (and optional comment) of an answer and commit.
+        Issued as a single UPDATE ... RETURNING rather than SELECT + flush + refresh.
+        """
+        # updated_at is stamped by the column's onupdate
+        values = {"status": status}
+        if comment:
+            values["review_comment"] = comment
+            
+        answer = self.db.execute(
+            update(AnswerModel)
+            .where(AnswerModel.id == answer_id)
+            .values(**values)
+            .returning(AnswerModel)
+        ).scalar_one_or_none()
         if not answer:
             raise ValueError(f"Answer {answer_id} not found")
         
-        answer.status = AnswerStatus.REJECTED
-        answer.review_comment = reason
-        answer.updated_at = datetime.utcnow()
-        
         self.db.commit()
         return answer
 
+    def confirm_answer(self, answer_id: str, comment: Optional[str] = None) -> AnswerModel:
+        """Approve an AI-generated answer."""
+        return self._apply_status(answer_id, AnswerStatus.CONFIRMED, comment)
+
+    def reject_answer(self, answer_id: str, reason: str) -> AnswerModel:
+        """Reject an AI-generated answer with a reason."""
+        return self._apply_status(answer_id, AnswerStatus.REJECTED, reason)
+
     def manual_update(self, answer_id: str, text: str) -> AnswerModel:
         """Manually override an answer while preserving the original AI answer."""
-        ai_answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
-        if not ai_answer:
-            raise ValueError(f"Answer {answer_id} not found")
+        ai_answer = self._get_answer(answer_id)
         
         # Check if a human answer already exists for this question
         human_answer = self.db.query(AnswerModel).filter(
@@ -60,7 +68,6 @@ class ReviewService:
         if human_answer:
             human_answer.text = text
             human_answer.status = AnswerStatus.MANUAL_UPDATED
-            human_answer.updated_at = datetime.utcnow()
         else:
             human_answer = AnswerModel(
                 question_id=ai_answer.question_id,
@@ -68,9 +75,7 @@ class ReviewService:
                 status=AnswerStatus.MANUAL_UPDATED,
                 created_by="HUMAN",
                 is_answerable=True,
-                confidence_score=1.0,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                confidence_score=1.0
             )
             self.db.add(human_answer)
         
@@ -80,24 +85,13 @@ class ReviewService:
 
     def flag_missing_data(self, answer_id: str, missing_info: str) -> AnswerModel:
         """Flag an answer as having missing data in source docs."""
-        answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
-        if not answer:
-            raise ValueError(f"Answer {answer_id} not found")
-        
-        answer.status = AnswerStatus.MISSING_DATA
-        answer.review_comment = f"MISSING DATA: {missing_info}"
-        answer.updated_at = datetime.utcnow()
-        
-        self.db.commit()
-        return answer
+        return self._apply_status(answer_id, AnswerStatus.MISSING_DATA, f"MISSING DATA: {missing_info}")
 
     def refine_answer(self, answer_id: str, feedback: str) -> AnswerModel:
         """
         Interactively refine an answer using LangGraph HITL via checkpointer.
         """
-        db_answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
-        if not db_answer:
-            raise ValueError(f"Answer {answer_id} not found")
+        db_answer = self._get_answer(answer_id)
         
         if not db_answer.thread_id:
             # If no thread_id, we can't refine easily with HITL, so we just restart or error
@@ -108,52 +102,59 @@ class ReviewService:
         config = {"configurable": {"thread_id": thread_id}}
         
         # 1. Get checkpointer and graph
-        with LangGraphPersistence.get_sqlite_checkpointer() as checkpointer:
-            graph = create_rag_graph(checkpointer=checkpointer)
-            
-            # 2. Add feedback to state and run again
-            # We use 'update_state' to inject feedback into the thread
-            # Or just 'invoke' with the feedback if the graph is designed to handle it
-            graph.update_state(config, {"feedback": feedback})
-            
-            # 3. Resume the graph from the generation node (or wherever it makes sense)
-            # Actually, we can just run it again, and it will pick up from the last checkpoint
-            # and hopefully our nodes check for feedback.
-            final_state = graph.invoke(None, config=config)
-            
-            # 4. Update the answer in DB
-            db_answer.text = final_state["generation"] or db_answer.text
-            db_answer.is_answerable = final_state["is_answerable"]
-            db_answer.confidence_score = final_state["confidence_score"]
-            db_answer.processing_metadata = {"steps": final_state.get("steps", [])}
-            db_answer.updated_at = datetime.utcnow()
-            
-            # Clear old citations and add new ones if they changed
-            # (Simplified: just add new ones, might want to deduplicate)
-            # In a real app we'd delete old citations for this answer
-            self.db.query(CitationModel).filter(CitationModel.answer_id == db_answer.id).delete()
-            
-            for doc in final_state.get("documents", []):
-                citation = CitationModel(
-                    answer_id=db_answer.id,
-                    chunk_id=doc.id,
-                    chunk_text=doc.text,
-                    page_number=doc.page_number,
-                    bounding_box=doc.bounding_box,
-                    document_name=doc.filename
-                )
-                self.db.add(citation)
-            
-            self.db.commit()
-            self.db.refresh(db_answer)
-            
+        graph = get_rag_graph(LangGraphPersistence.get_shared_checkpointer())
+        
+        # 2. Add feedback to state and run again
+        # We use 'update_state' to inject feedback into the thread
+        # Or just 'invoke' with the feedback if the graph is designed to handle it
+        graph.update_state(config, {"feedback": feedback})
+        
+        # 3. Resume the graph from the generation node (or wherever it makes sense)
+        # Actually, we can just run it again, and it will pick up from the last checkpoint
+        # and hopefully our nodes check for feedback.
+        final_state = graph.invoke(None, config=config)
+        
+        # 4. Update the answer in DB
+        db_answer.text = final_state["generation"] or db_answer.text
+        db_answer.is_answerable = final_state["is_answerable"]
+        db_answer.confidence_score = final_state["confidence_score"]
+        db_answer.processing_metadata = {"steps": final_state.get("steps", [])}
+        
+        # Clear old citations and add new ones if they changed
+        # (Simplified: just add new ones, might want to deduplicate)
+        # In a real app we'd delete old citations for this answer
+        self.db.query(CitationModel).filter(CitationModel.answer_id == db_answer.id).delete()
+        
+        for doc in final_state.get("documents", []):
+            citation = CitationModel(
+                answer_id=db_answer.id,
+                chunk_id=doc.id,
+                chunk_text=doc.text,
+                page_number=doc.page_number,
+                bounding_box=doc.bounding_box,
+                document_name=doc.filename
+            )
+            self.db.add(citation)
+        
+        self.db.commit()
+        self.db.refresh(db_answer)
+        
         return db_answer
 
     def get_history(self, answer_id: str) -> List[Dict[str, Any]]:
         """Get audit trail for an answer."""
         # In a real app, we'd have a separate AuditLog table
-        # For this task, we'll return the current state and comments
-        answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
+        # For this task, we'll return the current state and comments.
+        # Only the audit columns are selected; the answer text is never loaded.
+        answer = self.db.execute(
+            select(
+                AnswerModel.created_at,
+                AnswerModel.updated_at,
+                AnswerModel.status,
+                AnswerModel.created_by,
+                AnswerModel.review_comment,
+            ).where(AnswerModel.id == answer_id)
+        ).one_or_none()
         if not answer:
             return []
             
@@ -175,7 +176,7 @@ class ReviewService:
 
     def get_trace(self, answer_id: str) -> Dict[str, Any]:
         """Get processing trace for an answer."""
-        answer = self.db.query(AnswerModel).filter(AnswerModel.id == answer_id).first()
+        answer = self.db.get(AnswerModel, answer_id)
         if not answer:
             return {}
         
@@ -1,18 +1,64 @@
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from src.utils.config import get_settings
 
 settings = get_settings()
 
-# Create database engine
+
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver equivalent."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+
+_is_sqlite = "sqlite" in settings.database_url
+
+# Connection pool sizing; SQLite keeps the dialect's default pool
+_pool_args = {} if _is_sqlite else {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_recycle": settings.db_pool_recycle,
+}
+
+# Size of the per-engine compiled SQL cache (SQLAlchemy default is 500)
+QUERY_CACHE_SIZE = 1200
+
+
+def _json_serializer(value) -> str:
+    """orjson-backed serializer for JSON columns (bounding boxes, processing metadata)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON column (de)serialization via orjson instead of the stdlib json module
+_json_args = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
+# Create database engine (single module-level instance, so its compiled
+# statement cache stays warm across requests)
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    query_cache_size=QUERY_CACHE_SIZE,
+    **_json_args,
+    **_pool_args
 )
 
-# Create session factory
+# Create async database engine (used by the async route handlers)
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    query_cache_size=QUERY_CACHE_SIZE,
+    **_json_args,
+    **_pool_args
+)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -27,6 +73,43 @@ def get_db():
         db.close()
 
 
-def init_db():
-    """Initialize database tables."""
-    Base.metadata.create_all(bind=engine)
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def add_missing_indexes(inspector) -> list[str]:
+    """
+    Create indexes declared on existing tables since they were created.
+    Returns the index names created.
+    """
+    added = []
+    for table in Base.metadata.sorted_tables:
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=engine)
+                added.append(index.name)
+    return added
+
+
+def init_db() -> dict[str, list[str]]:
+    """
+    Create missing tables (with their indexes), then the indexes declared on
+    existing tables since they were created. This is the single schema sync
+    path (app startup and init_db.py both use it). Columns are not added to
+    existing tables.
+
+    Returns:
+        Names of the "tables" and "indexes" created
+    """
+    # Register the model tables on Base.metadata (models imports this module)
+    from src.storage.db import models  # noqa: F401
+
+    existing = set(inspect(engine).get_table_names())
+    tables = [name for name in Base.metadata.tables if name not in existing]
+    if tables:
+        Base.metadata.create_all(bind=engine)
+    # Fresh inspector: the first one's cached catalog predates create_all
+    return {"tables": tables, "indexes": add_missing_indexes(inspect(engine))}
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Enum, Table, Text, JSON
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Enum, Table, Text, JSON, Index, LargeBinary, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
+from src.utils.dates import utcnow
 from src.storage.db.database import Base
 from src.models.project import ProjectStatus, ScopeType
 from src.models.answer import AnswerStatus
@@ -31,6 +32,18 @@ class ProjectModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        # Partial index covering the ALL_DOCS invalidation predicate; only
+        # projects that can still be invalidated are indexed.
+        Index(
+            "idx_projects_scope_status",
+            "scope_type",
+            "status",
+            postgresql_where=text("status != 'OUTDATED'"),
+            sqlite_where=text("status != 'OUTDATED'"),
+        ),
+    )
+    
     # Relationships
     sections = relationship("SectionModel", back_populates="project", cascade="all, delete-orphan")
     questions = relationship("QuestionModel", back_populates="project", cascade="all, delete-orphan")
@@ -124,8 +137,16 @@ class DocumentModel(Base):
     error_message = Column(Text, nullable=True)
     page_count = Column(Integer, nullable=True)
     chunk_count = Column(Integer, nullable=True)
-    uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    uploaded_at = Column(DateTime, default=utcnow, nullable=False)
     indexed_at = Column(DateTime, nullable=True)
+    # Celery task of the latest indexing run and when it claimed the document
+    index_task_id = Column(String(255), nullable=True)
+    index_claimed_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Keyset pagination order of list_documents: (uploaded_at, id) DESC
+        Index("idx_documents_uploaded_id", "uploaded_at", "id"),
+    )
     
     # Relationships
     chunks = relationship("ChunkModel", back_populates="document", cascade="all, delete-orphan")
@@ -158,6 +179,10 @@ class GroundTruthModel(Base):
     answer_text = Column(Text, nullable=False)
     source = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Cached evaluation features of answer_text, valid while gt_text_hash matches
+    gt_text_hash = Column(String(32), nullable=True)
+    gt_tokens = Column(JSON, nullable=True)
+    gt_embedding = Column(LargeBinary, nullable=True)  # Unit-normalized float32
 
 
 class EvaluationModel(Base):
@@ -2,8 +2,9 @@
 import logging
 import os
 import pickle
+import threading
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Union
 import numpy as np
 import faiss
 
@@ -40,18 +41,32 @@ class FAISSStore:
         self.index = None
         self.id_map: Dict[int, str] = {}  # FAISS integer ID -> String ID (chunk_id)
         self.reverse_id_map: Dict[str, int] = {}  # String ID -> FAISS integer ID
+        # Stores are shared across threads; serialize writes and reloads
+        self._lock = threading.RLock()
+        self._loaded_mtime: Optional[float] = None
         self._load_or_create_index()
 
+    def _index_mtime(self) -> Optional[float]:
+        """Modification time of the persisted index, or None if not saved yet."""
+        try:
+            return self.index_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
     def _load_or_create_index(self):
         """Load existing index or create a new one."""
         if self.index_path.exists() and self.mapping_path.exists():
             try:
+                # Taken before reading, so a save that lands meanwhile is
+                # picked up by the next reload_if_stale
+                mtime = self._index_mtime()
                 self.index = faiss.read_index(str(self.index_path))
                 with open(self.mapping_path, 'rb') as f:
                     self.id_map = pickle.load(f)
                     
                 # Rebuild reverse map
                 self.reverse_id_map = {v: k for k, v in self.id_map.items()}
+                self._loaded_mtime = mtime
                 
                 logger.info(f"Loaded FAISS index '{self.index_name}' with {self.index.ntotal} vectors")
             except Exception as e:
@@ -62,59 +77,92 @@ class FAISSStore:
 
     def _create_new_index(self):
         """Create a new FAISS index."""
-        # Using IndexFlatL2 for exact search (can be optimized for large datasets)
+        # Brute-force L2 search over scalar-quantized vectors (FP16 by default),
+        # halving index memory and bytes scanned per query versus IndexFlatL2.
+        # Existing indices keep whatever type they were saved with.
         # IDMap allows mapping arbitrary integer IDs, but we manage our own mapping
         # to support string IDs (UUIDs)
-        self.index = faiss.IndexFlatL2(self.dimension)
+        self.index = faiss.index_factory(self.dimension, self.settings.faiss_index_factory, faiss.METRIC_L2)
         self.id_map = {}
         self.reverse_id_map = {}
         logger.info(f"Created new FAISS index '{self.index_name}'")
 
+    def reload_if_stale(self):
+        """
+        Reload from disk if another process has saved the index since it was
+        loaded here. Long-lived (shared) stores use this to pick up vectors
+        added by the indexing workers.
+        """
+        mtime = self._index_mtime()
+        if mtime is None or mtime == self._loaded_mtime:
+            return
+        with self._lock:
+            if self._index_mtime() != self._loaded_mtime:
+                self._load_or_create_index()
+
     def save(self):
-        """Save index and mapping to disk."""
+        """
+        Save index and mapping to disk.
+        Both are written to temporary files and renamed into place, so other
+        processes never load a partially written file. The mapping is
+        replaced first: it only ever gains IDs, and the index's mtime is
+        what tells readers to reload.
+        """
+        index_tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        mapping_tmp = self.mapping_path.with_name(f"{self.mapping_path.name}.{os.getpid()}.tmp")
         try:
-            faiss.write_index(self.index, str(self.index_path))
-            with open(self.mapping_path, 'wb') as f:
+            faiss.write_index(self.index, str(index_tmp))
+            with open(mapping_tmp, 'wb') as f:
                 pickle.dump(self.id_map, f)
+            os.replace(mapping_tmp, self.mapping_path)
+            os.replace(index_tmp, self.index_path)
+            self._loaded_mtime = self._index_mtime()
             logger.info(f"Saved FAISS index '{self.index_name}' to disk")
         except Exception as e:
             logger.error(f"Failed to save index '{self.index_name}': {e}")
+            for tmp in (index_tmp, mapping_tmp):
+                tmp.unlink(missing_ok=True)
             raise IOError(f"Failed to save FAISS index: {e}")
 
-    def add_vectors(self, vectors: List[List[float]], ids: List[str]):
+    def add_vectors(self, vectors: Union[List[List[float]], np.ndarray], ids: List[str]):
         """
         Add vectors to the index.
         
         Args:
-            vectors: List of embedding vectors
+            vectors: Embedding vectors (list or contiguous float32 array, used without copying)
             ids: List of corresponding string IDs (chunk IDs)
         """
         if len(vectors) != len(ids):
             raise ValueError("Number of vectors and IDs must match")
         
-        if not vectors:
+        if len(vectors) == 0:
             return
 
         # Convert to numpy array
-        vectors_np = np.array(vectors).astype('float32')
+        vectors_np = np.ascontiguousarray(vectors, dtype=np.float32)
         
-        # Determine next integer IDs
-        start_id = 0
-        if self.id_map:
-            start_id = max(self.id_map.keys()) + 1
+        with self._lock:
+            # Another process (API or worker) may have saved since this store
+            # loaded; build on its vectors rather than overwriting them
+            self.reload_if_stale()
             
-        new_ids = list(range(start_id, start_id + len(ids)))
-        
-        # Add to index
-        self.index.add(vectors_np)
-        
-        # Update mappings
-        for int_id, str_id in zip(new_ids, ids):
-            self.id_map[int_id] = str_id
-            self.reverse_id_map[str_id] = int_id
+            # Determine next integer IDs
+            start_id = 0
+            if self.id_map:
+                start_id = max(self.id_map.keys()) + 1
+                
+            new_ids = list(range(start_id, start_id + len(ids)))
             
-        # Serialize immediately for persistence
-        self.save()
+            # Add to index
+            self.index.add(vectors_np)
+            
+            # Update mappings
+            for int_id, str_id in zip(new_ids, ids):
+                self.id_map[int_id] = str_id
+                self.reverse_id_map[str_id] = int_id
+                
+            # Serialize immediately for persistence
+            self.save()
         logger.debug(f"Added {len(vectors)} vectors to index '{self.index_name}'")
 
     def search(self, query_vector: List[float], k: int = 5) -> Tuple[List[str], List[float]]:
@@ -128,11 +176,12 @@ class FAISSStore:
         Returns:
             Tuple of (List of IDs, List of distances)
         """
+        self.reload_if_stale()
         if self.index.ntotal == 0:
             return [], []
             
         # Convert to numpy array
-        query_np = np.array([query_vector]).astype('float32')
+        query_np = np.ascontiguousarray([query_vector], dtype=np.float32)
         
         # Search
         distances, indices = self.index.search(query_np, k)
@@ -170,5 +219,6 @@ class FAISSStore:
 
     def clear(self):
         """Clear the entire index."""
-        self._create_new_index()
-        self.save()
+        with self._lock:
+            self._create_new_index()
+            self.save()
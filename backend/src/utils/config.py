@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -7,6 +8,9 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./questionnaire.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 3600
     
     # Celery Broker
     celery_broker_url: str = "sqla+sqlite:///./questionnaire.db"
@@ -15,6 +19,9 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_reload: bool = True
+    # Uvicorn worker processes; in-process caches and startup schema sync assume one
+    api_workers: int = 1
+    openapi_enabled: bool = True
     
     # CORS
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:5173"]
@@ -23,12 +30,38 @@ class Settings(BaseSettings):
     google_api_key: str = ""
     embedding_model: str = "models/gemini-embedding-001"
     embedding_dimension: int = 3072
+    # Persistent embedding cache (SQLite); TTL of 0 keeps entries forever
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "storage/embedding_cache.sqlite3"
+    embedding_cache_ttl_seconds: int = 30 * 24 * 3600
     
     # Document Storage
     upload_dir: str = "storage/documents"
     index_dir: str = "storage/indices"
+    # FAISS index_factory spec for new indices; must not require training
+    # (vectors are added incrementally). "SQfp16" stores vectors at half
+    # precision; use "Flat" for full-precision exact search.
+    faiss_index_factory: str = "SQfp16"
     max_file_size: int = 50 * 1024 * 1024  # 50MB
     allowed_extensions: list[str] = [".pdf", ".docx", ".xlsx", ".pptx"]
+    # PDF text extraction is spread over one shared process pool for
+    # documents of at least this many pages; 0 workers means one per CPU
+    pdf_parallel_min_pages: int = 8
+    pdf_parse_workers: int = 0
+    # An indexing claim older than this is treated as abandoned (worker died
+    # or the task was lost), so the document can be queued again
+    index_claim_ttl_seconds: int = 3600
+    
+    # Answer generation: approximate token budget for retrieved context
+    generation_context_token_budget: int = 6000
+    
+    # Relevance grading shortcuts on retrieval scores (squared L2 distance,
+    # smaller is closer; for unit embeddings d = 2 - 2*cos, so 0.4 ~ cos 0.8).
+    # If every chunk is within the first, grading is skipped. Optionally,
+    # chunks at or beyond the second (e.g. 1.6 ~ cos 0.2) are dropped without
+    # an LLM call; unset, every chunk is graded.
+    grade_skip_max_distance: float = 0.4
+    grade_reject_min_distance: Optional[float] = None
     
     # Chunking Configuration
     chunk_size: int = 1000
@@ -38,12 +71,10 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
@@ -0,0 +1,7 @@
+"""Timestamp helpers for the naive-UTC DateTime columns."""
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """Current UTC time as the naive datetime the DateTime columns store (utcnow is deprecated)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,99 @@
+"""File helpers for persisting uploads."""
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+
+def _disk_fileno(upload: BinaryIO) -> Optional[int]:
+    """
+    Return the OS file descriptor backing an upload if it already lives on
+    disk. In-memory spools return None; calling fileno() on them would force
+    a rollover to disk, defeating the purpose.
+    """
+    if isinstance(upload, tempfile.SpooledTemporaryFile) and not upload._rolled:
+        return None
+    try:
+        return upload.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _sendfile_copy(out_fd: int, src_fd: int, size: int) -> int:
+    """Copy the first size bytes of src_fd to out_fd in-kernel; returns bytes copied."""
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(out_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def sendfile_upload(upload: BinaryIO, dest: Path) -> bool:
+    """
+    Copy a disk-backed upload to dest with an in-kernel sendfile(2) copy.
+
+    Returns:
+        True if the file was written, False if the upload is not disk-backed
+        or the platform lacks os.sendfile (callers fall back to a chunked copy)
+    """
+    if not hasattr(os, "sendfile"):
+        return False
+    src_fd = _disk_fileno(upload)
+    if src_fd is None:
+        return False
+
+    with open(dest, "wb") as out:
+        _sendfile_copy(out.fileno(), src_fd, os.fstat(src_fd).st_size)
+    return True
+
+
+# Read size for the chunked (non-sendfile) copy path
+COPY_CHUNK_SIZE = 1 << 20
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+def save_upload_capped(upload: BinaryIO, dest: Path, max_bytes: int) -> int:
+    """
+    Persist an upload to a new file at dest, refusing anything over max_bytes.
+
+    Disk-backed uploads are size-checked up front and copied with sendfile(2);
+    in-memory ones are streamed in chunks and abandoned as soon as the limit
+    is crossed, so at most max_bytes are ever written. dest is created
+    exclusively (never overwriting another upload) and removed on failure.
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        UploadTooLarge: If the upload exceeds max_bytes
+        FileExistsError: If dest already exists
+    """
+    src_fd = _disk_fileno(upload) if hasattr(os, "sendfile") else None
+    size = 0
+    if src_fd is not None:
+        size = os.fstat(src_fd).st_size
+        if size > max_bytes:
+            raise UploadTooLarge(f"File too large: {size} bytes (max {max_bytes})")
+
+    fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    total = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            if src_fd is not None:
+                total = _sendfile_copy(out.fileno(), src_fd, size)
+            else:
+                while chunk := upload.read(COPY_CHUNK_SIZE):
+                    total += len(chunk)
+                    if total > max_bytes:
+                        raise UploadTooLarge(f"File too large: more than {max_bytes} bytes")
+                    out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return total
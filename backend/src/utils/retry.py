@@ -0,0 +1,95 @@
+"""Shared retry policy for Gemini API calls (rate limits and transient outages)."""
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: 429 (quota / rate limit) and 503
+RETRYABLE_ERRORS = (ResourceExhausted, ServiceUnavailable)
+MAX_ATTEMPTS = 5
+# Longest server-requested delay honored before an attempt
+MAX_RETRY_AFTER = 60.0
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+# "<call site>.rate_limited" (retryable failures) and "<call site>.retries"
+# (attempts repeated) per process, so rate limit hotspots surface
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def retry_stats() -> Dict[str, int]:
+    """Snapshot of the retry counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Server-requested delay carried by an API error, if any: an HTTP
+    Retry-After header, or the RetryInfo detail of a gRPC error.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("Retry-After")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    for detail in getattr(exc, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Jittered exponential backoff, stretched to any server-requested delay."""
+    backoff = _backoff(retry_state)
+    hint = retry_after_seconds(retry_state.outcome.exception())
+    if hint is None:
+        return backoff
+    return max(backoff, min(hint, MAX_RETRY_AFTER))
+
+
+def gemini_retry(name: str):
+    """
+    Decorator retrying a Gemini call site (sync or async) on rate limit and
+    unavailability errors; the last error is re-raised once attempts run out.
+    """
+    def _after(retry_state: RetryCallState) -> None:
+        _count(f"{name}.rate_limited")
+
+    def _before_sleep(retry_state: RetryCallState) -> None:
+        _count(f"{name}.retries")
+        logger.warning(
+            f"{name}: attempt {retry_state.attempt_number} failed "
+            f"({retry_state.outcome.exception()!r}); retrying in {retry_state.next_action.sleep:.1f}s"
+        )
+
+    return retry(
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        wait=_wait,
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        after=_after,
+        before_sleep=_before_sleep,
+        reraise=True,
+    )
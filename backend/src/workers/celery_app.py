@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 from src.utils.config import get_settings
 
 settings = get_settings()
@@ -19,8 +20,22 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
+    result_expires=86400,  # purge stored task results after 1 day
     task_time_limit=3600,  # 1 hour
     task_soft_time_limit=3300,  # 55 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # Indexing (I/O-bound embedding calls) and questionnaire parsing (CPU-bound)
+    # get their own queues so each can be served by a suitably sized worker pool.
+    # Index tasks are cheap to re-run, so their queue is not durable.
+    task_default_queue="celery",
+    task_queues=(
+        Queue("celery"),
+        Queue("index", durable=False),
+        Queue("parse"),
+    ),
+    task_routes={
+        "tasks.index_document": {"queue": "index"},
+        "tasks.parse_questionnaire": {"queue": "parse"},
+    },
 )
@@ -10,6 +10,7 @@ if project_root not in sys.path:
     sys.path.append(str(Path(__file__).parent.parent))
 
 import logging
+from dataclasses import asdict
 from typing import List
 from sqlalchemy.orm import Session
 from src.storage.db.database import SessionLocal
@@ -43,19 +44,12 @@ def chat():
             
             # Initial state for arbitrary terminal question
             # We don't have a question_id/project_id here, but we can still run the graph
-            state: AgentState = {
-                "question": question,
-                "project_id": "terminal-test",
-                "document_ids": None, # Search all
-                "documents": [],
-                "generation": None,
-                "is_answerable": True,
-                "confidence_score": 0.0,
-                "retries": 0,
-                "max_retries": 1,
-                "errors": [],
-                "steps": []
-            }
+            state = asdict(AgentState(
+                question=question,
+                project_id="terminal-test",
+                document_ids=None, # Search all
+                max_retries=1
+            ))
             
             final_state = graph.invoke(state)
             
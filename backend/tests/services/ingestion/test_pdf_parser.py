@@ -0,0 +1,65 @@
+"""
+Unit tests for parallel PDF page extraction.
+"""
+import threading
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+try:
+    from src.services.ingestion.parsers import pdf
+    from src.services.ingestion.parsers.pdf import PDFParser
+    from src.utils.config import get_settings
+except ImportError:
+    import sys
+    sys.path.append("backend")
+    from src.services.ingestion.parsers import pdf
+    from src.services.ingestion.parsers.pdf import PDFParser
+    from src.utils.config import get_settings
+
+PAGE_COUNT = 12
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "report.pdf"
+    doc = fitz.open()
+    for i in range(PAGE_COUNT):
+        doc.new_page().insert_text((72, 72), f"Page number {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings().model_copy(update={"pdf_parallel_min_pages": 4, "pdf_parse_workers": 2})
+    monkeypatch.setattr(pdf, "get_settings", lambda: settings)
+    return settings
+
+
+def test_parallel_extraction_keeps_page_order(pdf_path, settings):
+    pages = PDFParser()._extract_parallel(pdf_path, PAGE_COUNT)
+    assert [page.page_number for page in pages] == list(range(1, PAGE_COUNT + 1))
+    assert all(page.text.strip() == f"Page number {page.page_number}" for page in pages)
+    # The pool is kept for the next document
+    assert pdf._get_pool(2) is pdf._get_pool(2)
+
+
+def test_no_pool_off_the_main_thread(pdf_path, settings):
+    """Threads pool workers extract sequentially."""
+    results = []
+    with patch.object(pdf, "_get_pool") as get_pool:
+        thread = threading.Thread(target=lambda: results.append(PDFParser()._extract_parallel(pdf_path, PAGE_COUNT)))
+        thread.start()
+        thread.join()
+    assert results == [None]
+    get_pool.assert_not_called()
+
+
+def test_parse_matches_sequential_extraction(pdf_path, settings):
+    parallel = PDFParser().parse(pdf_path)
+    with patch.object(PDFParser, "_extract_parallel", return_value=None):
+        sequential = PDFParser().parse(pdf_path)
+    assert parallel.page_texts == sequential.page_texts
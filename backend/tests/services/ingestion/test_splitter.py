@@ -0,0 +1,176 @@
+"""
+Unit tests for the semantic text splitter.
+"""
+import random
+import pytest
+
+try:
+    from src.services.ingestion.chunking.splitter import SemanticTextSplitter
+    from src.services.ingestion.chunking.config import ChunkingConfig, DocumentTypeConfig
+    from src.services.ingestion.parsers.base import PageResult
+except ImportError:
+    import sys
+    sys.path.append("backend")
+    from src.services.ingestion.chunking.splitter import SemanticTextSplitter
+    from src.services.ingestion.chunking.config import ChunkingConfig, DocumentTypeConfig
+    from src.services.ingestion.parsers.base import PageResult
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu".split()
+
+# Text pieces weighted towards prose, with separators of every kind, runs of
+# whitespace and segments too long for any chunk
+FUZZ_PIECES = ["a", "bb", "word", "x" * 40, "y" * 700, "z" * 2500, ". ", ", ", " ", "  ",
+               "\n", "\n\n", "\n\n\n", " \n ", "\t", "é", ".", ","]
+FUZZ_WEIGHTS = [20, 20, 20, 3, 1, 0.3, 6, 5, 30, 3, 5, 3, 1, 1, 1, 2, 2, 2]
+
+CONFIGS = [
+    DocumentTypeConfig.get_config("pdf"),
+    DocumentTypeConfig.get_config("pptx"),
+    ChunkingConfig(chunk_size=100, chunk_overlap=0, min_chunk_size=50),
+    ChunkingConfig(chunk_size=150, chunk_overlap=149, min_chunk_size=50),
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 18)))
+    if rng.random() < 0.3:
+        words += ", " + " ".join(rng.choice(WORDS) for _ in range(5))
+    return words.capitalize() + "."
+
+
+def _document(rng: random.Random) -> str:
+    """Prose with paragraphs and line breaks of varying length."""
+    paragraphs = []
+    for _ in range(rng.randint(3, 25)):
+        lines = [" ".join(_sentence(rng) for _ in range(rng.randint(1, 8))) for _ in range(rng.randint(1, 3))]
+        paragraphs.append("\n".join(lines))
+    return "\n\n".join(paragraphs)
+
+
+def _fuzz_text(rng: random.Random) -> str:
+    return "".join(rng.choices(FUZZ_PIECES, FUZZ_WEIGHTS, k=rng.randint(1, 800)))
+
+
+def _splitters(config: ChunkingConfig):
+    return (
+        SemanticTextSplitter(config),
+        SemanticTextSplitter(config.model_copy(update={"use_langchain": True})),
+    )
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_matches_langchain_on_prose(config):
+    fast, reference = _splitters(config)
+    rng = random.Random(1)
+    for _ in range(50):
+        text = _document(rng)
+        assert fast._split_fast(text) == reference.splitter.split_text(text)
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_matches_langchain_on_irregular_text(config):
+    """Whitespace runs, bare punctuation and over-long segments."""
+    fast, reference = _splitters(config)
+    rng = random.Random(7)
+    for _ in range(200):
+        text = _fuzz_text(rng)
+        assert fast._split_fast(text) == reference.splitter.split_text(text)
+
+
+def test_split_text_matches_langchain_metadata():
+    fast, reference = _splitters(DocumentTypeConfig.get_config("pdf"))
+    text = _document(random.Random(3))
+    fast_chunks = fast.split_text(text, page_number=4, source_document="a.pdf")
+    reference_chunks = reference.split_text(text, page_number=4, source_document="a.pdf")
+    assert fast_chunks == reference_chunks
+
+
+def test_short_text_is_one_chunk():
+    splitter = SemanticTextSplitter(ChunkingConfig())
+    text = "Revenue grew 12% year over year, driven by new customers. " * 3
+    chunks = splitter.split_text(text)
+    assert [c.text for c in chunks] == [text.strip()]
+
+
+def test_blank_text_has_no_chunks():
+    splitter = SemanticTextSplitter(ChunkingConfig())
+    assert splitter.split_text("") == []
+    assert splitter.split_text(" \n\n\t ") == []
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_chunks_fit_chunk_size(config):
+    splitter = SemanticTextSplitter(config)
+    rng = random.Random(11)
+    for _ in range(50):
+        for chunk in splitter._split_fast(_document(rng)):
+            assert len(chunk) <= config.chunk_size
+
+
+def test_chunks_end_on_paragraph_boundaries():
+    """Paragraphs that fit are never cut; each chunk holds whole paragraphs."""
+    paragraph = "Sentence one is here. Sentence two follows it. " * 4
+    paragraphs = [f"{i} {paragraph.strip()}" for i in range(10)]
+    splitter = SemanticTextSplitter(ChunkingConfig(chunk_size=500, chunk_overlap=0))
+    chunks = splitter._split_fast("\n\n".join(paragraphs))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert all(part in paragraphs for part in chunk.split("\n\n"))
+
+
+def test_consecutive_chunks_overlap():
+    text = " ".join(f"Sentence number {i} ends here." for i in range(60))
+    config = ChunkingConfig(chunk_size=200, chunk_overlap=60)
+    chunks = SemanticTextSplitter(config)._split_fast(text)
+    assert len(chunks) > 2
+    for previous, current in zip(chunks, chunks[1:]):
+        # The next chunk repeats the tail of the previous one
+        head = current.split(". ")[0]
+        assert head in previous
+        assert len(head) <= config.chunk_overlap
+
+
+def test_no_overlap_when_disabled():
+    text = " ".join(f"Sentence number {i} ends here." for i in range(60))
+    chunks = SemanticTextSplitter(ChunkingConfig(chunk_size=200, chunk_overlap=0))._split_fast(text)
+    assert len(chunks) > 2
+    # Chunks appear in order without repeating any text
+    position = 0
+    for chunk in chunks:
+        found = text.find(chunk, position)
+        assert found >= position
+        position = found + len(chunk)
+
+
+def test_over_long_segment_is_cut_at_chunk_size():
+    """A segment with no separator at all is cut into chunk_size pieces."""
+    text = "x" * 2500
+    chunks = SemanticTextSplitter(ChunkingConfig(chunk_size=1000, chunk_overlap=0))._split_fast(text)
+    assert chunks == ["x" * 1000, "x" * 1000, "x" * 500]
+
+
+def test_over_long_segment_between_paragraphs():
+    """Paragraphs around an over-long segment are chunked on their own."""
+    before, after = "Intro paragraph.", "Closing paragraph."
+    text = f"{before}\n\n{'x' * 1500}\n\n{after}"
+    chunks = SemanticTextSplitter(ChunkingConfig(chunk_size=1000, chunk_overlap=0))._split_fast(text)
+    assert chunks[0] == before
+    assert chunks[-1] == after
+    assert "".join(chunks[1:-1]) == "x" * 1500
+
+
+def test_small_chunks_are_dropped():
+    config = ChunkingConfig(chunk_size=200, chunk_overlap=0, min_chunk_size=100)
+    # The paragraph is over chunk_size, so "Tiny." can't be packed with it
+    text = "Tiny.\n\n" + "A long enough paragraph of text. " * 8
+    chunks = SemanticTextSplitter(config).split_text(text)
+    assert all(len(c.text) >= config.min_chunk_size for c in chunks)
+    assert all("Tiny." not in c.text for c in chunks)
+
+
+def test_split_page_numbers_chunks_from_offset():
+    splitter = SemanticTextSplitter(ChunkingConfig(chunk_size=200, chunk_overlap=0))
+    page = PageResult(page_number=3, text="A long enough paragraph of text. " * 20)
+    chunks = splitter.split_page(page, first_chunk_index=10, source_document="a.pdf")
+    assert [c.metadata.chunk_index for c in chunks] == list(range(10, 10 + len(chunks)))
+    assert all(c.metadata.page_number == 3 for c in chunks)
@@ -10,13 +10,14 @@ if backend_dir not in sys.path:
 import pytest
 from unittest.mock import MagicMock, patch
 from src.services.agent.nodes.generate import generate_node, GeneratedResponse
+from src.services.agent.state import AgentState
 from src.services.agent.nodes.hallucination import hallucination_node, HallucinationResult
 from src.services.retrieval import RetrievedChunk
 
 @pytest.fixture
 def mock_llm_service():
-    with patch("src.services.agent.nodes.generate.LLMService") as mock_gen, \
-         patch("src.services.agent.nodes.hallucination.LLMService") as mock_hall:
+    with patch("src.services.agent.nodes.generate.get_llm") as mock_gen, \
+         patch("src.services.agent.nodes.hallucination.get_llm") as mock_hall:
         yield mock_gen, mock_hall
 
 def test_generate_node_unanswerable(mock_llm_service):
@@ -31,13 +32,13 @@ def test_generate_node_unanswerable(mock_llm_service):
         cited_indices=[]
     )
     
-    state = {
-        "question": "What is the secret code?",
-        "documents": [
+    state = AgentState(
+        question="What is the secret code?",
+        documents=[
             RetrievedChunk(id="1", text="Public info", score=0.9, document_id="doc1", filename="f1.pdf")
         ],
-        "steps": []
-    }
+        steps=[]
+    )
     
     result = generate_node(state)
     
@@ -57,13 +58,13 @@ def test_generate_node_successful(mock_llm_service):
         cited_indices=[1]
     )
     
-    state = {
-        "question": "What is the answer?",
-        "documents": [
+    state = AgentState(
+        question="What is the answer?",
+        documents=[
             RetrievedChunk(id="1", text="The answer is 42.", score=0.99, document_id="doc1", filename="f1.pdf")
         ],
-        "steps": []
-    }
+        steps=[]
+    )
     
     result = generate_node(state)
     
@@ -79,14 +80,15 @@ def test_hallucination_node_positive(mock_llm_service):
     # Mock LLM saying it's grounded
     mock_instance.generate_structured.return_value = HallucinationResult(binary_score="yes")
     
-    state = {
-        "generation": "The answer is 42.",
-        "documents": [
+    state = AgentState(
+        question="What is the answer?",
+        generation="The answer is 42.",
+        documents=[
             RetrievedChunk(id="1", text="The answer is 42.", score=0.99, document_id="doc1", filename="f1.pdf")
         ],
-        "steps": [],
-        "retries": 0
-    }
+        steps=[],
+        retries=0
+    )
     
     result = hallucination_node(state)
     
@@ -100,14 +102,15 @@ def test_hallucination_node_negative(mock_llm_service):
     # Mock LLM saying it's NOT grounded
     mock_instance.generate_structured.return_value = HallucinationResult(binary_score="no")
     
-    state = {
-        "generation": "The answer is 99.",
-        "documents": [
+    state = AgentState(
+        question="What is the answer?",
+        generation="The answer is 99.",
+        documents=[
             RetrievedChunk(id="1", text="The answer is 42.", score=0.99, document_id="doc1", filename="f1.pdf")
         ],
-        "steps": [],
-        "retries": 0
-    }
+        steps=[],
+        retries=0
+    )
     
     result = hallucination_node(state)
     
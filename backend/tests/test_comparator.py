@@ -0,0 +1,60 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from src.services.evaluation.comparator import AnswerComparator
+
+
+@pytest.fixture
+def comparator():
+    """Comparator with a fake embedding service and judge."""
+    comparator = AnswerComparator.__new__(AnswerComparator)
+    comparator.embedding_service = MagicMock()
+    comparator.embedding_service.generate_embeddings_batch.side_effect = (
+        lambda texts: [np.array([1.0, 0.0], dtype=np.float32)] * len(texts)
+    )
+    comparator.judge = MagicMock()
+    comparator.judge.evaluate_answer.return_value = SimpleNamespace(overall_score=0.5, explanation="ok")
+    return comparator
+
+
+def _compare(comparator, **kwargs):
+    return comparator.compare_answers("Q?", "revenue grew", "revenue grew", uuid4(), **kwargs)
+
+
+def test_sync_and_async_comparisons_agree(comparator):
+    sync_metrics = _compare(comparator).metrics
+    async_metrics = asyncio.run(
+        comparator.acompare_answers("Q?", "revenue grew", "revenue grew", uuid4())
+    ).metrics
+    assert sync_metrics == async_metrics
+    assert sync_metrics.semantic_similarity == pytest.approx(1.0)
+    assert sync_metrics.keyword_overlap == pytest.approx(1.0)
+
+
+def test_compare_answers_inside_running_loop(comparator):
+    """The sync path doesn't start its own event loop."""
+    async def caller():
+        return _compare(comparator)
+
+    assert asyncio.run(caller()).metrics.agentic_score == 0.5
+
+
+def test_failed_embedding_scores_zero_similarity(comparator):
+    comparator.embedding_service.generate_embeddings_batch.side_effect = RuntimeError("quota")
+    assert _compare(comparator).metrics.semantic_similarity == 0.0
+
+
+def test_precomputed_human_embedding_is_not_re_embedded(comparator):
+    _compare(comparator, human_embedding=np.array([1.0, 0.0], dtype=np.float32))
+    comparator.embedding_service.generate_embeddings_batch.assert_called_once_with(["revenue grew"])
@@ -0,0 +1,94 @@
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.models.document import DocumentStatus
+from src.services.document_service import DocumentService
+from src.utils.dates import utcnow
+from src.storage.db.database import Base
+from src.storage.db.models import DocumentModel
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh in-memory database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def document(db):
+    doc = DocumentModel(
+        filename="report.pdf",
+        file_type=".pdf",
+        file_path="/tmp/report.pdf",
+        file_size=1024,
+        status=DocumentStatus.UPLOADED
+    )
+    db.add(doc)
+    db.commit()
+    return doc
+
+
+def test_claim_is_exclusive(db, document):
+    """A document can only be claimed once while its run is in flight."""
+    service = DocumentService(db)
+    assert service.claim_for_indexing(document.id)
+    assert not service.claim_for_indexing(document.id)
+
+    db.refresh(document)
+    assert document.status == DocumentStatus.INDEXING
+    assert document.index_claimed_at is not None
+
+
+def test_claim_of_missing_document(db):
+    """Claiming an unknown document fails without raising."""
+    service = DocumentService(db)
+    assert not service.claim_for_indexing("00000000-0000-0000-0000-000000000000")
+
+
+def test_claim_released_when_run_finishes(db, document):
+    """READY and ERROR both release the claim."""
+    service = DocumentService(db)
+    assert service.claim_for_indexing(document.id)
+    service.update_status(document.id, DocumentStatus.READY)
+    assert service.claim_for_indexing(document.id)
+    service.update_status(document.id, DocumentStatus.ERROR, "boom")
+    assert service.claim_for_indexing(document.id)
+
+
+def test_expired_claim_can_be_retaken(db, document):
+    """A claim left behind by a dead worker expires after the TTL."""
+    service = DocumentService(db)
+    assert service.claim_for_indexing(document.id)
+
+    ttl = service.settings.index_claim_ttl_seconds
+    document.index_claimed_at = utcnow() - timedelta(seconds=ttl + 1)
+    db.commit()
+    assert service.claim_for_indexing(document.id)
+
+
+def test_task_id_kept_on_row(db, document):
+    """The queued task id is stored on the document and reset by a new claim."""
+    service = DocumentService(db)
+    assert service.claim_for_indexing(document.id)
+    service.set_index_task(document.id, "task-1")
+    db.refresh(document)
+    assert document.index_task_id == "task-1"
+
+    service.update_status(document.id, DocumentStatus.READY)
+    assert service.claim_for_indexing(document.id)
+    db.refresh(document)
+    assert document.index_task_id is None
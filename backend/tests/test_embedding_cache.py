@@ -0,0 +1,45 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import numpy as np
+import pytest
+from src.services.embedding_cache import EmbeddingCacheService
+
+
+def _tables(path):
+    with sqlite3.connect(path) as conn:
+        return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_unit_vectors_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    vector = np.random.default_rng(0).standard_normal(64).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+    key = EmbeddingCacheService.make_key("model", "text")
+
+    EmbeddingCacheService(path).put(key, vector.tolist())
+    cached = EmbeddingCacheService(path).get(key)
+
+    assert np.linalg.norm(cached) == pytest.approx(1.0, abs=1e-6)
+    assert np.dot(cached, vector) > 0.999
+
+
+def test_legacy_table_is_dropped_only_once(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE embeddings (key BLOB PRIMARY KEY, vector BLOB)")
+
+    EmbeddingCacheService(path)
+    assert _tables(path) == {"embeddings_i8"}
+
+    # Anything created after the upgrade is left alone on later opens
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE embeddings (key BLOB PRIMARY KEY, vector BLOB)")
+    EmbeddingCacheService(path)
+    assert _tables(path) == {"embeddings", "embeddings_i8"}
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import numpy as np
+import pytest
+from src.storage import faiss_store
+from src.storage.faiss_store import FAISSStore
+from src.utils.config import get_settings
+
+DIMENSION = 8
+
+
+@pytest.fixture(autouse=True)
+def index_dir(tmp_path, monkeypatch):
+    settings = get_settings().model_copy(update={"index_dir": str(tmp_path)})
+    monkeypatch.setattr(faiss_store, "get_settings", lambda: settings)
+    return tmp_path
+
+
+def _vectors(n, seed):
+    return np.random.default_rng(seed).random((n, DIMENSION), dtype=np.float32)
+
+
+def test_stores_in_two_processes_keep_each_others_vectors():
+    """Two long-lived stores on one index (API and worker) both append."""
+    api, worker = FAISSStore("semantic", DIMENSION), FAISSStore("semantic", DIMENSION)
+    api.add_vectors(_vectors(2, 0), ["a0", "a1"])
+    worker.add_vectors(_vectors(3, 1), ["w0", "w1", "w2"])
+
+    reloaded = FAISSStore("semantic", DIMENSION)
+    assert reloaded.index.ntotal == 5
+    assert sorted(reloaded.id_map.values()) == ["a0", "a1", "w0", "w1", "w2"]
+    assert sorted(reloaded.id_map) == list(range(5))
+
+
+def test_save_leaves_no_temporary_files(index_dir):
+    FAISSStore("semantic", DIMENSION).add_vectors(_vectors(1, 0), ["a0"])
+    assert sorted(p.name for p in index_dir.iterdir()) == ["semantic.index", "semantic_mapping.pkl"]
+
+
+def test_search_sees_vectors_saved_elsewhere():
+    reader, writer = FAISSStore("semantic", DIMENSION), FAISSStore("semantic", DIMENSION)
+    vectors = _vectors(2, 0)
+    writer.add_vectors(vectors, ["a0", "a1"])
+    ids, _ = reader.search(vectors[1].tolist(), k=1)
+    assert ids == ["a1"]
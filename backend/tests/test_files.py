@@ -0,0 +1,79 @@
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from src.utils import files
+from src.utils.files import UploadTooLarge, save_upload_capped, sendfile_upload
+
+DATA = bytes(range(256)) * 40  # 10 KB
+
+
+def _in_memory_upload(data: bytes = DATA):
+    """Upload still held in memory, like a small Starlette UploadFile."""
+    upload = tempfile.SpooledTemporaryFile(max_size=len(data) + 1)
+    upload.write(data)
+    upload.seek(0)
+    assert not upload._rolled
+    return upload
+
+
+def _disk_upload(data: bytes = DATA):
+    """Upload already spooled to disk."""
+    upload = tempfile.SpooledTemporaryFile(max_size=1)
+    upload.write(data)
+    upload.seek(0)
+    assert upload._rolled
+    return upload
+
+
+@pytest.mark.parametrize("make_upload", [_in_memory_upload, _disk_upload, lambda: io.BytesIO(DATA)])
+def test_saves_upload_within_limit(tmp_path, make_upload):
+    dest = tmp_path / "upload.bin"
+    assert save_upload_capped(make_upload(), dest, len(DATA)) == len(DATA)
+    assert dest.read_bytes() == DATA
+
+
+def test_oversized_in_memory_upload_is_rejected(tmp_path):
+    dest = tmp_path / "upload.bin"
+    with pytest.raises(UploadTooLarge):
+        save_upload_capped(_in_memory_upload(), dest, len(DATA) - 1)
+    assert not dest.exists()
+
+
+def test_oversized_disk_upload_is_rejected_before_writing(tmp_path):
+    dest = tmp_path / "upload.bin"
+    with pytest.raises(UploadTooLarge):
+        save_upload_capped(_disk_upload(), dest, len(DATA) - 1)
+    assert not dest.exists()
+
+
+def test_partial_file_removed_when_limit_crossed(tmp_path, monkeypatch):
+    """Chunks written before the limit was crossed don't leave a file behind."""
+    monkeypatch.setattr(files, "COPY_CHUNK_SIZE", 1024)
+    dest = tmp_path / "upload.bin"
+    with pytest.raises(UploadTooLarge):
+        save_upload_capped(_in_memory_upload(), dest, 4096)
+    assert not dest.exists()
+
+
+def test_existing_file_is_not_overwritten(tmp_path):
+    dest = tmp_path / "upload.bin"
+    dest.write_bytes(b"keep")
+    with pytest.raises(FileExistsError):
+        save_upload_capped(_in_memory_upload(), dest, len(DATA))
+    assert dest.read_bytes() == b"keep"
+
+
+def test_sendfile_upload_copies_disk_uploads_only(tmp_path):
+    dest = tmp_path / "upload.bin"
+    assert not sendfile_upload(_in_memory_upload(), dest)
+    assert not dest.exists()
+    if sendfile_upload(_disk_upload(), dest):
+        assert dest.read_bytes() == DATA
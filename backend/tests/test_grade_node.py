@@ -0,0 +1,147 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from unittest.mock import patch
+from src.services.agent.nodes.grade import (
+    grade_node,
+    BatchGradeResult,
+    GradeResult,
+    GRADE_ADAPTER,
+)
+from src.services.agent.state import AgentState
+from src.services.llm_service import LLMService
+from src.services.retrieval import RetrievedChunk
+from src.utils.config import get_settings
+
+
+def _state(*scores):
+    """State with one retrieved chunk per score, none close enough to skip grading."""
+    return AgentState(
+        question="What is the revenue?",
+        documents=[
+            RetrievedChunk(id=str(i), text=f"chunk {i}", score=score, document_id="doc1", filename="f1.pdf")
+            for i, score in enumerate(scores)
+        ],
+        steps=[]
+    )
+
+
+@pytest.fixture
+def mock_llm():
+    with patch("src.services.agent.nodes.grade.get_llm") as mock_get_llm:
+        yield mock_get_llm.return_value
+
+
+def test_batch_grade_filters_documents(mock_llm):
+    mock_llm.generate_structured.return_value = BatchGradeResult(scores=["yes", "no"])
+
+    result = grade_node(_state(0.8, 0.9))
+
+    assert [d.id for d in result["documents"]] == ["0"]
+    mock_llm.generate_structured_many.assert_not_called()
+
+
+def test_batch_grade_miscount_falls_back_to_individual_grades(mock_llm):
+    """A wrong number of batch scores regrades each document on its own."""
+    mock_llm.generate_structured.return_value = BatchGradeResult(scores=["yes"])
+    mock_llm.generate_structured_many.return_value = [
+        GradeResult(binary_score="no"),
+        GradeResult(binary_score="Yes"),
+        GradeResult(binary_score="yes"),
+    ]
+
+    result = grade_node(_state(0.8, 0.9, 1.0))
+
+    assert [d.id for d in result["documents"]] == ["1", "2"]
+    prompts, adapter = mock_llm.generate_structured_many.call_args.args
+    assert len(prompts) == 3
+    assert adapter is GRADE_ADAPTER
+
+
+def test_distant_documents_are_graded_by_default(mock_llm):
+    mock_llm.generate_structured.return_value = BatchGradeResult(scores=["yes", "yes"])
+
+    result = grade_node(_state(0.8, 1.9))
+
+    assert [d.id for d in result["documents"]] == ["0", "1"]
+
+
+@pytest.mark.parametrize("score,kept", [(1.59, True), (1.6, False), (1.61, False)])
+def test_reject_distance_drops_documents_at_or_beyond_it(mock_llm, score, kept):
+    settings = get_settings().model_copy(update={"grade_reject_min_distance": 1.6})
+    mock_llm.generate_structured.return_value = BatchGradeResult(scores=["yes"] * (2 if kept else 1))
+
+    with patch("src.services.agent.nodes.grade.get_settings", return_value=settings):
+        result = grade_node(_state(0.8, score))
+
+    assert [d.id for d in result["documents"]] == (["0", "1"] if kept else ["0"])
+
+
+def _llm_service():
+    """LLMService without a configured Gemini client (calls are patched)."""
+    return LLMService.__new__(LLMService)
+
+
+def test_generate_structured_many_keeps_prompt_order():
+    service = _llm_service()
+    threads = set()
+
+    def fake_generate(prompt, response_model, temperature=0.0, cache=False):
+        threads.add(threading.current_thread().name)
+        return GradeResult(binary_score=prompt)
+
+    with patch.object(LLMService, "generate_structured", side_effect=fake_generate):
+        results = service.generate_structured_many([str(i) for i in range(20)], GRADE_ADAPTER, max_concurrency=4)
+
+    assert [r.binary_score for r in results] == [str(i) for i in range(20)]
+    assert all(name.startswith("llm") for name in threads)
+
+
+def test_generate_structured_many_inside_running_loop():
+    """Callable from code already running in an event loop (no asyncio.run)."""
+    service = _llm_service()
+
+    async def caller():
+        return service.generate_structured_many(["a", "b"], GRADE_ADAPTER)
+
+    with patch.object(
+        LLMService,
+        "generate_structured",
+        side_effect=lambda prompt, *args, **kwargs: GradeResult(binary_score=prompt)
+    ):
+        results = asyncio.run(caller())
+        # A second run on a fresh loop must work just as well
+        results += asyncio.run(caller())
+
+    assert [r.binary_score for r in results] == ["a", "b", "a", "b"]
+
+
+def test_generate_structured_many_without_prompts():
+    assert _llm_service().generate_structured_many([], GRADE_ADAPTER) == []
+
+
+def test_generate_text_many_keeps_prompt_order():
+    service = _llm_service()
+
+    def fake_generate(prompt, temperature=0.0):
+        # Later prompts finish first, so order can't come from completion order
+        time.sleep(0.001 * (20 - int(prompt)))
+        return f"answer {prompt}"
+
+    with patch.object(LLMService, "generate_text", side_effect=fake_generate):
+        results = service.generate_text_many([str(i) for i in range(20)], max_concurrency=8)
+
+    assert results == [f"answer {i}" for i in range(20)]
+
+
+def test_generate_text_many_without_prompts():
+    assert _llm_service().generate_text_many([]) == []
@@ -0,0 +1,126 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from src.api.routes import documents, projects
+from src.models.document import DocumentStatus
+from src.storage.db.database import Base, get_async_db
+from src.storage.db.models import DocumentModel, ProjectModel
+from src.utils.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2026, 3, 4, 5, 6, 7, 891011)
+    cursor = encode_cursor(timestamp, "abc-123")
+    assert decode_cursor(cursor) == (timestamp, "abc-123")
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(BASE_TIME, "id/with+chars|and pipe")
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+    assert decode_cursor(cursor) == (BASE_TIME, "id/with+chars|and pipe")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(BASE_TIME, "x")[:-6] + "!!!!"])
+def test_malformed_cursor_raises(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """Fresh database with 5 projects and 5 documents, one minute apart."""
+    url = f"sqlite:///{tmp_path / 'pages.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        for i in range(5):
+            db.add(ProjectModel(name=f"project {i}", created_at=BASE_TIME + timedelta(minutes=i)))
+            db.add(DocumentModel(
+                filename=f"doc{i}.pdf",
+                file_type=".pdf",
+                file_path=f"/tmp/doc{i}.pdf",
+                file_size=1,
+                status=DocumentStatus.UPLOADED,
+                uploaded_at=BASE_TIME + timedelta(minutes=i)
+            ))
+        db.commit()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def client(db_url):
+    async_engine = create_async_engine(db_url.replace("sqlite:", "sqlite+aiosqlite:", 1))
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.include_router(documents.router)
+    app.dependency_overrides[get_async_db] = override_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _walk(client, path, limit):
+    """Follow next_cursor from the first page; returns the pages' item lists."""
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(path, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        pages.append(body["items"])
+        cursor = body.get("next_cursor")
+        if not cursor:
+            return pages
+
+
+@pytest.mark.parametrize("path,name_key,name", [
+    ("/list-projects", "name", "project {}"),
+    ("/documents", "filename", "doc{}.pdf"),
+])
+def test_pages_walk_newest_first(client, path, name_key, name):
+    pages = _walk(client, path, limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    names = [item[name_key] for page in pages for item in page]
+    assert names == [name.format(i) for i in range(4, -1, -1)]
+
+
+@pytest.mark.parametrize("path", ["/list-projects", "/documents"])
+def test_exact_multiple_ends_with_empty_page(client, path):
+    """A full last page still carries a cursor; the page after it is empty."""
+    pages = _walk(client, path, limit=5)
+    assert [len(page) for page in pages] == [5, 0]
+
+
+@pytest.mark.parametrize("path", ["/list-projects", "/documents"])
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+def test_out_of_range_limit_is_rejected(client, path, limit):
+    response = client.get(path, params={"limit": limit})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize("path", ["/list-projects", "/documents"])
+def test_malformed_cursor_is_400(client, path):
+    response = client.get(path, params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
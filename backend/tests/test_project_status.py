@@ -0,0 +1,109 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from src.api.routes import projects
+from src.models.project import ProjectStatus
+from src.storage.db.database import Base, get_async_db
+from src.storage.db.models import ProjectModel
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'status.db'}"
+
+
+@pytest.fixture
+def project_id(db_url):
+    """A DRAFT project in a fresh database."""
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        project = ProjectModel(name="Acme", status=ProjectStatus.DRAFT)
+        db.add(project)
+        db.commit()
+        project_id = project.id
+    engine.dispose()
+    return project_id
+
+
+@pytest.fixture
+def client(db_url, project_id):
+    """Client for the projects router on the test database."""
+    async_engine = create_async_engine(db_url.replace("sqlite:", "sqlite+aiosqlite:", 1))
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.dependency_overrides[get_async_db] = override_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _set_status(db_url, project_id, new_status):
+    """Change a project's status outside the router, like a worker would."""
+    engine = create_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id)
+            .values(status=new_status, updated_at=datetime.utcnow() + timedelta(seconds=1))
+        )
+    engine.dispose()
+
+
+def test_status_carries_etag(client, project_id):
+    response = client.get("/get-project-status", params={"project_id": project_id})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == ProjectStatus.DRAFT
+    assert response.headers["ETag"].startswith('W/"')
+
+
+def test_matching_etag_gets_304(client, project_id):
+    etag = client.get("/get-project-status", params={"project_id": project_id}).headers["ETag"]
+    response = client.get(
+        "/get-project-status",
+        params={"project_id": project_id},
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+
+def test_outside_status_change_invalidates_etag(client, db_url, project_id):
+    """Changes made outside the router are visible to the very next poll."""
+    etag = client.get("/get-project-status", params={"project_id": project_id}).headers["ETag"]
+    _set_status(db_url, project_id, ProjectStatus.OUTDATED)
+
+    response = client.get(
+        "/get-project-status",
+        params={"project_id": project_id},
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == ProjectStatus.OUTDATED
+    assert response.headers["ETag"] != etag
+
+
+def test_unknown_project_is_404(client):
+    response = client.get(
+        "/get-project-status",
+        params={"project_id": "00000000-0000-0000-0000-000000000000"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
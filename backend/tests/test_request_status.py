@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from celery import states
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from src.api.routes import status
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(status.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _get_status(client, state, info):
+    with patch.object(status, "AsyncResult") as async_result:
+        async_result.return_value.state = state
+        async_result.return_value.info = info
+        response = client.get("/get-request-status", params={"request_id": str(uuid4())})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_completed_task_is_success(client):
+    payload = {"document_id": "d1", "status": "completed", "message": "Document successfully indexed"}
+    body = _get_status(client, states.SUCCESS, payload)
+    assert (body["status"], body["progress"], body["result"]) == ("success", 100, payload)
+
+
+def test_task_that_caught_its_error_is_failure(client):
+    """A returned "failed" payload is reported as a failure, not a success."""
+    payload = {"document_id": "d1", "status": "failed", "message": "PDF file is encrypted"}
+    body = _get_status(client, states.SUCCESS, payload)
+    assert body["status"] == "failure"
+    assert body["progress"] == 0
+    assert body["result"] is None
+    assert body["message"] == "PDF file is encrypted"
+
+
+def test_raised_error_is_failure(client):
+    body = _get_status(client, states.FAILURE, ValueError("boom"))
+    assert (body["status"], body["message"]) == ("failure", "boom")
+
+
+def test_running_task_reports_progress(client):
+    body = _get_status(client, "PROGRESS", {"progress": 40, "message": "Embedding"})
+    assert (body["status"], body["progress"], body["message"]) == ("progress", 40, "Embedding")
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from google.api_core.exceptions import InvalidArgument, ServiceUnavailable
+from unittest.mock import patch
+from src.utils.retry import MAX_ATTEMPTS, gemini_retry, retry_stats
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("tenacity.nap.time.sleep"):
+        yield
+
+
+def test_retries_are_counted_per_call_site():
+    calls = []
+
+    @gemini_retry("test.flaky")
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ServiceUnavailable("busy")
+        return "ok"
+
+    before = retry_stats()
+    assert flaky() == "ok"
+    after = retry_stats()
+    assert after["test.flaky.rate_limited"] - before.get("test.flaky.rate_limited", 0) == 2
+    assert after["test.flaky.retries"] - before.get("test.flaky.retries", 0) == 2
+
+
+def test_last_error_is_raised_after_max_attempts():
+    @gemini_retry("test.down")
+    def down():
+        raise ServiceUnavailable("down")
+
+    before = retry_stats().get("test.down.retries", 0)
+    with pytest.raises(ServiceUnavailable):
+        down()
+    assert retry_stats()["test.down.retries"] - before == MAX_ATTEMPTS - 1
+
+
+def test_other_errors_are_not_retried():
+    @gemini_retry("test.invalid")
+    def invalid():
+        raise InvalidArgument("bad request")
+
+    with pytest.raises(InvalidArgument):
+        invalid()
+    assert "test.invalid.retries" not in retry_stats()
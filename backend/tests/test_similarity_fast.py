@@ -0,0 +1,97 @@
+import random
+import sys
+from pathlib import Path
+
+# Add backend directory to sys.path
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.services.evaluation.comparator import combine_scores
+from src.services.evaluation.similarity import (
+    calculate_bleu_score_tokens,
+    keyword_overlap_tokens,
+    tokenize_list,
+)
+from src.services.evaluation.similarity_fast import lexical_scores_batch
+from src.services.evaluation_service import EvaluationService
+from src.storage.db.database import Base
+from src.storage.db.models import AnswerModel, EvaluationModel, ProjectModel, QuestionModel
+
+WORDS = "revenue grew by twelve percent year over the net margin was flat".split()
+
+
+def _tokens(rng: random.Random):
+    return [rng.choice(WORDS) for _ in range(rng.randint(0, 12))]
+
+
+def test_matches_token_list_metrics():
+    rng = random.Random(5)
+    pairs = [(_tokens(rng), _tokens(rng)) for _ in range(500)]
+    expected = [
+        (keyword_overlap_tokens(ai, human), calculate_bleu_score_tokens(human, ai))
+        for ai, human in pairs
+    ]
+    assert lexical_scores_batch(pairs) == expected
+
+
+def test_edge_cases():
+    assert lexical_scores_batch([([], [])]) == [(1.0, 0.0)]
+    assert lexical_scores_batch([(["a"], [])]) == [(0.0, 0.0)]
+    # One token: BLEU falls back to the unigram precision for bigrams
+    assert lexical_scores_batch([(["a"], ["a", "b"])]) == [(0.5, 1.0)]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def test_rescore_lexical_updates_stored_evaluations(db):
+    project = ProjectModel(name="Acme")
+    db.add(project)
+    db.flush()
+    question = QuestionModel(project_id=project.id, text="What was revenue growth?")
+    db.add(question)
+    db.flush()
+    answer = AnswerModel(question_id=question.id, text="Revenue grew by twelve percent.")
+    db.add(answer)
+    db.flush()
+    human = "Revenue grew twelve percent year over year."
+    evaluation = EvaluationModel(
+        ai_answer_id=answer.id,
+        human_answer_text=human,
+        semantic_similarity=0.9,
+        keyword_overlap=0.0,
+        bleu_score=0.0,
+        agentic_score=0.8,
+        combined_score=0.0,
+        explanation="stale"
+    )
+    db.add(evaluation)
+    db.commit()
+
+    service = EvaluationService.__new__(EvaluationService)
+    service.db = db
+    assert service.rescore_lexical(project.id) == 1
+
+    db.refresh(evaluation)
+    ai_tokens, human_tokens = tokenize_list(answer.text), tokenize_list(human)
+    keyword = keyword_overlap_tokens(ai_tokens, human_tokens)
+    bleu = calculate_bleu_score_tokens(human_tokens, ai_tokens)
+    assert evaluation.keyword_overlap == pytest.approx(keyword)
+    assert evaluation.bleu_score == pytest.approx(bleu)
+    assert evaluation.combined_score == pytest.approx(combine_scores(0.9, keyword, bleu, 0.8))
+    assert evaluation.semantic_similarity == 0.9
+
+
+def test_rescore_lexical_without_evaluations(db):
+    service = EvaluationService.__new__(EvaluationService)
+    service.db = db
+    assert service.rescore_lexical("00000000-0000-0000-0000-000000000000") == 0
@@ -26,7 +26,7 @@ const initialState: DocumentState = {
 
 export const fetchDocuments = createAsyncThunk('documents/fetchAll', async () => {
   const response = await api.get('/documents');
-  return response.data;
+  return response.data.items;
 });
 
 export const uploadDocument = createAsyncThunk(
@@ -33,7 +33,7 @@ const initialState: ProjectState = {
 
 export const fetchProjects = createAsyncThunk('projects/fetchAll', async () => {
   const response = await api.get('/list-projects');
-  return response.data;
+  return response.data.items;
 });
 
 export const fetchProjectById = createAsyncThunk('projects/fetchById', async (id: string) => {